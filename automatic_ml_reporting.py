@@ -31,18 +31,26 @@
 # 1. IMPORT LIBRARY
 import os
 import argparse  # Untuk membuat antarmuka baris perintah (command-line interface)
-import json      # Untuk bekerja dengan data format JSON
+import importlib  # Untuk memuat modul PyCaret hanya saat dibutuhkan
 import pandas as pd # Library utama untuk manipulasi data (DataFrame)
-import anthropic # Library resmi untuk berinteraksi dengan API Anthropic (Claude)
 
-# Mengimpor modul-modul spesifik dari PyCaret
-# PyCaret adalah library utama yang menjalankan proses data mining (AutoML)
-from pycaret.classification import setup as setup_clf, compare_models as compare_clf, pull as pull_clf
-from pycaret.regression import setup as setup_reg, compare_models as compare_reg, pull as pull_reg
+# PyCaret (library AutoML utama) dan `anthropic` (library resmi API Claude) sengaja
+# TIDAK diimpor di sini. Keduanya butuh beberapa detik untuk dimuat, sehingga
+# `--help`, argumen salah, dan file tidak ditemukan ikut menjadi lambat.
+# PyCaret dimuat di `train_model` (hanya modul untuk jenis masalah yang dipilih),
+# `anthropic` dimuat di dalam backend laporan AI (llm_reporting.py).
+
+# Cache hasil pelatihan berbasis isi data (lihat result_cache.py)
+from result_cache import ResultCache, dataset_fingerprint
+# Backend laporan AI asinkron (retry, backoff, cache respons, serialisasi ringkas)
+from llm_reporting import AsyncReportBackend
+# Mesin laporan: template terkompilasi, render inkremental, keluaran MD/HTML/JSON
+from report_engine import AI_LAYOUT, default_engine, parse_formats
 
 
 # 2. TRAIN MODEL
-def train_model(data_input: pd.DataFrame, problem_type: str, target_column: str):
+def train_model(data_input: pd.DataFrame, problem_type: str, target_column: str,
+                cache_dir: str = None, cache_max_mb: int = 512, session_id: int = 123):
     """
     Fungsi ini menjalankan seluruh proses pelatihan model menggunakan PyCaret.
     Ini adalah inti dari workflow data mining dalam skrip ini.
@@ -51,6 +59,9 @@ def train_model(data_input: pd.DataFrame, problem_type: str, target_column: str)
         data_input (pd.DataFrame): DataFrame yang berisi data untuk dilatih.
         problem_type (str): Jenis masalah ML ('classification' atau 'regression').
         target_column (str): Nama kolom yang akan diprediksi (kolom target).
+        cache_dir (str): Folder cache hasil pelatihan. None berarti tanpa cache.
+        cache_max_mb (int): Batas ukuran total cache dalam MB.
+        session_id (int): Seed PyCaret agar hasil dapat direproduksi.
 
     Returns:
         pd.DataFrame: Tabel (DataFrame) yang berisi perbandingan performa model.
@@ -58,51 +69,70 @@ def train_model(data_input: pd.DataFrame, problem_type: str, target_column: str)
     print(f"🎯 Kolom Target: {target_column}")
     print(f"🧠 Jenis Masalah: {problem_type}")
 
-    # Memilih alur kerja berdasarkan jenis masalah yang ditentukan pengguna
-    if problem_type == "classification":
-        # DATA MINING: TAHAP PERSIAPAN DATA untuk Klasifikasi
-        # `setup_clf` mempersiapkan data: membagi data, mengisi nilai kosong, encoding, dll.
-        setup_clf(data=data_input, target=target_column, verbose=False, session_id=123)
-        print("\n🚀 Memulai perbandingan model untuk Klasifikasi...")
-        
-        # DATA MINING: TAHAP PEMODELAN & EVALUASI
-        # `compare_clf` melatih dan mengevaluasi semua model klasifikasi yang tersedia.
-        best_model = compare_clf()
-        
-        # DATA MINING: TAHAP EVALUASI
-        # `pull_clf` mengambil tabel hasil perbandingan untuk dianalisis lebih lanjut.
-        comparison_table = pull_clf()
-
-    elif problem_type == "regression":
-        # DATA MINING: TAHAP PERSIAPAN DATA untuk Regresi
-        setup_reg(data=data_input, target=target_column, verbose=False, session_id=123)
-        print("\n🚀 Memulai perbandingan model untuk Regresi...")
-        
-        # DATA MINING: TAHAP PEMODELAN & EVALUASI
-        # `compare_reg` melatih dan mengevaluasi semua model regresi.
-        best_model = compare_reg()
-        
-        # DATA MINING: TAHAP EVALUASI
-        # `pull_reg` mengambil tabel hasil perbandingan.
-        comparison_table = pull_reg()
-    else:
+    if problem_type not in ("classification", "regression"):
         # Jika tipe masalah tidak valid, hentikan program
         raise ValueError("Tipe masalah tidak valid. Pilih 'classification' atau 'regression'.")
+
+    # CACHE: jika data, target, jenis masalah, dan versi PyCaret sama dengan run
+    # sebelumnya, tabel perbandingan langsung diambil dari disk.
+    cache, cache_key = None, None
+    if cache_dir:
+        cache = ResultCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        cache_key = dataset_fingerprint(data_input, target_column, problem_type, session_id)
+        cached_table = cache.load(cache_key)
+        if cached_table is not None:
+            print(f"♻️ Hasil ditemukan di cache ({cache_key[:12]}), pelatihan dilewati.")
+            print(f"✅ Model terbaik (dari cache): {cached_table.iloc[0]['Model']}")
+            return cached_table
+
+    # Memilih modul PyCaret berdasarkan jenis masalah yang ditentukan pengguna.
+    # Hanya modul yang dipilih yang diimpor (pycaret.classification atau pycaret.regression).
+    pycaret_api = importlib.import_module(f"pycaret.{problem_type}")
+    label = "Klasifikasi" if problem_type == "classification" else "Regresi"
+
+    # DATA MINING: TAHAP PERSIAPAN DATA
+    # `setup` mempersiapkan data: membagi data, mengisi nilai kosong, encoding, dll.
+    pycaret_api.setup(data=data_input, target=target_column, verbose=False, session_id=session_id)
+    print(f"\n🚀 Memulai perbandingan model untuk {label}...")
+
+    # DATA MINING: TAHAP PEMODELAN & EVALUASI
+    # `compare_models` melatih dan mengevaluasi semua model yang tersedia.
+    best_model = pycaret_api.compare_models()
+
+    # DATA MINING: TAHAP EVALUASI
+    # `pull` mengambil tabel hasil perbandingan untuk dianalisis lebih lanjut.
+    comparison_table = pycaret_api.pull()
+    save_model = pycaret_api.save_model
     
     print(f"✅ Model terbaik ditemukan: {type(best_model).__name__}")
+
+    # Menyimpan tabel perbandingan & pipeline terbaik ke cache untuk run berikutnya
+    if cache is not None:
+        cache.store(cache_key, comparison_table,
+                    lambda path: save_model(best_model, path, verbose=False))
     
     # Mengembalikan tabel perbandingan untuk dianalisis oleh AI
     return comparison_table
 
 
 # 3. DESCRIBE TRAINING JOB (FUNGSI UNTUK MENGANALISIS HASIL DENGAN AI )
-def describe_training_job(comparison_table: pd.DataFrame):
+def describe_training_job(comparison_table: pd.DataFrame, base_url: str = None,
+                          cache_dir: str = '.llm_cache', timeout: float = 60.0, max_retries: int = 4,
+                          output_path: str = 'laporan_analisis_otomatis.md', formats: tuple = ('md',)):
     """
     Fungsi ini mengirimkan hasil pelatihan ke AI Anthropic untuk dianalisis dan
-    menghasilkan laporan terstruktur.
+    menghasilkan laporan terstruktur. Permintaan dikirim lewat `AsyncReportBackend`
+    (llm_reporting.py): dengan timeout, retry + backoff, dan cache berbasis hash
+    prompt sehingga tabel yang sama tidak dikirim ulang ke API.
 
     Args:
         comparison_table (pd.DataFrame): Tabel perbandingan model dari PyCaret.
+        base_url (str): URL API alternatif, misal `stub_llm_server.py` untuk uji offline.
+        cache_dir (str): Folder cache respons AI. None berarti tanpa cache.
+        timeout (float): Batas waktu per permintaan (detik).
+        max_retries (int): Jumlah pengulangan untuk kegagalan sementara.
+        output_path (str): Path laporan (ekstensi diganti per format).
+        formats (tuple): Format laporan: md, html, json (lihat report_engine.py).
 
     Returns:
         dict: Sebuah dictionary yang berisi status dan laporan dalam format Markdown.
@@ -112,141 +142,44 @@ def describe_training_job(comparison_table: pd.DataFrame):
     # saving the API key as an environment variable
     os.environ['ANTHROPIC_API_KEY'] = "sk-ant-REDACTED"
 
-    # connect to the API
-    client = anthropic.Anthropic()
-
-    # Mendefinisikan 'tool' atau skema output. Ini adalah "cetak biru" yang kita berikan
-    # kepada AI untuk memastikan jawabannya terstruktur dan konsisten dalam format JSON.
-    tools = [{
-        "name": "pycaret_training_explainer",
-        "description": "Struktur untuk penjelasan hasil training PyCaret...",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "comparison_breakdown": {
-                    "type": "object",
-                    "properties": {"comments": {"type": "string", "description": "Wawasan dari hasil perbandingan model."}}
-                },
-                "pipeline_breakdown": {
-                    "type": "object",
-                    "description": "Detail setiap langkah dalam pipeline PyCaret.",
-                    "properties": {
-                        "steps": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "name": {"type": "string", "description": "Nama langkah (misal, 'imputer', 'scaler')."},
-                                    "type": {"type": "string", "description": "Tipe transformer atau model yang digunakan."},
-                                    "description": {"type": "string", "description": "Penjelasan tujuan dan fungsi langkah tersebut."}
-                                },
-                                "required": ["name", "type", "description"]
-                            }
-                        }
-                    }
-                },
-                "model_suggestions": {
-                    "type": "object",
-                    "description": "Saran untuk meningkatkan pipeline pemodelan dan akurasi.",
-                    "properties": {
-                        "improvements": {
-                            "type": "array",
-                            "items": {"type": "string", "description": "Satu saran untuk perbaikan model."}
-                        }
-                    }
-                }
-            },
-            "required": ["comparison_breakdown", "pipeline_breakdown", "model_suggestions"]
-        }
-    }]
-    
-    # Mengubah tabel perbandingan (DataFrame) dari PyCaret menjadi format JSON agar bisa dibaca oleh AI.
-    result_json = json.dumps(comparison_table.to_dict(orient='records'), indent=4)
-
-    # Membuat prompt (instruksi) yang akan dikirimkan ke AI.
-    # Di sini kita memberikan peran, tugas, dan data yang dibutuhkan dalam satu instruksi.
-    prompt = f"""Anda adalah seorang Data Scientist ahli...
-    Tugas Anda adalah menganalisis hasil ini...
-    Berikut adalah hasil training PyCaret dalam format JSON:
-    {result_json}"""
-    
-    try:
-        # Mengirimkan permintaan ke model AI Claude melalui API.
-        # AI akan memproses prompt dan data JSON, lalu menghasilkan jawaban sesuai skema 'tools'.
-        response = client.messages.create(
-            model="claude-3-5-sonnet-20240620",
-            max_tokens=2048,
-            tools=tools,
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        # Jawaban dari AI diekstrak dari respons API.
-        analysis_result = {}
-        for content in response.content:
-            if content.type == 'tool_use':
-                analysis_result = content.input
-                break
-        
-        if not analysis_result:
-            raise ValueError("AI tidak menghasilkan output yang sesuai dengan format yang diharapkan.")
-
-        # Mengubah output JSON dari AI menjadi format Markdown yang lebih mudah dibaca.
-        markdown_output = json_to_markdown(analysis_result)
-
-        # Menyimpan laporan Markdown ke file lokal agar bisa dibuka dan dibaca nanti.
-        with open('laporan_analisis_otomatis.md', 'w', encoding='utf-8') as f:
-            f.write(markdown_output)
-        
-        print("✅ Laporan analisis berhasil dibuat dan disimpan sebagai 'laporan_analisis_otomatis.md'")
-        
-        # Mengembalikan status dan isi laporan untuk ditampilkan.
-        return {
-            'status': 'sukses',
-            'report': markdown_output
-        }
-    
-    except Exception as e:
-        # Menangani jika terjadi error saat berkomunikasi dengan API.
-        print(f"❌ Terjadi kesalahan saat berkomunikasi dengan AI: {e}")
+    # Backend asinkron yang sama dipakai untuk satu tabel maupun banyak tabel sekaligus.
+    # Tabel diserialisasi sebagai CSV ringkas (bukan JSON ber-indentasi) agar hemat token.
+    backend = AsyncReportBackend(max_concurrency=1, max_retries=max_retries, timeout=timeout,
+                                 base_url=base_url, cache_dir=cache_dir)
+    result = backend.describe_tables([comparison_table])[0]
+
+    if result['status'] != 'sukses':
+        # Menangani jika terjadi error saat berkomunikasi dengan API (setelah semua retry).
+        print(f"❌ Terjadi kesalahan saat berkomunikasi dengan AI: {result['error']}")
         return {
             'status': 'gagal',
-            'report': f"Error: {e}"
+            'report': f"Error: {result['error']}"
         }
+    if result['cached']:
+        print("♻️ Analisis AI untuk tabel ini ditemukan di cache, API tidak dipanggil.")
+
+    # Mengubah output JSON dari AI menjadi laporan (Markdown/HTML/JSON) dan menyimpannya
+    # secara atomik ke path milik run ini, agar bisa dibuka dan dibaca nanti.
+    rendered = default_engine().render(AI_LAYOUT, {'analysis': result['analysis']}, output_path,
+                                       tuple(dict.fromkeys(('md', *formats))))
+    markdown_output = rendered['documents']['md']
+    saved = ", ".join(f"'{path}'" for fmt, path in rendered['paths'].items() if fmt in formats)
+    print(f"✅ Laporan analisis berhasil dibuat dan disimpan sebagai {saved}")
+
+    # Mengembalikan status dan isi laporan untuk ditampilkan.
+    return {
+        'status': 'sukses',
+        'report': markdown_output,
+        'paths': {fmt: path for fmt, path in rendered['paths'].items() if fmt in formats}
+    }
 
 # 4. JSON TO MARKDOWN (FUNGSI BANTU UNTUK MEMFORMAT LAPORAN)
 def json_to_markdown(data: dict):
     """
     Fungsi ini mengubah output JSON terstruktur dari AI menjadi string Markdown
-    agar mudah dibaca oleh manusia.
+    agar mudah dibaca oleh manusia (template bagian ada di report_engine.py).
     """
-    md = ["# Laporan Analisis Pelatihan Model Otomatis\n"]
-
-    # Format bagian "Comparison Breakdown"
-    md.append("## 1. Analisis Perbandingan Model\n")
-    md.append(data.get("comparison_breakdown", {}).get("comments", "Tidak ada komentar."))
-    md.append("\n")
-
-    # Format bagian "Pipeline Breakdown"
-    md.append("## 2. Rincian Pipeline Pra-Pemrosesan\n")
-    steps = data.get("pipeline_breakdown", {}).get("steps", [])
-    if steps:
-        for i, step in enumerate(steps):
-            md.append(f"### Langkah {i+1}: {step.get('name', 'Tanpa Nama')}")
-            md.append(f"- **Tipe:** {step.get('type', 'Tidak diketahui')}")
-            md.append(f"- **Deskripsi:** {step.get('description', 'Tidak ada deskripsi.')}\n")
-    else:
-        md.append("Tidak ada rincian pipeline.\n")
-
-    # Format bagian "Model Suggestions"
-    md.append("## 3. Saran dan Rekomendasi Perbaikan\n")
-    improvements = data.get("model_suggestions", {}).get("improvements", [])
-    if improvements:
-        for suggestion in improvements:
-            md.append(f"- {suggestion}")
-    else:
-        md.append("Tidak ada saran perbaikan.")
-    
-    return "\n".join(md)
+    return default_engine().render(AI_LAYOUT, {'analysis': data})['documents']['md']
 
 
 # 5. MAIN EXECUTION BLOCK
@@ -256,6 +189,14 @@ if __name__ == '__main__':
     parser.add_argument('--data_input', type=str, required=True, help='Path menuju file input CSV.')
     parser.add_argument('--target_column', type=str, required=True, help='Nama kolom target yang akan diprediksi.')
     parser.add_argument('--problem_type', type=str, required=True, choices=["classification", "regression"], help='Tipe masalah machine learning.')
+    parser.add_argument('--cache_dir', type=str, default='.automl_cache', help='Folder cache hasil pelatihan.')
+    parser.add_argument('--cache_max_mb', type=int, default=512, help='Batas ukuran total cache (MB).')
+    parser.add_argument('--no_cache', action='store_true', help='Nonaktifkan cache hasil pelatihan.')
+    parser.add_argument('--llm_base_url', type=str, default=None, help='URL API alternatif untuk laporan AI (misal server stub offline).')
+    parser.add_argument('--llm_cache_dir', type=str, default='.llm_cache', help='Folder cache respons AI.')
+    parser.add_argument('--llm_timeout', type=float, default=60.0, help='Batas waktu per permintaan AI (detik).')
+    parser.add_argument('--report_output', type=str, default='laporan_analisis_otomatis.md', help='Path laporan (ekstensi diganti per format).')
+    parser.add_argument('--report_formats', type=parse_formats, default=('md',), help='Format laporan dipisah koma: md, html, json.')
     
     # Membaca argumen yang diberikan oleh pengguna dari terminal.
     args = parser.parse_args()
@@ -271,11 +212,20 @@ if __name__ == '__main__':
     comparison_table_result = train_model(
         data_input=df,
         problem_type=args.problem_type,
-        target_column=args.target_column
+        target_column=args.target_column,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_max_mb=args.cache_max_mb
     )
 
     # Langkah 2: Memanggil fungsi untuk mengirim hasil data mining ke AI untuk dianalisis.
-    output_report_dict = describe_training_job(comparison_table_result)
+    output_report_dict = describe_training_job(
+        comparison_table_result,
+        base_url=args.llm_base_url,
+        cache_dir=None if args.no_cache else args.llm_cache_dir,
+        timeout=args.llm_timeout,
+        output_path=args.report_output,
+        formats=args.report_formats
+    )
     
     # Langkah 3: Menampilkan laporan akhir di terminal jika proses berhasil.
     if output_report_dict['status'] == 'sukses':
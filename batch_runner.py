@@ -0,0 +1,291 @@
+# ==============================================================================
+# EKSEKUSI BATCH BANYAK DATASET DENGAN POOL WORKER JANGKA PANJANG
+# ==============================================================================
+#
+# TUJUAN:
+# `report.py` hanya menangani satu dataset per proses sehingga impor PyCaret
+# (beberapa detik) dibayar ulang untuk setiap dataset. Modul ini menjalankan
+# banyak job dari satu file manifest di atas process pool yang hidup selama
+# batch berjalan:
+# - Setiap worker mengimpor PyCaret sekali saja (lewat `initializer`).
+# - Job dijadwalkan dari file terbesar lebih dulu agar job kecil mengisi celah
+#   di akhir batch dan pool tidak menunggu satu job besar yang mulai terlambat.
+# - Setiap job menghasilkan laporan, trace performa, dan pipeline terbaik
+#   (`best_model.pkl`, siap dipakai predict_service.py) di foldernya sendiri,
+#   ditambah ringkasan `index.md` / `index.json` untuk seluruh batch.
+#
+# FORMAT MANIFEST (JSON Lines, satu job per baris):
+#   {"data_input": "data.csv", "target_column": "Cut", "problem_type": "classification"}
+#   {"job_id": "harga", "data_input": "data.csv", "target_column": "Price",
+#    "problem_type": "regression", "search": "successive-halving", "budget_seconds": 60}
+# Kunci opsional lain mengikuti argumen `train_model` (search, budget_seconds,
+# incremental, state_dir, top_n, session_id, fold_cache) dan `load_dataset` (columns,
+# snapshot, sample_rows, sample_method, chunksize).
+#
+# PEMAKAIAN:
+#   python batch_runner.py --manifest jobs.jsonl --output_dir reports --workers 4
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from model_search import SORT_METRIC, limit_native_threads
+from report_engine import parse_formats
+
+REPORT_FILE = 'laporan_analisis_otomatis.md'
+TRACE_FILE = 'performance_trace.json'
+TRAIN_OPTIONS = ('search', 'budget_seconds', 'incremental', 'state_dir', 'top_n', 'session_id',
+                 'fold_cache')
+LOAD_OPTIONS = ('columns', 'snapshot', 'sample_rows', 'sample_method', 'chunksize')
+
+# Pembatas thread native milik proses worker (harus tetap hidup selama worker berjalan)
+_LIMITS = None
+
+
+def read_manifest(path: str) -> list:
+    """
+    Membaca manifest JSON Lines dan melengkapi `job_id` yang kosong.
+
+    Baris kosong dan baris yang diawali '#' diabaikan.
+    """
+    jobs = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            job = json.loads(line)
+            missing = [key for key in ('data_input', 'target_column', 'problem_type') if key not in job]
+            if missing:
+                raise ValueError(f"Baris {line_number} manifest tidak memiliki kunci: {', '.join(missing)}")
+            if job['problem_type'] not in SORT_METRIC:
+                raise ValueError(f"Baris {line_number}: problem_type '{job['problem_type']}' tidak dikenal.")
+            stem = os.path.splitext(os.path.basename(job['data_input']))[0]
+            job.setdefault('job_id', f"{len(jobs) + 1:03d}-{stem}-{job['target_column']}")
+            jobs.append(job)
+
+    job_ids = [job['job_id'] for job in jobs]
+    duplicates = sorted({job_id for job_id in job_ids if job_ids.count(job_id) > 1})
+    if duplicates:
+        raise ValueError(f"job_id ganda di manifest: {', '.join(duplicates)}")
+    return jobs
+
+
+def schedule_largest_first(jobs: list) -> list:
+    """Mengurutkan job dari ukuran file input terbesar; file yang hilang di akhir."""
+    def size(job):
+        try:
+            return os.path.getsize(job['data_input'])
+        except OSError:
+            return -1
+    return sorted(jobs, key=size, reverse=True)
+
+
+def _init_batch_worker(threads: int):
+    """Dijalankan sekali per worker: batasi thread native lalu impor PyCaret & pipeline."""
+    from threadpoolctl import threadpool_limits
+
+    global _LIMITS
+    _LIMITS = threadpool_limits(limits=threads)
+    # report.py menunda impor PyCaret; di worker jangka panjang justru dimuat di muka
+    import pycaret.classification  # noqa: F401
+    import pycaret.regression  # noqa: F401
+    import report  # noqa: F401
+
+
+def run_job(job: dict, output_dir: str, cache_dir: str = None, cache_max_mb: int = 512,
+            report_formats: tuple = ('md',)) -> dict:
+    """
+    Menjalankan satu job: muat data, latih model, tulis laporan (dalam `report_formats`) & trace.
+
+    Returns:
+        dict: Baris ringkasan untuk index batch (status, model terbaik, metrik, waktu).
+    """
+    from report import train_model, generate_offline_report
+    from data_loader import load_dataset
+    from instrumentation import start_tracing, stage
+
+    job_dir = os.path.join(output_dir, job['job_id'])
+    os.makedirs(job_dir, exist_ok=True)
+    report_path = os.path.join(job_dir, REPORT_FILE)
+    summary = {
+        'job_id': job['job_id'],
+        'data_input': job['data_input'],
+        'target_column': job['target_column'],
+        'problem_type': job['problem_type'],
+        'status': 'gagal',
+        'best_model': None,
+        'metric': SORT_METRIC[job['problem_type']],
+        'score': None,
+        'wall_seconds': None,
+        'report': None,
+        'error': None,
+        'worker_pid': os.getpid(),
+    }
+
+    tracer = start_tracing()
+    start = time.perf_counter()
+    try:
+        load_kwargs = {key: job[key] for key in LOAD_OPTIONS if key in job}
+        columns = load_kwargs.get('columns')
+        if isinstance(columns, str):
+            columns = [col.strip() for col in columns.split(',') if col.strip()]
+        if columns is not None and job['target_column'] not in columns:
+            columns = list(columns) + [job['target_column']]
+        load_kwargs['columns'] = columns
+        with stage('load_data') as load_info:
+            df = load_dataset(job['data_input'], stratify_column=job['target_column'], **load_kwargs)
+            load_info['rows'] = len(df)
+
+        with stage('train_model', rows=len(df)):
+            comparison_table = train_model(
+                data_input=df,
+                problem_type=job['problem_type'],
+                target_column=job['target_column'],
+                cache_dir=cache_dir,
+                cache_max_mb=cache_max_mb,
+                workers=1,  # paralelisme sudah di tingkat job; tidak ada pool bersarang
+                model_output=os.path.join(job_dir, 'best_model'),
+                dataset_name=os.path.abspath(job['data_input']),
+                **{key: job[key] for key in TRAIN_OPTIONS if key in job}
+            )
+
+        with stage('generate_offline_report'):
+            generate_offline_report(comparison_table, job['problem_type'],
+                                    output_path=report_path, formats=report_formats)
+        # Render ulang hanya bagian performa setelah semua tahap tercatat
+        output_report_dict = generate_offline_report(comparison_table, job['problem_type'],
+                                                     output_path=report_path, performance=tracer.summary(),
+                                                     formats=report_formats)
+
+        best_id = comparison_table.index[0]
+        summary.update({
+            'status': output_report_dict['status'],
+            'best_model': comparison_table.loc[best_id, 'Model'],
+            'score': float(comparison_table.loc[best_id, summary['metric']]),
+            'report': output_report_dict['path'],
+        })
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        summary['wall_seconds'] = round(time.perf_counter() - start, 2)
+        tracer.write_chrome_trace(os.path.join(job_dir, TRACE_FILE))
+    return summary
+
+
+def write_index(summaries: list, output_dir: str):
+    """Menulis ringkasan batch sebagai `index.json` dan `index.md`."""
+    json_path = os.path.join(output_dir, 'index.json')
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, indent=2, default=str)
+    os.replace(tmp_path, json_path)
+
+    table = pd.DataFrame([{
+        'Job': s['job_id'],
+        'Dataset': s['data_input'],
+        'Target': s['target_column'],
+        'Jenis': s['problem_type'],
+        'Status': s['status'],
+        'Model Terbaik': s['best_model'] or '-',
+        'Skor': '-' if s['score'] is None else f"{s['metric']} = {s['score']:.4f}",
+        'Waktu (s)': s['wall_seconds'],
+        'Laporan': f"[{REPORT_FILE}]({os.path.relpath(s['report'], output_dir)})" if s['report'] else (s['error'] or '-'),
+    } for s in summaries])
+    n_ok = sum(s['status'] == 'sukses' for s in summaries)
+    md = ["# Ringkasan Batch AutoML\n",
+          f"{n_ok} dari {len(summaries)} job berhasil. Dibuat pada {time.strftime('%Y-%m-%d %H:%M:%S')}.\n",
+          table.to_markdown(index=False), ""]
+    md_path = os.path.join(output_dir, 'index.md')
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(md))
+    return md_path
+
+
+def run_batch(manifest: str, output_dir: str = 'reports', workers: int = None,
+              threads_per_worker: int = None, cache_dir: str = None, cache_max_mb: int = 512,
+              report_formats: tuple = ('md',)) -> list:
+    """
+    Menjalankan semua job di manifest pada satu process pool.
+
+    Args:
+        manifest (str): Path file manifest JSON Lines.
+        output_dir (str): Folder laporan; setiap job mendapat subfolder `<job_id>`.
+        workers (int): Jumlah proses worker. None berarti min(jumlah core, jumlah job).
+        threads_per_worker (int): Batas thread BLAS/OpenMP per worker. None berarti
+            core dibagi rata ke semua worker.
+        cache_dir (str): Folder cache hasil pelatihan (dibagi semua job), None untuk nonaktif.
+        cache_max_mb (int): Batas ukuran cache (MB).
+        report_formats (tuple): Format laporan per job (md, html, json).
+
+    Returns:
+        list: Ringkasan per job dengan urutan sesuai manifest.
+    """
+    jobs = read_manifest(manifest)
+    if not jobs:
+        print(f"ℹ️ Manifest '{manifest}' tidak berisi job.")
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+
+    cpu_count = os.cpu_count() or 1
+    workers = min(workers or cpu_count, len(jobs))
+    threads = threads_per_worker or max(cpu_count // workers, 1)
+    print(f"📦 Menjalankan {len(jobs)} job pada {workers} worker ({threads} thread/worker)...")
+
+    results = {}
+    batch_start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with limit_native_threads(threads), ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=_init_batch_worker, initargs=(threads,)) as pool:
+        # Antrean pool FIFO: urutan submit = urutan eksekusi (terbesar lebih dulu)
+        futures = {pool.submit(run_job, job, output_dir, cache_dir, cache_max_mb, report_formats): job
+                   for job in schedule_largest_first(jobs)}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:  # worker mati (misal kehabisan memori)
+                summary = {'job_id': job['job_id'], 'data_input': job['data_input'],
+                           'target_column': job['target_column'], 'problem_type': job['problem_type'],
+                           'status': 'gagal', 'best_model': None, 'metric': SORT_METRIC[job['problem_type']],
+                           'score': None, 'wall_seconds': None, 'report': None,
+                           'error': f"{type(e).__name__}: {e}", 'worker_pid': None}
+            results[job['job_id']] = summary
+            if summary['status'] == 'sukses':
+                print(f"   ✔ {summary['job_id']}: {summary['best_model']} "
+                      f"({summary['metric']} = {summary['score']:.4f}, {summary['wall_seconds']} s)")
+            else:
+                print(f"   ⚠️ {summary['job_id']} gagal: {summary['error']}")
+
+    summaries = [results[job['job_id']] for job in jobs]
+    md_path = write_index(summaries, output_dir)
+    print(f"✅ Batch selesai dalam {time.perf_counter() - batch_start:.1f} detik. Ringkasan: '{md_path}'")
+    return summaries
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Batch AutoML: banyak dataset dalam satu pool worker")
+    parser.add_argument('--manifest', type=str, default='jobs.jsonl', help='File manifest JSON Lines (satu job per baris).')
+    parser.add_argument('--output_dir', type=str, default='reports', help='Folder laporan per job dan ringkasan batch.')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah proses worker (default: jumlah core).')
+    parser.add_argument('--threads_per_worker', type=int, default=None, help='Batas thread BLAS/OpenMP per worker.')
+    parser.add_argument('--cache_dir', type=str, default='.automl_cache', help='Folder cache hasil pelatihan.')
+    parser.add_argument('--cache_max_mb', type=int, default=512, help='Batas ukuran total cache (MB).')
+    parser.add_argument('--no_cache', action='store_true', help='Nonaktifkan cache hasil pelatihan.')
+    parser.add_argument('--report_formats', type=parse_formats, default=('md',), help='Format laporan per job dipisah koma: md, html, json.')
+    args = parser.parse_args()
+
+    summaries = run_batch(args.manifest, output_dir=args.output_dir, workers=args.workers,
+                          threads_per_worker=args.threads_per_worker,
+                          cache_dir=None if args.no_cache else args.cache_dir,
+                          cache_max_mb=args.cache_max_mb, report_formats=args.report_formats)
+    if any(s['status'] != 'sukses' for s in summaries):
+        raise SystemExit(1)
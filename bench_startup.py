@@ -0,0 +1,153 @@
+# ==============================================================================
+# BENCHMARK WAKTU START-UP (COLD START) SKRIP CLI
+# ==============================================================================
+#
+# TUJUAN:
+# Memantau berapa lama skrip CLI butuh waktu sebelum melakukan pekerjaan
+# yang berarti. Skenario yang diukur (masing-masing sebagai proses Python baru):
+# - `--help`                 : murni biaya impor modul + argparse.
+# - path input salah         : harus gagal cepat tanpa memuat PyCaret.
+# - run dengan cache hit     : data dimuat & di-hash, tabel diambil dari cache,
+#                              laporan dibuat; PyCaret tidak perlu diimpor.
+# Untuk setiap skenario dicatat median dan minimum dari beberapa pengulangan,
+# ditambah modul berat (pycaret/anthropic/sklearn) yang ternyata ikut dimuat.
+#
+# PEMAKAIAN:
+#   python bench_startup.py --repeat 5 --output startup_benchmark.json
+#   python bench_startup.py --baseline startup_benchmark.json   # bandingkan
+#
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('pycaret', 'anthropic', 'sklearn')
+# Toleransi regresi saat dibandingkan dengan baseline (median 20% lebih lambat)
+REGRESSION_TOLERANCE = 1.2
+
+
+def _scenarios(workdir: str, data_path: str, target_column: str, problem_type: str) -> dict:
+    """Daftar skenario: nama -> argumen baris perintah (tanpa interpreter)."""
+    report = os.path.join(HERE, 'report.py')
+    ai_report = os.path.join(HERE, 'automatic_ml_reporting.py')
+    missing = os.path.join(workdir, 'tidak_ada.csv')
+    common = ['--target_column', target_column, '--problem_type', problem_type]
+    cache = ['--cache_dir', os.path.join(workdir, 'cache')]
+    return {
+        'report.py --help': [report, '--help'],
+        'report.py path salah': [report, '--data_input', missing, *common],
+        'report.py cache hit': [report, '--data_input', data_path, *common, *cache,
+                                '--trace_output', os.path.join(workdir, 'trace.json')],
+        'automatic_ml_reporting.py --help': [ai_report, '--help'],
+        'automatic_ml_reporting.py path salah': [ai_report, '--data_input', missing, *common],
+    }
+
+
+def _loaded_heavy_modules(args: list, cwd: str) -> list:
+    """Menjalankan skrip dengan `-X importtime` dan melaporkan modul berat yang dimuat."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=cwd,
+                            capture_output=True, text=True)
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:'):
+            module = line.rsplit('|', 1)[-1].strip()
+            root = module.split('.')[0]
+            if root in HEAVY_MODULES:
+                loaded.add(root)
+    return sorted(loaded)
+
+
+def time_command(args: list, cwd: str, repeat: int) -> list:
+    """Menjalankan perintah `repeat` kali sebagai proses baru; mengembalikan durasi (detik)."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def run_benchmark(data_path: str, target_column: str, problem_type: str,
+                  repeat: int = 5, sample_rows: int = 300) -> pd.DataFrame:
+    """
+    Mengukur waktu cold start setiap skenario.
+
+    Args:
+        data_path (str): Dataset sumber; hanya `sample_rows` baris pertama yang dipakai
+            agar pengisian cache (sekali, tidak diukur) tetap singkat.
+        target_column (str): Kolom target.
+        problem_type (str): 'classification' atau 'regression'.
+        repeat (int): Jumlah pengulangan per skenario.
+        sample_rows (int): Jumlah baris dataset kecil untuk skenario cache hit.
+
+    Returns:
+        pd.DataFrame: Satu baris per skenario (median, minimum, modul berat yang dimuat).
+    """
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as workdir:
+        small_path = os.path.join(workdir, 'data_kecil.csv')
+        pd.read_csv(data_path, nrows=sample_rows).to_csv(small_path, index=False)
+        scenarios = _scenarios(workdir, small_path, target_column, problem_type)
+
+        # Isi cache sekali (tidak diukur) agar skenario cache hit benar-benar hit
+        print("⏳ Mengisi cache untuk skenario cache hit...")
+        subprocess.run([sys.executable, *scenarios['report.py cache hit']], cwd=workdir,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+
+        rows = []
+        for name, args in scenarios.items():
+            durations = time_command(args, workdir, repeat)
+            rows.append({
+                'Skenario': name,
+                'Median (s)': round(statistics.median(durations), 3),
+                'Min (s)': round(min(durations), 3),
+                'Modul berat dimuat': ', '.join(_loaded_heavy_modules(args, workdir)) or '-',
+            })
+            print(f"   ✔ {name}: median {rows[-1]['Median (s)']} s")
+    return pd.DataFrame(rows)
+
+
+def compare_with_baseline(results: pd.DataFrame, baseline_path: str) -> bool:
+    """Mencetak perbandingan dengan baseline; False jika ada skenario yang melambat."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {row['Skenario']: row['Median (s)'] for row in json.load(f)}
+    ok = True
+    for _, row in results.iterrows():
+        previous = baseline.get(row['Skenario'])
+        if previous is None:
+            continue
+        ratio = row['Median (s)'] / previous if previous else float('inf')
+        status = '✅' if ratio <= REGRESSION_TOLERANCE else '❌'
+        ok = ok and ratio <= REGRESSION_TOLERANCE
+        print(f"{status} {row['Skenario']}: {previous} s -> {row['Median (s)']} s ({ratio:.2f}x)")
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark waktu start-up skrip CLI")
+    parser.add_argument('--data_input', type=str, default=os.path.join(HERE, 'data.csv'), help='Dataset sumber untuk skenario cache hit.')
+    parser.add_argument('--target_column', type=str, default='Price', help='Nama kolom target.')
+    parser.add_argument('--problem_type', type=str, default='regression', choices=["classification", "regression"], help='Tipe masalah machine learning.')
+    parser.add_argument('--repeat', type=int, default=5, help='Jumlah pengulangan per skenario.')
+    parser.add_argument('--output', type=str, default=None, help='Simpan hasil sebagai JSON (bisa dipakai sebagai baseline).')
+    parser.add_argument('--baseline', type=str, default=None, help='File JSON hasil sebelumnya untuk dibandingkan.')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.data_input, args.target_column, args.problem_type, repeat=args.repeat)
+    print("\n" + results.to_markdown(index=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results.to_dict(orient='records'), f, indent=2)
+        print(f"\n💾 Hasil disimpan ke '{args.output}'")
+    if args.baseline and not compare_with_baseline(results, args.baseline):
+        raise SystemExit(1)
@@ -0,0 +1,316 @@
+# ==============================================================================
+# BENCHMARK PIPELINE END-TO-END (UKURAN DATA x JENIS MASALAH x JUMLAH WORKER)
+# ==============================================================================
+#
+# TUJUAN:
+# Mengetahui apakah perubahan pada `train_model` atau CLI membuat pipeline lebih
+# cepat atau lebih lambat. Harness ini:
+# 1. Membuat dataset sintetis mirip 'diamond' dengan bootstrap dari `data.csv`
+#    (hasil `get_data.py`): baris diambil ulang dengan pengembalian lalu kolom
+#    numerik diberi sedikit noise multiplikatif. Seed tetap -> data identik di
+#    setiap run. Ukuran bawaan: 6 ribu, 60 ribu, 600 ribu, dan 6 juta baris.
+# 2. Menjalankan `report.py` sebagai proses baru untuk setiap kombinasi ukuran,
+#    jenis masalah (klasifikasi 'Cut' & regresi 'Price'), dan jumlah worker.
+# 3. Mencatat waktu wall-clock, puncak memori (proses utama + semua worker),
+#    dan metrik model terbaik ke file hasil (JSON).
+# 4. Membandingkan dengan baseline tersimpan dan menandai regresi.
+#
+# PEMAKAIAN:
+#   python benchmark_pipeline.py --sizes 6000,60000 --workers 1,2 --budget_seconds 120
+#   python benchmark_pipeline.py --update_baseline          # simpan hasil sebagai baseline
+#
+# ==============================================================================
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (6_000, 60_000, 600_000, 6_000_000)
+TASKS = {
+    'classification': 'Cut',
+    'regression': 'Price',
+}
+# Batas toleransi sebelum sebuah run dianggap regresi terhadap baseline
+TIME_TOLERANCE = 1.20      # 20% lebih lambat
+MEMORY_TOLERANCE = 1.20    # 20% lebih boros memori
+METRIC_TOLERANCE = 0.01    # turun lebih dari 0.01 poin
+
+
+# ------------------------------------------------------------------------------
+# DATASET SINTETIS
+# ------------------------------------------------------------------------------
+def make_synthetic(source: str, n_rows: int, output_dir: str, seed: int = 123,
+                   chunk_rows: int = 1_000_000) -> str:
+    """
+    Membuat dataset sintetis berukuran `n_rows` dengan bootstrap dari `source`.
+
+    File disimpan sebagai Parquet (atau CSV jika pyarrow tidak tersedia) dan
+    dipakai ulang jika sudah ada. Pembuatan dilakukan per blok `chunk_rows`
+    agar 6 juta baris tidak memerlukan memori berlebih.
+
+    Returns:
+        str: Path dataset sintetis.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        pq = None
+    extension = 'parquet' if pq is not None else 'csv'
+    path = os.path.join(output_dir, f"diamond_{n_rows}_seed{seed}.{extension}")
+    if os.path.exists(path):
+        return path
+    os.makedirs(output_dir, exist_ok=True)
+
+    base = pd.read_csv(source)
+    numeric = base.select_dtypes('number').columns
+    categorical = base.columns.difference(numeric)
+    # Kategori tetap sama di semua blok agar skema Parquet konsisten
+    for col in categorical:
+        base[col] = base[col].astype('category')
+    rng = np.random.default_rng(seed)
+
+    tmp_path = f"{path}.tmp"
+    writer = None
+    try:
+        for offset in range(0, n_rows, chunk_rows):
+            size = min(chunk_rows, n_rows - offset)
+            block = base.iloc[rng.integers(0, len(base), size)].reset_index(drop=True)
+            # Noise multiplikatif kecil: baris unik, distribusi tetap mirip data asli
+            for col in numeric:
+                noise = rng.normal(1.0, 0.02, size)
+                values = block[col].to_numpy() * noise
+                block[col] = np.round(values, 2) if col != 'Price' else np.round(values).astype('int64')
+            if pq is not None:
+                import pyarrow as pa
+                table = pa.Table.from_pandas(block, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                block.to_csv(tmp_path, mode='a' if offset else 'w', header=not offset, index=False)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+# ------------------------------------------------------------------------------
+# MENJALANKAN SATU KOMBINASI
+# ------------------------------------------------------------------------------
+def _tree_rss_mb(process) -> float:
+    """RSS proses + seluruh turunannya (worker pool) dalam MB."""
+    import psutil
+
+    total = 0
+    for proc in [process, *process.children(recursive=True)]:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1024 ** 2
+
+
+def run_case(data_path: str, problem_type: str, workers: int, budget_seconds: float = None,
+             search: str = 'compare', timeout: float = None, poll_seconds: float = 0.25) -> dict:
+    """
+    Menjalankan `report.py` untuk satu kombinasi dan mengukur hasilnya.
+
+    Puncak memori diukur dengan polling psutil atas seluruh pohon proses (jika
+    psutil tersedia); jika tidak, dipakai puncak RSS proses utama dari trace.
+    """
+    with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as workdir:
+        trace_path = os.path.join(workdir, 'trace.json')
+        model_path = os.path.join(workdir, 'best_model')
+        command = [sys.executable, os.path.join(HERE, 'report.py'),
+                   '--data_input', os.path.abspath(data_path),
+                   '--target_column', TASKS[problem_type],
+                   '--problem_type', problem_type,
+                   '--no_cache', '--workers', str(workers), '--search', search,
+                   '--trace_output', trace_path, '--model_output', model_path]
+        if budget_seconds:
+            command += ['--budget_seconds', str(budget_seconds)]
+
+        # stderr ditulis ke file (bukan PIPE yang baru dibaca di akhir) agar proses anak
+        # yang banyak menulis log tidak macet saat buffer pipe penuh
+        stderr_path = os.path.join(workdir, 'stderr.log')
+        stderr_file = open(stderr_path, 'wb')
+        start = time.perf_counter()
+        child = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL, stderr=stderr_file)
+        peak_mb = None
+        try:
+            import psutil
+            process, peak_mb = psutil.Process(child.pid), 0.0
+            while child.poll() is None:
+                peak_mb = max(peak_mb, _tree_rss_mb(process))
+                if timeout and time.perf_counter() - start > timeout:
+                    child.kill()
+                    break
+                time.sleep(poll_seconds)
+        except ImportError:
+            pass
+        try:
+            child.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            child.kill()
+            child.wait()
+        finally:
+            stderr_file.close()
+        wall = time.perf_counter() - start
+
+        result = {'wall_seconds': round(wall, 2), 'peak_mb': None, 'best_model': None,
+                  'metric': None, 'score': None, 'status': 'sukses' if child.returncode == 0 else 'gagal'}
+        if os.path.exists(trace_path):
+            with open(trace_path, encoding='utf-8') as f:
+                events = json.load(f)['traceEvents']
+            trace_peak = max((e['args'].get('peak_rss_mb', 0) for e in events), default=0)
+            peak_mb = max(peak_mb or 0, trace_peak)
+        result['peak_mb'] = round(peak_mb, 1) if peak_mb else None
+        if os.path.exists(model_path + '.meta.json'):
+            with open(model_path + '.meta.json', encoding='utf-8') as f:
+                meta = json.load(f)
+            result.update({'best_model': meta['model_name'], 'metric': meta.get('metric'),
+                           'score': meta.get('score')})
+        if result['status'] != 'sukses':
+            with open(stderr_path, 'rb') as f:
+                f.seek(max(os.path.getsize(stderr_path) - 64 * 1024, 0))  # cukup bagian akhir log
+                tail = f.read().decode('utf-8', errors='replace')
+            result['error'] = tail.strip().splitlines()[-1:] or ['(tanpa pesan)']
+    return result
+
+
+def environment() -> dict:
+    """Informasi lingkungan yang memengaruhi angka benchmark."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        pycaret_version = metadata.version('pycaret')
+    except metadata.PackageNotFoundError:
+        pycaret_version = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'pycaret': pycaret_version, 'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+# ------------------------------------------------------------------------------
+# PERBANDINGAN DENGAN BASELINE
+# ------------------------------------------------------------------------------
+def _case_key(run: dict) -> tuple:
+    return run['rows'], run['problem_type'], run['workers'], run['search'], run['budget_seconds']
+
+
+def flag_regressions(runs: list, baseline_runs: list) -> list:
+    """
+    Menandai setiap run yang lebih buruk dari baseline pada kombinasi yang sama.
+
+    Returns:
+        list: Daftar pesan regresi (kosong jika tidak ada).
+    """
+    baseline = {_case_key(run): run for run in baseline_runs}
+    problems = []
+    for run in runs:
+        previous = baseline.get(_case_key(run))
+        label = f"{run['rows']} baris / {run['problem_type']} / {run['workers']} worker"
+        flags = []
+        if previous is None:
+            run['vs_baseline'] = 'baru'
+            continue
+        if run['status'] != 'sukses' and previous['status'] == 'sukses':
+            flags.append("run gagal")
+        if previous['wall_seconds'] and run['wall_seconds'] > previous['wall_seconds'] * TIME_TOLERANCE:
+            flags.append(f"waktu {previous['wall_seconds']} -> {run['wall_seconds']} s")
+        if previous['peak_mb'] and run['peak_mb'] and run['peak_mb'] > previous['peak_mb'] * MEMORY_TOLERANCE:
+            flags.append(f"memori {previous['peak_mb']} -> {run['peak_mb']} MB")
+        if previous['score'] is not None and run['score'] is not None \
+                and run['score'] < previous['score'] - METRIC_TOLERANCE:
+            flags.append(f"{run['metric']} {previous['score']:.4f} -> {run['score']:.4f}")
+        run['vs_baseline'] = '; '.join(flags) if flags else 'ok'
+        problems.extend(f"{label}: {flag}" for flag in flags)
+    return problems
+
+
+def run_benchmark(sizes: list, problem_types: list, worker_counts: list, source: str,
+                  data_dir: str, budget_seconds: float = None, search: str = 'compare',
+                  timeout: float = None, seed: int = 123) -> list:
+    """Menjalankan semua kombinasi dan mengembalikan daftar hasil per run."""
+    runs = []
+    for rows in sizes:
+        print(f"🧪 Menyiapkan dataset sintetis {rows} baris...")
+        data_path = make_synthetic(source, rows, data_dir, seed=seed)
+        for problem_type in problem_types:
+            for workers in worker_counts:
+                print(f"   ▶ {problem_type}, {workers} worker...", flush=True)
+                result = run_case(data_path, problem_type, workers, budget_seconds=budget_seconds,
+                                  search=search, timeout=timeout)
+                runs.append({'rows': rows, 'problem_type': problem_type, 'workers': workers,
+                             'search': search, 'budget_seconds': budget_seconds, **result})
+                print(f"     {result['status']}: {result['wall_seconds']} s, puncak {result['peak_mb']} MB, "
+                      f"{result['metric']} = {result['score']}")
+    return runs
+
+
+def _parse_ints(text: str) -> list:
+    return [int(float(value)) for value in text.split(',') if value.strip()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark pipeline AutoML end-to-end")
+    parser.add_argument('--source', type=str, default=os.path.join(HERE, 'data.csv'), help='Dataset sumber bootstrap (hasil get_data.py).')
+    parser.add_argument('--sizes', type=str, default=','.join(str(n) for n in DEFAULT_SIZES), help='Ukuran dataset, dipisah koma.')
+    parser.add_argument('--problem_types', type=str, default='classification,regression', help='Jenis masalah, dipisah koma.')
+    parser.add_argument('--workers', type=str, default='1,2,4', help='Jumlah worker yang diuji, dipisah koma.')
+    parser.add_argument('--search', type=str, default='compare', choices=["compare", "successive-halving", "pruning"], help='Strategi pencarian model.')
+    parser.add_argument('--budget_seconds', type=float, default=None, help='Batas waktu pencarian model per run (detik).')
+    parser.add_argument('--timeout', type=float, default=None, help='Batas waktu keras per run (detik); run dihentikan jika terlewati.')
+    parser.add_argument('--seed', type=int, default=123, help='Seed pembuatan dataset sintetis.')
+    parser.add_argument('--data_dir', type=str, default='benchmark_data', help='Folder dataset sintetis (dipakai ulang antar run).')
+    parser.add_argument('--output', type=str, default='benchmark_results.json', help='File hasil benchmark.')
+    parser.add_argument('--baseline', type=str, default='benchmark_baseline.json', help='File baseline untuk deteksi regresi.')
+    parser.add_argument('--update_baseline', action='store_true', help='Simpan hasil run ini sebagai baseline baru.')
+    args = parser.parse_args()
+
+    problem_types = [value.strip() for value in args.problem_types.split(',') if value.strip()]
+    unknown = [value for value in problem_types if value not in TASKS]
+    if unknown:
+        parser.error(f"Jenis masalah tidak dikenal: {', '.join(unknown)}")
+
+    runs = run_benchmark(_parse_ints(args.sizes), problem_types, _parse_ints(args.workers),
+                         args.source, args.data_dir, budget_seconds=args.budget_seconds,
+                         search=args.search, timeout=args.timeout, seed=args.seed)
+
+    problems = []
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            problems = flag_regressions(runs, json.load(f)['runs'])
+
+    results = {'environment': environment(), 'runs': runs}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline diperbarui: '{args.baseline}'")
+
+    columns = ['rows', 'problem_type', 'workers', 'status', 'wall_seconds', 'peak_mb',
+               'best_model', 'metric', 'score', 'vs_baseline']
+    table = pd.DataFrame(runs).reindex(columns=columns)
+    print("\n" + table.fillna('-').to_markdown(index=False))
+    print(f"\n💾 Hasil disimpan ke '{args.output}'")
+    if problems:
+        print("\n❌ Regresi terdeteksi:")
+        for problem in problems:
+            print(f"   - {problem}")
+        raise SystemExit(1)
@@ -0,0 +1,398 @@
+# ==============================================================================
+# PEMUATAN DATA BERTAHAP (CHUNKED) DENGAN TIPE DATA RINGKAS
+# ==============================================================================
+#
+# TUJUAN:
+# `pd.read_csv` biasa menyimpan kolom teks (misal 'Cut', 'Color', 'Clarity')
+# sebagai objek string Python dan angka sebagai float64/int64. Untuk file
+# berukuran GB, memori habis sebelum `setup()` sempat berjalan.
+#
+# CARA KERJA:
+# - File dibaca per potongan (chunk) sehingga teks mentah tidak pernah dimuat
+#   sekaligus.
+# - Skema ringkas disimpulkan dari chunk pertama: kolom teks berkardinalitas
+#   rendah menjadi `category`, float menjadi float32, integer diperkecil.
+# - Opsional: hanya sebagian baris yang disimpan, memakai reservoir sampling
+#   (acak seragam, satu kali baca) atau sampling berstrata pada kolom target
+#   (proporsi kelas dipertahankan, dua kali baca).
+# - Snapshot kolumnar (Parquet/Arrow) menyimpan tipe ringkas beserta kamus
+#   kategorinya, sehingga run berikutnya tidak perlu mem-parsing teks lagi.
+#   File Arrow dibaca lewat memory-map dan hanya kolom yang diminta yang dimuat.
+#
+# ==============================================================================
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+COLUMNAR_EXTENSIONS = ('.parquet', '.arrow', '.feather')
+# Kolom teks dijadikan `category` jika rasio nilai unik <= batas ini
+CATEGORY_MAX_RATIO = 0.5
+# Sampling berstrata: kolom numerik dengan nilai unik lebih dari ini (misal target
+# regresi) dibagi ke sejumlah kuantil ini; nilai kosong menjadi satu strata tersendiri
+MAX_STRATA = 20
+NA_STRATUM = '<NA>'
+
+
+def peak_rss_mb() -> float:
+    """Puncak memori resident proses ini (MB)."""
+    try:
+        import resource
+    except ImportError:
+        # Windows tidak punya modul `resource`; psutil menyediakan puncak working set
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 ** 2
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux melaporkan kilobyte
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _frame_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+class CompactSchema:
+    """
+    Skema ringkas yang disimpulkan dari chunk pertama lalu diterapkan ke semua
+    chunk. Kategori untuk kolom `category` terus bertambah saat nilai baru muncul,
+    sehingga semua chunk memakai daftar kategori yang sama dan bisa digabung.
+    """
+
+    def __init__(self, sample: pd.DataFrame, category_max_ratio: float = CATEGORY_MAX_RATIO):
+        self.categories = {}
+        for col in sample.columns:
+            series = sample[col]
+            if series.dtype == object and len(series):
+                if series.nunique(dropna=True) / len(series) <= category_max_ratio:
+                    self.categories[col] = []
+
+    def _category(self, col: str, series: pd.Series) -> pd.Categorical:
+        known = self.categories[col]
+        seen = set(known)
+        known.extend(value for value in pd.unique(series.dropna()) if value not in seen)
+        return pd.Categorical(series, categories=known)
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        compact = {}
+        for col in chunk.columns:
+            series = chunk[col]
+            if col in self.categories:
+                compact[col] = self._category(col, series)
+            elif pd.api.types.is_float_dtype(series):
+                compact[col] = series.astype(np.float32)
+            elif pd.api.types.is_integer_dtype(series):
+                compact[col] = pd.to_numeric(series, downcast='integer')
+            else:
+                compact[col] = series
+        return pd.DataFrame(compact, index=chunk.index)
+
+    def finalize(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Menyamakan daftar kategori akhir (chunk awal belum melihat nilai yang muncul belakangan)."""
+        for col, known in self.categories.items():
+            if col in frame:
+                frame[col] = frame[col].cat.set_categories(known)
+        return frame
+
+
+class _Reservoir:
+    """Reservoir sampling (Algorithm R) yang divektorisasi per chunk."""
+
+    def __init__(self, size: int, rng: np.random.Generator):
+        self.size = size
+        self.rng = rng
+        self.slots = np.empty(size, dtype=np.int64)  # ID baris global per slot
+        self.filled = 0
+        self.seen = 0
+        self.pool = []  # baris kandidat yang (pernah) menempati slot
+
+    def offer(self, chunk: pd.DataFrame):
+        """`chunk` harus ber-index ID baris global yang unik."""
+        ids = chunk.index.to_numpy()
+        fill = min(self.size - self.filled, len(ids))
+        self.slots[self.filled:self.filled + fill] = ids[:fill]
+        self.filled += fill
+
+        rest = ids[fill:]
+        if len(rest):
+            # Baris ke-i (0-based) menggantikan slot acak j jika j < ukuran reservoir
+            positions = self.rng.integers(0, np.arange(self.seen + fill, self.seen + len(ids)) + 1)
+            hit = positions < self.size
+            positions, winners = positions[hit], rest[hit]
+            # Jika satu slot terkena beberapa kali dalam chunk ini, baris terakhir yang menang
+            _, last = np.unique(positions[::-1], return_index=True)
+            keep = len(positions) - 1 - last
+            self.slots[positions[keep]] = winners[keep]
+        self.seen += len(ids)
+
+        current = self.slots[:self.filled]
+        self.pool.append(chunk[np.isin(ids, current)])
+        if sum(len(part) for part in self.pool) > 4 * self.size:
+            merged = pd.concat(self.pool)
+            self.pool = [merged[np.isin(merged.index.to_numpy(), current)]]
+
+    def result(self) -> pd.DataFrame:
+        if not self.pool:
+            return pd.DataFrame()
+        merged = pd.concat(self.pool)
+        return merged.loc[self.slots[:self.filled]]
+
+
+def _read_chunks(path: str, chunksize: int, usecols: list = None):
+    """Membaca CSV per chunk dengan index berupa nomor baris global."""
+    offset = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def _strata_edges(counts: pd.Series):
+    """Batas kuantil dari jumlah per nilai jika kolom numerik kontinu, selain itu None."""
+    counts = counts[counts.index.notna()]
+    if len(counts) <= MAX_STRATA or not pd.api.types.is_numeric_dtype(counts.index):
+        return None
+    counts = counts.sort_index()
+    cumulative = (counts.cumsum() / counts.sum()).to_numpy()
+    positions = np.searchsorted(cumulative, np.linspace(0, 1, MAX_STRATA + 1)[1:-1])
+    return np.unique(counts.index.to_numpy()[positions])
+
+
+def _strata(values: pd.Series, edges) -> pd.Series:
+    """Kunci strata per baris: nilainya sendiri atau nomor kuantil (`edges`); NaN -> NA_STRATUM."""
+    if edges is None:
+        keys = values.astype(object)
+    else:
+        keys = pd.Series(np.searchsorted(edges, values.to_numpy(), side='right'), index=values.index, dtype=object)
+    return keys.where(values.notna(), NA_STRATUM)
+
+
+def _stratum_quotas(path: str, column: str, sample_rows: int, chunksize: int) -> tuple:
+    """
+    Pass pertama sampling berstrata: menghitung jumlah baris per strata.
+
+    Returns:
+        tuple: (kuota sampel per kunci strata, batas kuantil atau None).
+    """
+    counts = None
+    for chunk in _read_chunks(path, chunksize, usecols=[column]):
+        part = chunk[column].value_counts(dropna=False)
+        counts = part if counts is None else counts.add(part, fill_value=0)
+    edges = _strata_edges(counts)
+    counts = counts.groupby(_strata(counts.index.to_series(), edges).to_numpy(), sort=False).sum()
+    total = counts.sum()
+    return {key: max(int(round(sample_rows * count / total)), 1) for key, count in counts.items()}, edges
+
+
+def load_csv(path: str, chunksize: int = DEFAULT_CHUNKSIZE, sample_rows: int = None,
+             sample_method: str = 'reservoir', stratify_column: str = None,
+             seed: int = 123, verbose: bool = True, columns: list = None) -> pd.DataFrame:
+    """
+    Memuat CSV per chunk dengan tipe data ringkas dan sampling opsional.
+
+    Args:
+        path (str): Path file CSV.
+        chunksize (int): Jumlah baris per chunk.
+        sample_rows (int): Jumlah baris sampel. None berarti semua baris dimuat.
+        sample_method (str): 'reservoir' (acak seragam) atau 'stratified'
+            (proporsi `stratify_column` dipertahankan).
+        stratify_column (str): Kolom strata, biasanya kolom target. Kolom numerik
+            dengan lebih dari `MAX_STRATA` nilai unik dibagi ke kuantil.
+        seed (int): Seed generator acak untuk sampling.
+        verbose (bool): Cetak ringkasan pemakaian memori.
+        columns (list): Hanya muat kolom-kolom ini. None berarti semua kolom.
+
+    Returns:
+        pd.DataFrame: Data dengan tipe ringkas (category/float32/integer kecil).
+    """
+    if sample_method not in ('reservoir', 'stratified'):
+        raise ValueError("Metode sampling tidak valid. Pilih 'reservoir' atau 'stratified'.")
+    if sample_method == 'stratified' and sample_rows and not stratify_column:
+        raise ValueError("Sampling berstrata membutuhkan `stratify_column`.")
+
+    rss_before = peak_rss_mb()
+    raw_mb = 0.0
+    rng = np.random.default_rng(seed)
+    schema = None
+
+    if sample_rows:
+        if sample_method == 'stratified':
+            quotas, edges = _stratum_quotas(path, stratify_column, sample_rows, chunksize)
+            reservoirs = {value: _Reservoir(quota, rng) for value, quota in quotas.items()}
+        else:
+            reservoirs = {None: _Reservoir(sample_rows, rng)}
+        for chunk in _read_chunks(path, chunksize, usecols=columns):
+            raw_mb += _frame_mb(chunk)
+            if sample_method == 'stratified':
+                for key, part in chunk.groupby(_strata(chunk[stratify_column], edges), sort=False):
+                    reservoirs[key].offer(part)
+            else:
+                reservoirs[None].offer(chunk)
+        raw = pd.concat([reservoir.result() for reservoir in reservoirs.values()])
+        raw = raw.sort_index()
+        schema = CompactSchema(raw)
+        frame = schema.apply(raw)
+    else:
+        parts = []
+        for chunk in _read_chunks(path, chunksize, usecols=columns):
+            raw_mb += _frame_mb(chunk)
+            if schema is None:
+                schema = CompactSchema(chunk)
+            parts.append(schema.apply(chunk))
+        if not parts:
+            return pd.read_csv(path, usecols=columns)
+        # Semua chunk disamakan daftar kategorinya agar hasil concat tetap `category`
+        frame = pd.concat([schema.finalize(part) for part in parts])
+
+    frame = schema.finalize(frame).reset_index(drop=True)
+    if verbose:
+        print(f"📦 Data dimuat: {len(frame)} baris, {frame.shape[1]} kolom")
+        print(f"   Memori data: {raw_mb:.1f} MB (tipe bawaan) -> {_frame_mb(frame):.1f} MB (tipe ringkas)")
+        print(f"   Puncak memori proses: {rss_before:.1f} MB sebelum -> {peak_rss_mb():.1f} MB sesudah")
+    return frame
+
+
+# ------------------------------------------------------------------------------
+# SNAPSHOT KOLUMNAR (PARQUET / ARROW)
+# ------------------------------------------------------------------------------
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Format Parquet/Arrow membutuhkan library 'pyarrow' (pip install pyarrow).") from e
+
+
+def write_snapshot(data: pd.DataFrame, path: str):
+    """
+    Menyimpan DataFrame sebagai snapshot bertipe (Parquet atau Arrow IPC).
+
+    Kolom `category` disimpan sebagai dictionary sehingga kembali menjadi
+    `category` saat dibaca. File Arrow ditulis tanpa kompresi agar bisa dibaca
+    langsung lewat memory-map tanpa dekompresi.
+    """
+    _require_pyarrow()
+    extension = os.path.splitext(path)[1].lower()
+    # Tulis ke file sementara lalu ganti sekaligus agar pembaca tidak melihat file setengah jadi
+    tmp_path = f"{path}.tmp"
+    if extension == '.parquet':
+        data.to_parquet(tmp_path, index=False)
+    elif extension in ('.arrow', '.feather'):
+        from pyarrow import feather
+        feather.write_feather(data.reset_index(drop=True), tmp_path, compression='uncompressed')
+    else:
+        raise ValueError(f"Format snapshot tidak dikenal: '{extension}'. Gunakan .parquet atau .arrow.")
+    os.replace(tmp_path, path)
+
+
+def load_columnar(path: str, columns: list = None, verbose: bool = True) -> pd.DataFrame:
+    """
+    Memuat file Parquet/Arrow dengan proyeksi kolom dan memory-map.
+
+    Args:
+        path (str): Path file .parquet, .arrow, atau .feather.
+        columns (list): Hanya muat kolom-kolom ini. None berarti semua kolom.
+        verbose (bool): Cetak ringkasan pemakaian memori.
+
+    Returns:
+        pd.DataFrame: Data dengan tipe yang tersimpan di file (tanpa parsing teks).
+    """
+    _require_pyarrow()
+    rss_before = peak_rss_mb()
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        from pyarrow import feather
+        table = feather.read_table(path, columns=columns, memory_map=True)
+    frame = table.to_pandas()
+    if verbose:
+        print(f"📦 Snapshot dimuat: {len(frame)} baris, {frame.shape[1]} kolom ({_frame_mb(frame):.1f} MB)")
+        print(f"   Puncak memori proses: {rss_before:.1f} MB sebelum -> {peak_rss_mb():.1f} MB sesudah")
+    return frame
+
+
+def iter_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE, columns: list = None):
+    """
+    Membaca file CSV/Parquet/Arrow per chunk (DataFrame) tanpa memuat seluruh isinya.
+
+    Parquet dibaca per batch lewat `iter_batches`, Arrow IPC lewat memory-map
+    lalu diiris per `chunksize` baris (irisan Arrow tidak menyalin data).
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in COLUMNAR_EXTENSIONS:
+        yield from _read_chunks(path, chunksize, usecols=columns)
+        return
+
+    _require_pyarrow()
+    if extension == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        from pyarrow import feather
+        table = feather.read_table(path, columns=columns, memory_map=True)
+        for offset in range(0, table.num_rows, chunksize):
+            yield table.slice(offset, chunksize).to_pandas()
+
+
+def _sample_frame(data: pd.DataFrame, sample_rows: int, sample_method: str,
+                  stratify_column: str, seed: int) -> pd.DataFrame:
+    """Sampling di memori untuk sumber kolumnar (data sudah ter-memory-map)."""
+    if sample_rows >= len(data):
+        return data
+    if sample_method == 'stratified':
+        frac = sample_rows / len(data)
+        edges = _strata_edges(data[stratify_column].value_counts(dropna=False))
+        sample = data.groupby(_strata(data[stratify_column], edges), group_keys=False, sort=False) \
+            .sample(frac=frac, random_state=seed)
+        return sample.sort_index().reset_index(drop=True)
+    return data.sample(n=sample_rows, random_state=seed).sort_index().reset_index(drop=True)
+
+
+def load_dataset(path: str, columns: list = None, snapshot: str = None, sample_rows: int = None,
+                 sample_method: str = 'reservoir', stratify_column: str = None,
+                 seed: int = 123, chunksize: int = DEFAULT_CHUNKSIZE, verbose: bool = True) -> pd.DataFrame:
+    """
+    Titik masuk pemuatan data: memilih pembaca sesuai ekstensi file.
+
+    Args:
+        path (str): Path file CSV, Parquet, atau Arrow.
+        columns (list): Proyeksi kolom (fitur + target). None berarti semua kolom.
+        snapshot (str): Path snapshot .parquet/.arrow untuk input CSV. Jika snapshot
+            lebih baru dari CSV, snapshot yang dibaca; jika belum ada, snapshot dibuat
+            setelah CSV dimuat penuh.
+        sample_rows, sample_method, stratify_column, seed, chunksize: Lihat `load_csv`.
+
+    Returns:
+        pd.DataFrame: Data dengan tipe ringkas.
+    """
+    if path.lower().endswith(COLUMNAR_EXTENSIONS):
+        frame = load_columnar(path, columns=columns, verbose=verbose)
+        if sample_rows:
+            frame = _sample_frame(frame, sample_rows, sample_method, stratify_column, seed)
+        return frame
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    if snapshot and os.path.exists(snapshot) and os.path.getmtime(snapshot) >= os.path.getmtime(path):
+        if verbose:
+            print(f"⚡ Memakai snapshot '{snapshot}' (CSV tidak berubah sejak snapshot dibuat).")
+        return load_dataset(snapshot, columns=columns, sample_rows=sample_rows, sample_method=sample_method,
+                            stratify_column=stratify_column, seed=seed, verbose=verbose)
+
+    frame = load_csv(path, chunksize=chunksize, sample_rows=sample_rows, sample_method=sample_method,
+                     stratify_column=stratify_column, seed=seed, verbose=verbose, columns=columns)
+    if snapshot and not sample_rows and columns is None:
+        # Snapshot hanya dibuat dari data lengkap agar bisa dipakai ulang oleh run mana pun
+        write_snapshot(frame, snapshot)
+        if verbose:
+            print(f"💾 Snapshot bertipe disimpan ke '{snapshot}'.")
+    return frame
@@ -0,0 +1,352 @@
+# ==============================================================================
+# KEPENTINGAN FITUR & ATRIBUSI SHAP UNTUK PIPELINE TERBAIK
+# ==============================================================================
+#
+# TUJUAN:
+# Laporan offline menyarankan "Analisis Kepentingan Fitur", tetapi hasilnya tidak
+# pernah dihitung. Modul ini menganalisis pipeline pemenang yang disimpan
+# `train_model` (`<model_output>.pkl`, lihat predict_service.py):
+# - Permutation importance pada kolom ASLI (sebelum pra-pemrosesan): penurunan
+#   metrik utama (Accuracy / R2) saat nilai satu fitur diacak. Setiap fitur
+#   dinilai oleh satu tugas di process pool; semua pengulangan satu fitur
+#   diprediksi dalam SATU panggilan `predict` (baris sampel ditumpuk).
+# - Atribusi SHAP (rata-rata |SHAP| per fitur) tanpa library `shap`:
+#   * LightGBM: TreeSHAP bawaan (`pred_contrib=True`).
+#   * XGBoost / CatBoost: TreeSHAP aproksimasi bawaan library masing-masing.
+#   * Random Forest, Extra Trees, Decision Tree, Gradient Boosting sklearn:
+#     aproksimasi jalur pohon (Saabas) yang divektorisasi dengan `decision_path`.
+#   * Model linear: SHAP linear eksak, coef x (x - rata-rata background).
+#   Atribusi kolom hasil one-hot dijumlahkan kembali ke kolom aslinya.
+#   Model lain hanya mendapat permutation importance.
+# - Memori & waktu dibatasi ukuran sampel: `background_rows` baris sampel
+#   (permutation importance & referensi SHAP), `shap_rows` baris yang dijelaskan,
+#   dan `n_repeats` pengulangan acak per fitur.
+# - Hasil disimpan di cache dengan kunci hash file model + sidik jari sampel,
+#   sehingga model & data yang sama tidak dianalisis ulang.
+#
+# PEMAKAIAN:
+#   python report.py --data_input data.csv --target_column Cut \
+#       --problem_type classification --explain --explain_workers 4
+#
+# ==============================================================================
+
+import os
+import json
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from model_search import SORT_METRIC, limit_native_threads
+from predict_service import load_pipeline
+from result_cache import dataset_fingerprint
+
+EXPLAIN_FORMAT_VERSION = 2
+
+# State per proses worker: pipeline, sampel, dan target
+_WORKER = {}
+
+
+# ------------------------------------------------------------------------------
+# PERMUTATION IMPORTANCE
+# ------------------------------------------------------------------------------
+def _score(metric: str, y_true, y_pred) -> float:
+    from sklearn.metrics import accuracy_score, r2_score
+
+    return float(accuracy_score(y_true, y_pred) if metric == 'Accuracy' else r2_score(y_true, y_pred))
+
+
+def _init_worker(pipeline, X: pd.DataFrame, y: np.ndarray, metric: str, threads: int):
+    """Dijalankan sekali per worker; `pipeline` boleh berupa path `.pkl`."""
+    from threadpoolctl import threadpool_limits
+
+    if isinstance(pipeline, str):
+        pipeline, _ = load_pipeline(pipeline)
+    _WORKER.update({'limits': threadpool_limits(limits=threads), 'pipeline': pipeline,
+                    'X': X, 'y': y, 'metric': metric})
+
+
+def _permute_feature(index: int, column: str, n_repeats: int, seed: int) -> tuple:
+    """
+    Skor metrik setelah kolom `column` diacak `n_repeats` kali.
+
+    Returns:
+        tuple: (nama kolom, list skor per pengulangan).
+    """
+    X, y = _WORKER['X'], _WORKER['y']
+    n_rows = len(X)
+    # Seed per fitur: hasil identik berapa pun jumlah worker
+    rng = np.random.default_rng([seed, index])
+    stacked = pd.concat([X] * n_repeats, ignore_index=True)
+    values = X[column].to_numpy()
+    stacked[column] = np.concatenate([values[rng.permutation(n_rows)] for _ in range(n_repeats)])
+    predictions = np.asarray(_WORKER['pipeline'].predict(stacked))
+    return column, [_score(_WORKER['metric'], y, predictions[i * n_rows:(i + 1) * n_rows])
+                    for i in range(n_repeats)]
+
+
+def permutation_importance(pipeline, model_path: str, X: pd.DataFrame, y: np.ndarray, metric: str,
+                           n_repeats: int = 5, workers: int = 1, seed: int = 123) -> tuple:
+    """
+    Permutation importance per kolom asli, paralel per fitur jika `workers` > 1.
+
+    Returns:
+        tuple: (skor dasar, DataFrame kolom Fitur / Penurunan / Std).
+    """
+    baseline = _score(metric, y, np.asarray(pipeline.predict(X)))
+    results = {}
+    if workers and workers > 1:
+        threads = max((os.cpu_count() or 1) // workers, 1)
+        context = multiprocessing.get_context('spawn')
+        # Worker memuat pipeline dari file sendiri (lebih murah daripada mem-pickle ulang)
+        with limit_native_threads(threads), ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_worker,
+                initargs=(model_path, X, y, metric, threads)) as pool:
+            futures = [pool.submit(_permute_feature, i, column, n_repeats, seed)
+                       for i, column in enumerate(X.columns)]
+            for future in as_completed(futures):
+                column, scores = future.result()
+                results[column] = scores
+    else:
+        _init_worker(pipeline, X, y, metric, os.cpu_count() or 1)
+        for i, column in enumerate(X.columns):
+            column, scores = _permute_feature(i, column, n_repeats, seed)
+            results[column] = scores
+
+    drops = pd.DataFrame({
+        'Fitur': list(X.columns),
+        'Penurunan': [baseline - float(np.mean(results[col])) for col in X.columns],
+        'Std': [float(np.std(results[col])) for col in X.columns],
+    })
+    return baseline, drops
+
+
+# ------------------------------------------------------------------------------
+# ATRIBUSI SHAP (TANPA LIBRARY `shap`)
+# ------------------------------------------------------------------------------
+def _saabas_tree(tree, X: np.ndarray, classifier: bool) -> np.ndarray:
+    """
+    Atribusi jalur satu pohon sklearn: perubahan nilai node di sepanjang jalur
+    keputusan diberikan ke fitur pemisahnya.
+
+    Returns:
+        np.ndarray: Bentuk (baris, fitur, output).
+    """
+    from scipy import sparse
+
+    t = tree.tree_
+    value = t.value[:, 0, :] if classifier else t.value[:, :, 0]
+    if classifier:
+        value = value / np.maximum(value.sum(axis=1, keepdims=True), 1e-12)
+    parent = np.full(t.node_count, -1)
+    internal = np.flatnonzero(t.children_left >= 0)
+    parent[t.children_left[internal]] = internal
+    parent[t.children_right[internal]] = internal
+    child = np.flatnonzero(parent >= 0)
+    delta = value[child] - value[parent[child]]
+    # Matriks (edge x fitur): edge ke-i milik fitur pemisah node induknya
+    edges = sparse.csr_matrix((np.ones(len(child)), (np.arange(len(child)), t.feature[parent[child]])),
+                              shape=(len(child), X.shape[1]))
+    path = tree.decision_path(X)[:, child]
+    out = np.empty((X.shape[0], X.shape[1], value.shape[1]))
+    for k in range(value.shape[1]):
+        out[:, :, k] = (path @ edges.multiply(delta[:, [k]])).toarray()
+    return out
+
+
+def _native_contributions(contrib: np.ndarray, n_rows: int, n_features: int) -> np.ndarray:
+    """(baris, [output,] fitur + bias) atau (baris, output x (fitur + bias)) -> (baris, fitur, output)."""
+    contrib = np.asarray(contrib).reshape(n_rows, -1, n_features + 1)
+    return contrib[:, :, :-1].transpose(0, 2, 1)
+
+
+def shap_attributions(model, X: np.ndarray, background: np.ndarray) -> tuple:
+    """
+    Atribusi SHAP estimator akhir pada matriks hasil pra-pemrosesan.
+
+    Returns:
+        tuple: (array (baris, fitur, output) atau None, nama metode).
+    """
+    from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor, ExtraTreesClassifier,
+                                  ExtraTreesRegressor, GradientBoostingClassifier, GradientBoostingRegressor)
+    from sklearn.tree import BaseDecisionTree
+
+    scale = 1.0
+    if type(model).__name__ == 'ScaledTargetRegressor':
+        # Learner out-of-core regresi: target distandarisasi di dalam model
+        model, scale = model.estimator, model.std
+    name = type(model).__name__
+    booster = getattr(model, 'booster_', None)
+    n_rows, n_features = X.shape
+
+    if booster is not None and type(booster).__module__.startswith('lightgbm'):
+        contrib = _native_contributions(booster.predict(X, pred_contrib=True), n_rows, n_features)
+        method = 'TreeSHAP LightGBM (pred_contrib)'
+    elif name.startswith('XGB'):
+        import xgboost
+        contrib = _native_contributions(
+            model.get_booster().predict(xgboost.DMatrix(X), pred_contribs=True, approx_contribs=True),
+            n_rows, n_features)
+        method = 'TreeSHAP aproksimasi XGBoost'
+    elif name.startswith('CatBoost'):
+        from catboost import Pool
+        contrib = _native_contributions(
+            model.get_feature_importance(Pool(X), type='ShapValues', shap_calc_type='Approximate'),
+            n_rows, n_features)
+        method = 'TreeSHAP aproksimasi CatBoost'
+    elif isinstance(model, (RandomForestClassifier, RandomForestRegressor,
+                            ExtraTreesClassifier, ExtraTreesRegressor)):
+        classifier = isinstance(model, (RandomForestClassifier, ExtraTreesClassifier))
+        contrib = sum(_saabas_tree(tree, X, classifier) for tree in model.estimators_) / len(model.estimators_)
+        method = 'aproksimasi jalur pohon (Saabas)'
+    elif isinstance(model, BaseDecisionTree):
+        contrib = _saabas_tree(model, X, classifier=hasattr(model, 'classes_'))
+        method = 'aproksimasi jalur pohon (Saabas)'
+    elif isinstance(model, (GradientBoostingClassifier, GradientBoostingRegressor)):
+        stages = model.estimators_
+        contrib = np.zeros((n_rows, n_features, stages.shape[1]))
+        for trees in stages:
+            for k, tree in enumerate(trees):
+                contrib[:, :, k] += _saabas_tree(tree, X, classifier=False)[:, :, 0]
+        contrib *= model.learning_rate
+        method = 'aproksimasi jalur pohon (Saabas)'
+    elif hasattr(model, 'coef_'):
+        coef = np.atleast_2d(np.asarray(model.coef_, dtype=np.float64))
+        contrib = (X - background.mean(axis=0))[:, :, None] * coef.T[None, :, :]
+        method = 'SHAP linear'
+    else:
+        return None, None
+    return contrib * scale, method
+
+
+def _transformed(pipeline, X: pd.DataFrame) -> tuple:
+    """Matriks hasil pra-pemrosesan pipeline beserta nama kolomnya."""
+    preprocess = pipeline[:-1]
+    matrix = preprocess.transform(X)
+    if isinstance(matrix, pd.DataFrame):
+        return matrix.to_numpy(dtype=np.float64), [str(col) for col in matrix.columns]
+    return np.asarray(matrix, dtype=np.float64), [str(col) for col in preprocess.get_feature_names_out()]
+
+
+def _source_column(name: str, columns: list) -> str:
+    """Kolom asli sebuah kolom hasil transformasi (`Color_E` -> `Color`)."""
+    matches = [col for col in columns if name == col or name.startswith(f"{col}_")]
+    return max(matches, key=len) if matches else name
+
+
+def grouped_shap(pipeline, X: pd.DataFrame, background: pd.DataFrame) -> tuple:
+    """
+    Rata-rata |SHAP| per kolom asli. Atribusi kolom one-hot dijumlahkan per
+    baris sebelum diambil nilai mutlaknya; output ganda (multikelas) dirata-rata.
+
+    Returns:
+        tuple: (Series rata-rata |SHAP| per kolom asli atau None, nama metode).
+    """
+    matrix, names = _transformed(pipeline, X)
+    background_matrix, _ = _transformed(pipeline, background)
+    contrib, method = shap_attributions(pipeline[-1], matrix, background_matrix)
+    if contrib is None:
+        return None, None
+    columns = [str(col) for col in X.columns]
+    groups = pd.Series([_source_column(name, columns) for name in names])
+    grouped = {column: np.abs(contrib[:, (groups == column).to_numpy(), :].sum(axis=1)).mean()
+               for column in groups.unique()}
+    return pd.Series(grouped, dtype=np.float64), method
+
+
+# ------------------------------------------------------------------------------
+# TAHAP PENJELASAN MODEL (DENGAN CACHE)
+# ------------------------------------------------------------------------------
+def model_hash(model_path: str) -> str:
+    """SHA-256 isi file pipeline `.pkl`."""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def explain_model(model_path: str, data: pd.DataFrame, target_column: str, problem_type: str,
+                  background_rows: int = 1000, shap_rows: int = 200, n_repeats: int = 5,
+                  workers: int = 1, session_id: int = 123, cache_dir: str = '.explain_cache',
+                  holdout: bool = False) -> dict:
+    """
+    Permutation importance & atribusi SHAP untuk pipeline tersimpan.
+
+    Args:
+        model_path (str): Path pipeline dengan atau tanpa '.pkl'.
+        data (pd.DataFrame): Data berlabel; hanya `background_rows` baris sampel yang dipakai.
+            Sebaiknya baris holdout: baris yang ikut melatih pipeline membuat skor
+            dan penurunannya optimistis (in-sample).
+        target_column (str): Nama kolom target.
+        problem_type (str): 'classification' atau 'regression'.
+        background_rows (int): Ukuran sampel untuk permutation importance & referensi SHAP.
+        shap_rows (int): Jumlah baris sampel yang dihitung atribusi SHAP-nya.
+        n_repeats (int): Jumlah pengacakan per fitur.
+        workers (int): Jumlah proses worker permutation importance. 1 berarti di proses ini.
+        session_id (int): Seed sampling & pengacakan.
+        cache_dir (str): Folder cache hasil. None berarti tanpa cache.
+        holdout (bool): True jika `data` hanya berisi baris yang tidak dipakai melatih pipeline.
+
+    Returns:
+        dict: metric, baseline, rows, shap_rows, n_repeats, shap_method (None jika
+        model tidak didukung), holdout, model_hash, dan importance (list baris per fitur,
+        terurut dari penurunan metrik terbesar).
+    """
+    base = model_path[:-4] if model_path.endswith('.pkl') else model_path
+    pipeline, meta = load_pipeline(base)
+    features = meta['features']
+    metric = SORT_METRIC[problem_type]
+
+    sample = data if len(data) <= background_rows else data.sample(background_rows, random_state=session_id)
+    sample = sample.dropna(subset=[target_column]).reset_index(drop=True)
+    X, y = sample[features], sample[target_column].to_numpy()
+
+    hashed = model_hash(base + '.pkl')
+    cache_path = None
+    if cache_dir:
+        key = dataset_fingerprint(sample, target_column, problem_type, session_id,
+                                  extra={'model': hashed, 'holdout': holdout, 'shap_rows': shap_rows, 'n_repeats': n_repeats,
+                                         'format': EXPLAIN_FORMAT_VERSION})
+        cache_path = os.path.join(cache_dir, key + '.json')
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding='utf-8') as f:
+                print("♻️ Hasil analisis kepentingan fitur diambil dari cache.")
+                return json.load(f)
+
+    if not holdout:
+        print("   ⚠️ Sampel analisis kepentingan fitur mencakup baris latih: angka bersifat in-sample.")
+    print(f"🔍 Menghitung permutation importance ({len(features)} fitur x {n_repeats} pengulangan, "
+          f"{len(X)} baris sampel)...")
+    baseline, importance = permutation_importance(pipeline, base + '.pkl', X, y, metric,
+                                                  n_repeats=n_repeats, workers=workers, seed=session_id)
+
+    try:
+        shap_values, shap_method = grouped_shap(pipeline, X.head(shap_rows), X)
+    except Exception as e:
+        print(f"   ⚠️ Atribusi SHAP gagal: {e}")
+        shap_values, shap_method = None, None
+    if shap_values is None:
+        print(f"   ℹ️ Atribusi SHAP tidak tersedia untuk {type(pipeline[-1]).__name__}; "
+              f"hanya permutation importance.")
+        importance['SHAP'] = np.nan
+    else:
+        importance['SHAP'] = importance['Fitur'].map(shap_values)
+
+    importance = importance.sort_values('Penurunan', ascending=False)
+    result = {
+        'metric': metric, 'baseline': round(baseline, 4), 'rows': len(X), 'shap_rows': min(shap_rows, len(X)),
+        'n_repeats': n_repeats, 'shap_method': shap_method, 'holdout': holdout, 'model_hash': hashed,
+        'importance': [{'Fitur': row.Fitur, 'Penurunan': round(row.Penurunan, 4), 'Std': round(row.Std, 4),
+                        'SHAP': None if pd.isna(row.SHAP) else round(float(row.SHAP), 4)}
+                       for row in importance.itertuples()],
+    }
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    return result
@@ -0,0 +1,314 @@
+# ==============================================================================
+# CACHE PRA-PEMROSESAN PER FOLD (MATRIKS FOLD DIHITUNG SEKALI, DIPAKAI BERSAMA)
+# ==============================================================================
+#
+# TUJUAN:
+# Di dalam `compare_models()`, setiap kandidat estimator menjalankan ulang
+# cross-validation lengkap: pipeline pra-pemrosesan (imputasi, encoding
+# kategorikal, dst.) di-fit ulang pada setiap fold untuk SETIAP kandidat.
+# Padahal hasil transformasinya identik untuk semua kandidat. Modul ini:
+# - Mem-fit pipeline pra-pemrosesan dari `setup()` SEKALI per fold, lalu
+#   menyimpan matriks train/validasi hasil transformasi sebagai file `.npy`.
+# - Memuat matriks tersebut dengan `mmap_mode='r'` sehingga proses worker
+#   berbagi halaman memori yang sama (page cache OS) tanpa menyalin data.
+# - Melatih setiap kandidat (kelas & argumen bawaan dari `models(internal=True)`)
+#   langsung pada matriks tersebut dan menilainya dengan scorer dari
+#   `get_metrics()`, sehingga tabel hasil berskema sama dengan `compare_models()`.
+#
+# CATATAN: fold, pipeline, model, dan metrik diambil dari konfigurasi PyCaret
+# yang sama, jadi skor setara dengan `compare_models()`. Fitur khusus yang
+# dijalankan PyCaret di luar estimator (misal kalibrasi probabilitas) tidak
+# ikut dijalankan; model pemenang tetap dilatih ulang lewat `create_model()`
+# agar pipeline yang disimpan identik dengan jalur biasa.
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import shutil
+import tempfile
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from model_search import (SORT_METRIC, pycaret_module, candidate_models,
+                          build_comparison_table, limit_native_threads)
+from instrumentation import stage, record_event
+
+FOLD_ARRAYS = ('X_train', 'y_train', 'X_valid', 'y_valid')
+# Daftar path fold di `workdir`, agar tahap lain (misal tuning) bisa memakainya ulang
+FOLD_MANIFEST = 'folds.json'
+
+# State per proses worker: path fold & scorer
+_WORKER = {}
+
+
+def precompute_folds(api, workdir: str) -> list:
+    """
+    Mem-fit pipeline pra-pemrosesan sekali per fold dan menyimpan hasilnya ke disk.
+
+    Harus dipanggil setelah `api.setup()`.
+
+    Returns:
+        list: Satu dict per fold berisi path `.npy` untuk setiap nama di `FOLD_ARRAYS`.
+    """
+    from sklearn.base import clone
+
+    pipeline = api.get_config('pipeline')
+    X = api.get_config('X_train')
+    y = api.get_config('y_train_transformed')
+    fold_generator = api.get_config('fold_generator')
+    groups = api.get_config('fold_groups_param')
+
+    folds = []
+    for i, (train_idx, valid_idx) in enumerate(fold_generator.split(X, y, groups=groups)):
+        fold_pipeline = clone(pipeline).fit(X.iloc[train_idx], y.iloc[train_idx])
+        arrays = {
+            'X_train': fold_pipeline.transform(X.iloc[train_idx]),
+            'y_train': y.iloc[train_idx],
+            'X_valid': fold_pipeline.transform(X.iloc[valid_idx]),
+            'y_valid': y.iloc[valid_idx],
+        }
+        paths = {}
+        for name, value in arrays.items():
+            paths[name] = os.path.join(workdir, f"fold{i}_{name}.npy")
+            dtype = np.float64 if name.startswith('X') else None
+            np.save(paths[name], np.ascontiguousarray(np.asarray(value, dtype=dtype)))
+        folds.append(paths)
+    with open(os.path.join(workdir, FOLD_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(folds, f)
+    return folds
+
+
+def saved_folds(workdir: str):
+    """Daftar fold hasil `precompute_folds` di `workdir`; None jika belum ada atau tidak lengkap."""
+    try:
+        with open(os.path.join(workdir, FOLD_MANIFEST), encoding='utf-8') as f:
+            folds = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not folds or not all(os.path.exists(path) for fold in folds for path in fold.values()):
+        return None
+    return folds
+
+
+def load_fold(paths: dict) -> dict:
+    """Memuat matriks satu fold sebagai array memory-mapped (read-only)."""
+    return {name: np.load(path, mmap_mode='r') for name, path in paths.items()}
+
+
+def quiet_args(estimator_class, args: dict) -> dict:
+    """
+    Argumen estimator dengan log pelatihan dimatikan. Jalur ini membuat estimator
+    langsung (tanpa `create_model`), sehingga output LightGBM/XGBoost/CatBoost
+    tidak diredam PyCaret dan bisa mencetak ribuan baris per kandidat.
+    """
+    name = estimator_class.__name__
+    if name.startswith('LGBM'):
+        return {**args, 'verbose': -1}
+    if name.startswith('XGB'):
+        return {**args, 'verbosity': 0}
+    if name.startswith('CatBoost'):
+        # Juga jangan tulis log iterasi ke `catboost_info/`
+        return {**args, 'verbose': False, 'allow_writing_files': False}
+    return args
+
+
+def metric_scorers(api) -> list:
+    """(Nama tampilan, scorer, greater_is_better) untuk setiap metrik `get_metrics()`."""
+    from sklearn.metrics import get_scorer
+
+    metrics = api.get_metrics()
+    return [(row['Display Name'],
+             get_scorer(row['Scorer']) if isinstance(row['Scorer'], str) else row['Scorer'],
+             bool(row['Greater is Better']))
+            for _, row in metrics.iterrows()]
+
+
+class _CachedResponse:
+    """
+    Pembungkus estimator terlatih untuk satu fold validasi: hasil `predict`,
+    `predict_proba`, dan `decision_function` dihitung sekali lalu dipakai ulang oleh
+    semua scorer. Atribut lain (`classes_`, `_estimator_type`, ...) diteruskan apa adanya.
+    """
+
+    RESPONSE_METHODS = ('predict', 'predict_proba', 'decision_function')
+
+    def __init__(self, estimator):
+        self.estimator = estimator
+        self._responses = {}
+
+    def __getattr__(self, name):
+        method = getattr(self.estimator, name)
+        if name not in self.RESPONSE_METHODS:
+            return method
+
+        @functools.wraps(method)  # scorer sklearn memeriksa `__name__` metode respons
+        def cached(X):
+            if name not in self._responses:
+                self._responses[name] = method(X)
+            return self._responses[name]
+        return cached
+
+
+def score_fold(estimator, X_valid, y_valid, scorers: list) -> dict:
+    """
+    Menilai estimator terlatih dengan semua scorer pada satu fold validasi.
+
+    Prediksi dihitung sekali per fold (lihat `_CachedResponse`). Sama seperti
+    compare_models, metrik yang tidak bisa dihitung (misal AUC untuk model tanpa
+    probabilitas) bernilai 0.
+
+    Returns:
+        dict: {nama tampilan metrik: skor}.
+    """
+    cached, scores = _CachedResponse(estimator), {}
+    for display, scorer, _ in scorers:
+        try:
+            scores[display] = float(scorer(cached, X_valid, y_valid))
+        except Exception:
+            scores[display] = 0.0
+    return scores
+
+
+def _score_on_folds(model_id: str, name: str, spec: tuple, folds: list, scorers: list):
+    """
+    Melatih & menilai satu kandidat pada matriks fold yang sudah ditransformasi.
+
+    Returns:
+        tuple: (baris tabel perbandingan, pengukuran waktu).
+    """
+    estimator_class, args = spec
+    start, wall0, cpu0 = time.time(), time.perf_counter(), time.process_time()
+    fold_scores, fit_times = {display: [] for display, _, _ in scorers}, []
+    for paths in folds:
+        fold = load_fold(paths)
+        fit_start = time.perf_counter()
+        estimator = estimator_class(**args).fit(fold['X_train'], fold['y_train'])
+        fit_times.append(time.perf_counter() - fit_start)
+        scores = score_fold(estimator, fold['X_valid'], fold['y_valid'], scorers)
+        for display, _, greater in scorers:
+            fold_scores[display].append(scores[display] if greater else -scores[display])
+    timing = {'start': start, 'wall': time.perf_counter() - wall0,
+              'cpu': time.process_time() - cpu0, 'tid': os.getpid()}
+    row = {'Model': name, **{display: round(float(np.mean(values)), 4) for display, values in fold_scores.items()},
+           'TT (Sec)': float(np.mean(fit_times))}
+    return row, timing
+
+
+def _init_worker(folds: list, scorers, threads: int, deadline: float):
+    """
+    Dijalankan sekali per worker: cukup simpan path fold (tanpa `setup()` PyCaret).
+
+    `scorers` boleh berupa bytes hasil `cloudpickle`: beberapa metrik PyCaret
+    (misal RMSLE) memakai fungsi lokal yang tidak bisa di-pickle biasa.
+    """
+    from threadpoolctl import threadpool_limits
+
+    if isinstance(scorers, bytes):
+        import cloudpickle
+        scorers = cloudpickle.loads(scorers)
+    _WORKER.update({'limits': threadpool_limits(limits=threads), 'folds': folds,
+                    'scorers': scorers, 'deadline': deadline})
+
+
+def _worker_score(model_id: str, name: str, spec: tuple):
+    deadline = _WORKER['deadline']
+    if deadline is not None and time.time() > deadline:
+        return model_id, None, 'budget'
+    try:
+        row, timing = _score_on_folds(model_id, name, spec, _WORKER['folds'], _WORKER['scorers'])
+    except Exception as e:
+        return model_id, None, str(e)
+    return model_id, row, timing
+
+
+def fold_cached_compare(problem_type: str, data: pd.DataFrame, target_column: str,
+                        session_id: int = 123, workers: int = 1, threads_per_worker: int = None,
+                        budget_seconds: float = None, include: list = None, workdir: str = None):
+    """
+    Padanan `compare_models()` dengan pra-pemrosesan yang dihitung sekali per fold.
+
+    Args:
+        problem_type (str): 'classification' atau 'regression'.
+        data (pd.DataFrame): Data lengkap.
+        target_column (str): Nama kolom target.
+        session_id (int): Seed PyCaret; fold identik dengan jalur `compare_models()`.
+        workers (int): Jumlah proses worker. 1 berarti dijalankan di proses ini.
+        threads_per_worker (int): Batas thread BLAS/OpenMP per worker.
+        budget_seconds (float): Batas waktu; kandidat yang belum mulai dilewati.
+        include (list): Daftar ID model. None berarti semua model turbo.
+        workdir (str): Folder matriks fold. None berarti folder sementara yang
+            dihapus setelah selesai.
+
+    Returns:
+        tuple: (model terbaik yang sudah dilatih, tabel perbandingan).
+    """
+    api = pycaret_module(problem_type)
+    sort_metric = SORT_METRIC[problem_type]
+    deadline = time.time() + budget_seconds if budget_seconds else None
+
+    with stage('setup', rows=len(data)):
+        api.setup(data=data, target=target_column, verbose=False, session_id=session_id)
+    candidates = candidate_models(api, include)
+    internal = api.models(internal=True)
+    scorers = metric_scorers(api)
+
+    cleanup = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='fold_cache_')
+    os.makedirs(workdir, exist_ok=True)
+    rows = {}
+    try:
+        with stage('precompute_folds', rows=len(data)):
+            folds = precompute_folds(api, workdir)
+        size_mb = sum(os.path.getsize(path) for fold in folds for path in fold.values()) / 1024 ** 2
+        print(f"🧊 Pra-pemrosesan dihitung sekali untuk {len(folds)} fold ({size_mb:.1f} MB, memory-mapped).")
+
+        specs = {model_id: (internal.loc[model_id, 'Class'],
+                            quiet_args(internal.loc[model_id, 'Class'], internal.loc[model_id, 'Args']))
+                 for model_id in candidates.index}
+
+        def collect(model_id, row, detail):
+            if row is not None:
+                rows[model_id] = row
+                record_event(model_id, category='estimator', rows=len(data), **detail)
+                print(f"   ✔ {row['Model']}: {sort_metric} = {row[sort_metric]:.4f}")
+            elif detail == 'budget':
+                print(f"   ⏱️ {candidates[model_id]} dilewati (anggaran waktu habis)")
+            else:
+                print(f"   ⚠️ {candidates[model_id]} gagal: {detail}")
+
+        if workers and workers > 1:
+            import cloudpickle  # dependensi PyCaret
+
+            cpu_count = os.cpu_count() or 1
+            threads = threads_per_worker or max(cpu_count // workers, 1)
+            context = multiprocessing.get_context('spawn')
+            with limit_native_threads(threads), ProcessPoolExecutor(
+                    max_workers=workers, mp_context=context, initializer=_init_worker,
+                    initargs=(folds, cloudpickle.dumps(scorers), threads, deadline)) as pool:
+                futures = [pool.submit(_worker_score, model_id, name, specs[model_id])
+                           for model_id, name in candidates.items()]
+                for future in as_completed(futures):
+                    collect(*future.result())
+        else:
+            _init_worker(folds, scorers, threads_per_worker or os.cpu_count() or 1, deadline)
+            # Di proses induk batas thread BLAS/OpenMP harus dilepas lagi setelah selesai
+            with _WORKER.pop('limits'):
+                for model_id, name in candidates.items():
+                    collect(*_worker_score(model_id, name, specs[model_id]))
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if not rows:
+        raise RuntimeError("Tidak ada model yang selesai dinilai.")
+
+    comparison_table = build_comparison_table({m: rows[m] for m in candidates.index if m in rows}, sort_metric)
+    with stage(f'{comparison_table.index[0]} (latih ulang)', rows=len(data), category='estimator'):
+        best_model = api.create_model(comparison_table.index[0], cross_validation=False, verbose=False)
+    return best_model, comparison_table
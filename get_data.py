@@ -1,6 +1,8 @@
 from pycaret.datasets import get_data
 import pandas as pd
 
+from data_loader import CompactSchema, write_snapshot
+
 # Memuat dataset 'diamond' dari library PyCaret
 diamond_dataset = get_data('diamond')
 
@@ -8,4 +10,15 @@ diamond_dataset = get_data('diamond')
 # index=False agar nomor baris tidak ikut disimpan
 diamond_dataset.to_csv('data.csv', index=False)
 
-print("✅ File 'data.csv' berisi data diamond berhasil dibuat!")
\ No newline at end of file
+print("✅ File 'data.csv' berisi data diamond berhasil dibuat!")
+
+# Menyimpan snapshot bertipe (kolom teks -> category, float32, integer kecil)
+# agar run berikutnya bisa memakai --data_input data.parquet tanpa parsing teks
+schema = CompactSchema(diamond_dataset)
+compact_dataset = schema.finalize(schema.apply(diamond_dataset))
+try:
+    write_snapshot(compact_dataset, 'data.parquet')
+    write_snapshot(compact_dataset, 'data.arrow')
+    print("✅ Snapshot 'data.parquet' dan 'data.arrow' berhasil dibuat!")
+except ImportError as e:
+    print(f"⚠️ Snapshot tidak dibuat: {e}")
@@ -0,0 +1,303 @@
+# ==============================================================================
+# PELATIHAN ULANG INKREMENTAL UNTUK DATA YANG HANYA BERTAMBAH (APPEND-ONLY)
+# ==============================================================================
+#
+# TUJUAN:
+# Data harian hanya ditambahkan di akhir file, tetapi `train_model` melatih
+# ulang semua kandidat dari nol. Modul ini menyimpan "snapshot" dari run
+# sebelumnya lalu, jika data baru hanya berisi baris tambahan:
+# - Hanya top-N model dari tabel perbandingan sebelumnya yang dinilai ulang.
+# - Model yang mendukungnya dilatih dengan warm start: boosting (LightGBM,
+#   CatBoost) melanjutkan dari model sebelumnya lewat `init_model`, model
+#   linear berbasis `partial_fit` (SGD/Passive Aggressive) memulai dari
+#   koefisien sebelumnya lewat `coef_init`/`intercept_init`.
+#   Argumen ini tidak bisa dititipkan lewat `fit_kwargs` PyCaret (tidak
+#   diteruskan ke estimator), sehingga estimator dibungkus `WarmStartEstimator`.
+#   Boosting hanya menambah pohon sebanding porsi baris baru, dan dilatih ulang
+#   dari awal jika total pohon melewati `WARM_START_MAX_FACTOR` x jumlah bawaan,
+#   sehingga ukuran model & waktu fit tidak tumbuh tanpa batas antar run.
+# - State disimpan per dataset (nama sumber + skema kolom) sebagai snapshot
+#   berversi; `state.json` yang menunjuk snapshot aktif diganti secara atomik,
+#   sehingga job paralel yang berbagi `state_dir` tidak saling merusak.
+# - Pergeseran metrik (lama vs baru) dicatat untuk laporan.
+#
+# CATATAN: skor cross-validation model warm start cenderung sedikit optimistis
+# karena model awalnya sudah melihat baris lama yang kini bisa jatuh di fold
+# validasi. Gunakan pelatihan penuh berkala untuk angka yang benar-benar bersih.
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+import joblib
+import pandas as pd
+from sklearn.base import BaseEstimator, clone
+from sklearn.utils.metaestimators import available_if
+
+from model_search import SORT_METRIC, pycaret_module, build_comparison_table
+from instrumentation import stage
+
+STATE_FILE = 'state.json'
+COMPARISON_FILE = 'comparison.pkl'
+MODELS_DIR = 'models'
+SNAPSHOT_PREFIX = 'snapshot-'
+
+# Batas pertumbuhan model boosting yang dilanjutkan (warm start)
+MIN_WARM_START_TREES = 10
+WARM_START_MAX_FACTOR = 2
+
+
+def state_path(state_dir: str, problem_type: str, target_column: str,
+               data: pd.DataFrame, dataset_name: str = None) -> str:
+    """
+    Folder state untuk satu dataset: jenis masalah, kolom target, nama sumber
+    data (misal path file), dan skema kolom. Dataset berbeda dengan target yang
+    sama tidak berbagi state.
+    """
+    safe_target = ''.join(ch if ch.isalnum() else '_' for ch in target_column)
+    identity = json.dumps({'dataset': dataset_name, 'schema': _schema(data)}, sort_keys=True)
+    dataset_id = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(state_dir, f"{problem_type}-{safe_target}-{dataset_id}")
+
+
+def _rows_digest(data: pd.DataFrame) -> str:
+    row_hashes = pd.util.hash_pandas_object(data, index=False).values
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def _schema(data: pd.DataFrame) -> list:
+    return [[str(col), str(dtype)] for col, dtype in data.dtypes.items()]
+
+
+def _boosting_rounds(estimator) -> tuple:
+    """(nama parameter jumlah pohon, nilai bawaan) untuk LightGBM/CatBoost."""
+    if type(estimator).__name__.startswith('CatBoost'):
+        params = estimator.get_params()
+        return 'iterations', params.get('iterations') or params.get('n_estimators') or 1000
+    return 'n_estimators', estimator.get_params()['n_estimators']
+
+
+def _warm_start_kwargs(model, model_id: str, workdir: str, estimator, n_new: int, n_total: int) -> tuple:
+    """
+    Argumen `fit()` & parameter estimator untuk melanjutkan dari model sebelumnya.
+
+    Model boosting diberikan sebagai path file (bukan objek) agar aman saat
+    estimator di-`clone` untuk setiap fold. Jumlah pohon tambahan sebanding
+    porsi baris baru; jika total pohon akan melewati batas, warm start tidak
+    dipakai (model dilatih dari awal dengan ukuran bawaan).
+
+    Returns:
+        tuple: (fit_kwargs, params). Keduanya kosong jika warm start tidak dipakai.
+    """
+    name = type(model).__name__
+    if name.startswith(('LGBM', 'CatBoost')):
+        param, default_rounds = _boosting_rounds(estimator)
+        current = model.booster_.current_iteration() if name.startswith('LGBM') else model.tree_count_
+        increment = max(MIN_WARM_START_TREES, -(-default_rounds * n_new // n_total))
+        if current + increment > WARM_START_MAX_FACTOR * default_rounds:
+            print(f"   ℹ️ {model_id}: {current} pohon sudah mencapai batas warm start, dilatih dari awal.")
+            return {}, {}
+        extension = '.init.txt' if name.startswith('LGBM') else '.init.cbm'
+        init_path = os.path.join(workdir, f"{model_id}{extension}")
+        (model.booster_ if name.startswith('LGBM') else model).save_model(init_path)
+        return {'init_model': init_path}, {param: increment}
+    if hasattr(model, 'partial_fit') and hasattr(model, 'coef_'):
+        return {'coef_init': model.coef_, 'intercept_init': model.intercept_}, {}
+    return {}, {}
+
+
+class WarmStartEstimator(BaseEstimator):
+    """Pembungkus yang meneruskan argumen warm start ke `fit()` estimator asli."""
+
+    def __init__(self, estimator=None, fit_kwargs=None):
+        self.estimator = estimator
+        self.fit_kwargs = fit_kwargs
+
+    @property
+    def _estimator_type(self):
+        return getattr(self.estimator, '_estimator_type', None)
+
+    def fit(self, X, y, **kwargs):
+        self.estimator_ = clone(self.estimator).fit(X, y, **(self.fit_kwargs or {}), **kwargs)
+        if hasattr(self.estimator_, 'classes_'):
+            self.classes_ = self.estimator_.classes_
+        return self
+
+    def predict(self, X):
+        return self.estimator_.predict(X)
+
+    @available_if(lambda self: hasattr(self.estimator, 'predict_proba'))
+    def predict_proba(self, X):
+        return self.estimator_.predict_proba(X)
+
+    @available_if(lambda self: hasattr(self.estimator, 'decision_function'))
+    def decision_function(self, X):
+        return self.estimator_.decision_function(X)
+
+
+def save_state(path: str, data: pd.DataFrame, comparison_table: pd.DataFrame, fitted_models: dict):
+    """
+    Menyimpan snapshot run ini sebagai acuan run inkremental berikutnya.
+
+    Model & tabel ditulis ke folder snapshot baru, lalu `state.json` (penunjuk
+    snapshot aktif) diganti secara atomik. Snapshot lama dihapus setelahnya.
+
+    Args:
+        path (str): Folder state (lihat `state_path`).
+        data (pd.DataFrame): Data yang baru saja dilatih.
+        comparison_table (pd.DataFrame): Tabel perbandingan run ini.
+        fitted_models (dict): ID model -> estimator terlatih (untuk warm start).
+    """
+    os.makedirs(path, exist_ok=True)
+    snapshot_dir = tempfile.mkdtemp(prefix=SNAPSHOT_PREFIX, dir=path)
+    models_dir = os.path.join(snapshot_dir, MODELS_DIR)
+    os.makedirs(models_dir)
+    for model_id, model in fitted_models.items():
+        joblib.dump(model, os.path.join(models_dir, f"{model_id}.pkl"))
+    comparison_table.to_pickle(os.path.join(snapshot_dir, COMPARISON_FILE))
+
+    state = {
+        'n_rows': len(data),
+        'digest': _rows_digest(data),
+        'schema': _schema(data),
+        'snapshot': os.path.basename(snapshot_dir),
+        'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=path, prefix=STATE_FILE + '.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, STATE_FILE))
+
+    for name in os.listdir(path):
+        if name.startswith(SNAPSHOT_PREFIX) and name != state['snapshot']:
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+
+def detect_append(path: str, data: pd.DataFrame):
+    """
+    Memeriksa apakah `data` = data run sebelumnya + baris baru di akhir.
+
+    Returns:
+        tuple: (status, state) dengan status salah satu dari 'no-state',
+        'unchanged', 'schema-changed', 'rewritten', atau 'appended'.
+    """
+    state_file = os.path.join(path, STATE_FILE)
+    if not os.path.exists(state_file):
+        return 'no-state', None
+    with open(state_file, encoding='utf-8') as f:
+        state = json.load(f)
+    if not os.path.isdir(os.path.join(path, state.get('snapshot', ''))):
+        # Snapshot hilang (format lama, atau diganti job lain di tengah jalan)
+        return 'no-state', None
+
+    if _schema(data) != state['schema']:
+        return 'schema-changed', state
+    n_prev = state['n_rows']
+    if len(data) < n_prev or _rows_digest(data.iloc[:n_prev]) != state['digest']:
+        return 'rewritten', state
+    if len(data) == n_prev:
+        return 'unchanged', state
+    return 'appended', state
+
+
+def incremental_retrain(problem_type: str, data: pd.DataFrame, target_column: str,
+                        path: str, top_n: int = 3, session_id: int = 123):
+    """
+    Menilai ulang top-N model run sebelumnya pada data yang sudah bertambah.
+
+    Args:
+        problem_type (str): 'classification' atau 'regression'.
+        data (pd.DataFrame): Data lengkap (baris lama + baris baru).
+        target_column (str): Nama kolom target.
+        path (str): Folder state (lihat `state_path`).
+        top_n (int): Jumlah model teratas yang dinilai ulang.
+        session_id (int): Seed PyCaret.
+
+    Returns:
+        tuple | None: (model terbaik, tabel perbandingan, model terlatih per ID), atau
+        None jika perubahan data bukan append-only sehingga perlu pelatihan penuh.
+        Pergeseran metrik disimpan di `tabel.attrs['metric_drift']`.
+    """
+    status, state = detect_append(path, data)
+    if status != 'appended':
+        reasons = {
+            'no-state': "belum ada snapshot run sebelumnya",
+            'unchanged': "tidak ada baris baru",
+            'schema-changed': "skema kolom berubah",
+            'rewritten': "baris lama berubah (bukan append-only)",
+        }
+        print(f"ℹ️ Mode inkremental tidak dipakai: {reasons[status]}. Pelatihan penuh dijalankan.")
+        return None
+
+    n_new = len(data) - state['n_rows']
+    print(f"➕ Terdeteksi {n_new} baris baru (sebelumnya {state['n_rows']} baris).")
+    snapshot_dir = os.path.join(path, state['snapshot'])
+    previous = pd.read_pickle(os.path.join(snapshot_dir, COMPARISON_FILE))
+    model_ids = list(previous.index[:top_n])
+
+    api = pycaret_module(problem_type)
+    sort_metric = SORT_METRIC[problem_type]
+    with stage('setup', rows=len(data)):
+        api.setup(data=data, target=target_column, verbose=False, session_id=session_id)
+
+    internal = api.models(internal=True)
+    # File init_model sementara (tidak ditulis ke folder state yang bisa dibaca job lain)
+    workdir = tempfile.mkdtemp(prefix='warm_start_')
+    rows, fitted = {}, {}
+    for model_id in model_ids:
+        model_file = os.path.join(snapshot_dir, MODELS_DIR, f"{model_id}.pkl")
+        fit_kwargs, params = {}, {}
+        estimator = internal.loc[model_id, 'Class'](**internal.loc[model_id, 'Args'])
+        if os.path.exists(model_file):
+            fit_kwargs, params = _warm_start_kwargs(joblib.load(model_file), model_id, workdir,
+                                                    estimator, n_new, len(data))
+        start = time.perf_counter()
+        with stage(model_id, rows=len(data), category='estimator'):
+            try:
+                if fit_kwargs:
+                    # Estimator baru dengan parameter bawaan PyCaret, dibungkus agar fit() menerima warm start
+                    wrapped = WarmStartEstimator(estimator.set_params(**params), fit_kwargs)
+                    model = api.create_model(wrapped, verbose=False).estimator_
+                else:
+                    model = api.create_model(model_id, verbose=False)
+            except Exception as e:
+                if not fit_kwargs:
+                    print(f"⚠️ Model '{model_id}' gagal dilatih ulang: {e}")
+                    continue
+                # Warm start bisa gagal jika dimensi fitur berubah (misal kategori baru)
+                print(f"⚠️ Warm start '{model_id}' gagal ({e}), dilatih dari awal.")
+                fit_kwargs = {}
+                model = api.create_model(model_id, verbose=False)
+        elapsed = time.perf_counter() - start
+        scores = api.pull()
+        fitted[model_id] = model
+        rows[model_id] = {'Model': previous.loc[model_id, 'Model'], **scores.loc['Mean'].to_dict(),
+                          'TT (Sec)': elapsed / max(len(scores) - 2, 1)}
+        mode = 'warm start' if fit_kwargs else 'dari awal'
+        print(f"   ✔ {rows[model_id]['Model']} ({mode}): {sort_metric} = {rows[model_id][sort_metric]:.4f}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    if not rows:
+        return None
+
+    comparison_table = build_comparison_table(rows, sort_metric)
+    metrics = [col for col in comparison_table.columns
+               if col not in ('Model', 'TT (Sec)') and col in previous.columns]
+    drift = []
+    for model_id in comparison_table.index:
+        entry = {'Model': comparison_table.loc[model_id, 'Model'],
+                 f'{sort_metric} Lama': previous.loc[model_id, sort_metric],
+                 f'{sort_metric} Baru': comparison_table.loc[model_id, sort_metric]}
+        for metric in metrics:
+            entry[f'Δ {metric}'] = round(comparison_table.loc[model_id, metric] - previous.loc[model_id, metric], 4)
+        drift.append(entry)
+    comparison_table.attrs['metric_drift'] = drift
+    comparison_table.attrs['incremental'] = {'previous_rows': state['n_rows'], 'new_rows': n_new,
+                                             'previous_run': state['saved_at']}
+    best_id = comparison_table.index[0]
+    return fitted[best_id], comparison_table, fitted
@@ -0,0 +1,171 @@
+# ==============================================================================
+# INSTRUMENTASI WAKTU & MEMORI PER TAHAP PIPELINE
+# ==============================================================================
+#
+# TUJUAN:
+# Satu-satunya sinyal performa sebelumnya adalah `logs.log` dari PyCaret yang
+# harus di-grep. Modul ini mencatat setiap tahap (pemuatan data, `setup_*`,
+# setiap estimator di dalam perbandingan model, `pull_*`, pembuatan laporan)
+# dengan metrik:
+# - waktu wall-clock dan waktu CPU,
+# - puncak memori resident (RSS) proses,
+# - throughput baris per detik (jika jumlah baris diketahui).
+#
+# OUTPUT:
+# - File JSON berformat Chrome Trace (buka di chrome://tracing atau Perfetto).
+# - Bagian "Performa" dalam format Markdown untuk ditambahkan ke laporan.
+#
+# PEMAKAIAN:
+#   tracer = start_tracing()
+#   with stage('setup_reg', rows=len(df)):
+#       ...
+# Jika tracing belum dimulai, `stage()` tidak melakukan apa-apa.
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import threading
+import contextlib
+
+import pandas as pd
+
+from data_loader import peak_rss_mb
+
+_ACTIVE = None
+# Jalur Chrome Trace sintetis untuk estimator hasil estimasi (bukan thread nyata)
+ESTIMATE_TID_BASE = 1_000_000
+
+
+class Tracer:
+    """Pengumpul event berdurasi (span) untuk satu run pipeline."""
+
+    def __init__(self):
+        self.events = []
+        self.epoch = time.time()
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def add_event(self, name: str, start: float, wall: float, cpu: float = None,
+                  rows: int = None, category: str = 'stage', tid: int = None, **args):
+        """
+        Menambahkan event yang sudah diukur (misal dari proses worker).
+
+        Args:
+            name (str): Nama tahap.
+            start (float): Waktu mulai dalam detik epoch (`time.time()`).
+            wall (float): Durasi wall-clock (detik).
+            cpu (float): Waktu CPU (detik), jika diketahui.
+            rows (int): Jumlah baris yang diproses, untuk menghitung baris/detik.
+            category (str): Kategori event di Chrome Trace.
+            tid (int): ID thread/proses worker. Default: proses ini.
+        """
+        event = {
+            'name': name,
+            'category': category,
+            'start': start,
+            'wall': wall,
+            'cpu': cpu,
+            'rows': rows,
+            'rows_per_sec': rows / wall if rows and wall > 0 else None,
+            'peak_rss_mb': args.pop('peak_rss_mb', None),
+            'tid': tid if tid is not None else threading.get_ident(),
+            'args': args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows: int = None, category: str = 'stage', **args):
+        """
+        Mengukur satu tahap. Objek yang di-yield berupa dict berisi `start` (epoch)
+        dan `rows`; isi `info['rows']` di dalam blok jika jumlah baris baru
+        diketahui setelah tahap berjalan.
+        """
+        start, wall0, cpu0 = time.time(), time.perf_counter(), time.process_time()
+        info = {'rows': rows, 'start': start}
+        try:
+            yield info
+        finally:
+            self.add_event(name, start, time.perf_counter() - wall0, time.process_time() - cpu0,
+                           rows=info['rows'], category=category, peak_rss_mb=peak_rss_mb(), **args)
+
+    def to_chrome_trace(self) -> dict:
+        """Mengubah event ke format Chrome Trace Event (fase 'X' = complete event)."""
+        trace_events = []
+        for event in self.events:
+            args = {key: value for key, value in {
+                'cpu_sec': event['cpu'],
+                'rows': event['rows'],
+                'rows_per_sec': event['rows_per_sec'],
+                'peak_rss_mb': event['peak_rss_mb'],
+                **event['args'],
+            }.items() if value is not None}
+            trace_events.append({
+                'name': event['name'],
+                'cat': event['category'],
+                'ph': 'X',
+                'ts': round((event['start'] - self.epoch) * 1e6),
+                'dur': round(event['wall'] * 1e6),
+                'pid': self.pid,
+                'tid': event['tid'],
+                'args': args,
+            })
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+        os.replace(tmp_path, path)
+
+    def summary(self) -> pd.DataFrame:
+        """Ringkasan per event, diurutkan sesuai waktu mulai."""
+        rows = []
+        for event in sorted(self.events, key=lambda e: e['start']):
+            rows.append({
+                'Tahap': event['name'],
+                'Wall (s)': round(event['wall'], 3),
+                'CPU (s)': None if event['cpu'] is None else round(event['cpu'], 3),
+                'Puncak RSS (MB)': None if event['peak_rss_mb'] is None else round(event['peak_rss_mb'], 1),
+                'Baris/detik': None if event['rows_per_sec'] is None else round(event['rows_per_sec']),
+            })
+        return pd.DataFrame(rows)
+
+
+def start_tracing() -> Tracer:
+    """Memulai tracing global untuk proses ini dan mengembalikan tracer-nya."""
+    global _ACTIVE
+    _ACTIVE = Tracer()
+    return _ACTIVE
+
+
+def stage(name: str, rows: int = None, category: str = 'stage', **args):
+    """Context manager pengukur tahap; tanpa efek jika tracing tidak aktif."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext({'rows': rows, 'start': time.time()})
+    return _ACTIVE.stage(name, rows=rows, category=category, **args)
+
+
+def record_event(name: str, start: float, wall: float, **kwargs):
+    """Mencatat event yang diukur di tempat lain (misal di proses worker)."""
+    if _ACTIVE is not None:
+        _ACTIVE.add_event(name, start, wall, **kwargs)
+
+
+def record_comparison_estimates(comparison_table: pd.DataFrame, start: float, n_folds: int):
+    """
+    Menurunkan event per estimator dari tabel `compare_models()`.
+
+    `TT (Sec)` adalah rata-rata waktu latih per fold, sehingga durasi estimator
+    diperkirakan sebagai `TT (Sec) x jumlah fold`. Waktu mulai sebenarnya tidak
+    diketahui, jadi setiap estimator diberi jalur (tid) sintetis sendiri yang
+    semuanya berawal di `start`, bukan disusun seolah-olah berurutan.
+    """
+    if _ACTIVE is None or 'TT (Sec)' not in comparison_table:
+        return
+    for lane, (model_id, row) in enumerate(comparison_table.iterrows()):
+        _ACTIVE.add_event(f"{model_id} (estimasi)", start, float(row['TT (Sec)']) * n_folds,
+                          category='estimator', tid=ESTIMATE_TID_BASE + lane,
+                          model=row.get('Model', model_id), source='TT (Sec) x fold')
@@ -0,0 +1,295 @@
+# ==============================================================================
+# BACKEND LAPORAN AI ASINKRON (ASYNCIO) UNTUK BANYAK TABEL PERBANDINGAN
+# ==============================================================================
+#
+# TUJUAN:
+# `describe_training_job` sebelumnya melakukan satu panggilan API blocking per
+# run, tanpa timeout, retry, maupun cache, sehingga laporan untuk banyak
+# dataset dibatasi oleh latensi API yang dijalankan berurutan. Modul ini:
+# - Menjalankan banyak permintaan secara bersamaan dengan asyncio, dibatasi
+#   semaphore (`max_concurrency`) agar tidak terkena rate limit.
+# - Mengulang permintaan yang gagal sementara (429, 5xx, 529 overloaded, timeout,
+#   koneksi putus) dengan exponential backoff + jitter, menghormati `retry-after`.
+# - Menyimpan respons berdasarkan hash prompt: tabel yang identik tidak pernah
+#   memicu panggilan kedua, baik antar run (cache di disk) maupun di dalam satu
+#   batch (permintaan yang sedang berjalan dipakai bersama).
+# - Menyerialisasi tabel sebagai CSV ringkas (angka dibulatkan) alih-alih
+#   `json.dumps(..., indent=4)` per baris, sehingga token prompt jauh lebih sedikit.
+#
+# UJI OFFLINE:
+# Jalankan `stub_llm_server.py`, lalu arahkan `base_url` ke server tersebut:
+#   python stub_llm_server.py --port 8765
+#   python llm_reporting.py --tables .automl_cache/*/comparison.pkl --base_url http://127.0.0.1:8765
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+
+import pandas as pd
+
+MODEL = "claude-3-5-sonnet-20240620"
+MAX_TOKENS = 2048
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Skema output ("cetak biru") agar jawaban AI terstruktur dan konsisten dalam format JSON.
+TOOLS = [{
+    "name": "pycaret_training_explainer",
+    "description": "Struktur untuk penjelasan hasil training PyCaret...",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "comparison_breakdown": {
+                "type": "object",
+                "properties": {"comments": {"type": "string", "description": "Wawasan dari hasil perbandingan model."}}
+            },
+            "pipeline_breakdown": {
+                "type": "object",
+                "description": "Detail setiap langkah dalam pipeline PyCaret.",
+                "properties": {
+                    "steps": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string", "description": "Nama langkah (misal, 'imputer', 'scaler')."},
+                                "type": {"type": "string", "description": "Tipe transformer atau model yang digunakan."},
+                                "description": {"type": "string", "description": "Penjelasan tujuan dan fungsi langkah tersebut."}
+                            },
+                            "required": ["name", "type", "description"]
+                        }
+                    }
+                }
+            },
+            "model_suggestions": {
+                "type": "object",
+                "description": "Saran untuk meningkatkan pipeline pemodelan dan akurasi.",
+                "properties": {
+                    "improvements": {
+                        "type": "array",
+                        "items": {"type": "string", "description": "Satu saran untuk perbaikan model."}
+                    }
+                }
+            }
+        },
+        "required": ["comparison_breakdown", "pipeline_breakdown", "model_suggestions"]
+    }
+}]
+
+
+def serialize_table(comparison_table: pd.DataFrame, precision: int = 4) -> str:
+    """
+    Serialisasi tabel perbandingan yang hemat token: CSV dengan angka dibulatkan.
+
+    Nama kolom hanya ditulis sekali (di header), bukan diulang di setiap baris
+    seperti pada JSON `orient='records'`, dan tidak ada indentasi.
+    """
+    return comparison_table.round(precision).to_csv(index_label='ID', lineterminator='\n')
+
+
+def build_prompt(comparison_table: pd.DataFrame) -> str:
+    """Membuat prompt (peran, tugas, dan data) untuk satu tabel perbandingan."""
+    return ("Anda adalah seorang Data Scientist ahli...\n"
+            "Tugas Anda adalah menganalisis hasil ini...\n"
+            "Berikut adalah hasil training PyCaret dalam format CSV "
+            "(satu baris per model, diurutkan dari yang terbaik):\n"
+            f"{serialize_table(comparison_table)}")
+
+
+def prompt_key(prompt: str, model: str = MODEL, max_tokens: int = MAX_TOKENS) -> str:
+    """Kunci cache respons: hash dari model, skema tool, dan isi prompt."""
+    payload = json.dumps({'model': model, 'max_tokens': max_tokens, 'tools': TOOLS, 'prompt': prompt},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Cache respons AI di disk: satu file JSON per hash prompt."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key: str):
+        """Mengembalikan hasil analisis (dict) untuk `key`, atau None jika belum ada."""
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)['analysis']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store(self, key: str, analysis: dict):
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'analysis': analysis, 'saved_at': time.strftime('%Y-%m-%d %H:%M:%S')}, f)
+        os.replace(tmp_path, self._path(key))
+
+
+class AsyncReportBackend:
+    """
+    Klien asinkron untuk menganalisis banyak tabel perbandingan sekaligus.
+
+    Args:
+        max_concurrency (int): Jumlah permintaan API yang boleh berjalan bersamaan.
+        max_retries (int): Jumlah pengulangan maksimum untuk kegagalan sementara.
+        backoff_base (float): Jeda awal (detik); berlipat dua setiap percobaan.
+        backoff_max (float): Batas atas jeda antar percobaan (detik).
+        timeout (float): Batas waktu satu permintaan (detik).
+        base_url (str): URL API alternatif, misal server stub untuk uji offline.
+        api_key (str): API key. None berarti dibaca dari `ANTHROPIC_API_KEY`.
+        cache_dir (str): Folder cache respons. None berarti tanpa cache disk.
+        model (str): Nama model Claude.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_retries: int = 4, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0, timeout: float = 60.0, base_url: str = None,
+                 api_key: str = None, cache_dir: str = '.llm_cache', model: str = MODEL):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.stats = {'api_calls': 0, 'retries': 0, 'cache_hits': 0, 'shared': 0}
+
+    def _client(self):
+        import anthropic  # impor tertunda: library ini lambat dimuat
+
+        # Retry bawaan SDK dimatikan agar backoff & statistik dikendalikan di sini
+        return anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url,
+                                        timeout=self.timeout, max_retries=0)
+
+    def _retry_delay(self, attempt: int, error) -> float:
+        """Jeda sebelum percobaan berikutnya: `retry-after` jika ada, selain itu backoff + jitter."""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), self.backoff_max)
+        except ValueError:
+            pass
+        delay = min(self.backoff_base * 2 ** attempt, self.backoff_max)
+        return delay * (0.5 + random.random() / 2)
+
+    @staticmethod
+    def _is_retryable(error) -> bool:
+        import anthropic
+
+        if isinstance(error, anthropic.APIConnectionError):  # termasuk APITimeoutError
+            return True
+        return isinstance(error, anthropic.APIStatusError) and error.status_code in RETRYABLE_STATUS
+
+    async def _call(self, client, semaphore, prompt: str) -> dict:
+        """Satu analisis lewat API, dengan retry untuk kegagalan sementara."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    self.stats['api_calls'] += 1
+                    response = await client.messages.create(
+                        model=self.model,
+                        max_tokens=MAX_TOKENS,
+                        tools=TOOLS,
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+            except Exception as e:
+                if attempt == self.max_retries or not self._is_retryable(e):
+                    raise
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._retry_delay(attempt, e))
+                continue
+
+            for content in response.content:
+                if content.type == 'tool_use':
+                    return content.input
+            raise ValueError("AI tidak menghasilkan output yang sesuai dengan format yang diharapkan.")
+
+    async def describe_many(self, comparison_tables: list) -> list:
+        """
+        Menganalisis banyak tabel perbandingan secara bersamaan.
+
+        Returns:
+            list: Satu dict per tabel (urutan sama dengan input) berisi `status`
+            ('sukses'/'gagal'), `analysis` (dict hasil tool AI atau None),
+            `cached` (bool, diambil dari cache disk), `deduplicated` (bool, memakai
+            hasil permintaan tabel identik di batch yang sama), dan `error` (pesan, jika gagal).
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        in_flight = {}
+        client = self._client()
+
+        async def describe_one(table):
+            key = prompt_key(build_prompt(table), self.model)
+            analysis = self.cache.load(key) if self.cache else None
+            if analysis is not None:
+                self.stats['cache_hits'] += 1
+                return {'status': 'sukses', 'analysis': analysis, 'cached': True,
+                        'deduplicated': False, 'error': None}
+
+            # Tabel identik di batch yang sama menunggu permintaan yang sudah berjalan
+            task = in_flight.get(key)
+            if task is None:
+                task = in_flight[key] = asyncio.ensure_future(self._call(client, semaphore, build_prompt(table)))
+                shared = False
+            else:
+                self.stats['shared'] += 1
+                shared = True
+            try:
+                analysis = await asyncio.shield(task)
+            except Exception as e:
+                return {'status': 'gagal', 'analysis': None, 'cached': False,
+                        'deduplicated': shared, 'error': f"{type(e).__name__}: {e}"}
+            if self.cache and not shared:
+                self.cache.store(key, analysis)
+            return {'status': 'sukses', 'analysis': analysis, 'cached': False,
+                    'deduplicated': shared, 'error': None}
+
+        try:
+            return await asyncio.gather(*(describe_one(table) for table in comparison_tables))
+        finally:
+            await client.close()
+
+    def describe_tables(self, comparison_tables: list) -> list:
+        """Padanan sinkron `describe_many` untuk dipanggil dari kode non-async."""
+        return asyncio.run(self.describe_many(comparison_tables))
+
+
+if __name__ == '__main__':
+    from report_engine import AI_LAYOUT, ReportEngine
+
+    parser = argparse.ArgumentParser(description="Laporan AI untuk banyak tabel perbandingan sekaligus")
+    parser.add_argument('--tables', type=str, nargs='+', required=True, help='File tabel perbandingan (.pkl), misal dari folder cache.')
+    parser.add_argument('--base_url', type=str, default=None, help='URL API alternatif (misal server stub untuk uji offline).')
+    parser.add_argument('--max_concurrency', type=int, default=4, help='Jumlah permintaan API bersamaan.')
+    parser.add_argument('--max_retries', type=int, default=4, help='Jumlah pengulangan untuk kegagalan sementara.')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Batas waktu per permintaan (detik).')
+    parser.add_argument('--cache_dir', type=str, default='.llm_cache', help='Folder cache respons AI.')
+    parser.add_argument('--no_cache', action='store_true', help='Nonaktifkan cache respons AI.')
+    args = parser.parse_args()
+
+    tables = [pd.read_pickle(path) for path in args.tables]
+    engine = ReportEngine()
+    backend = AsyncReportBackend(max_concurrency=args.max_concurrency, max_retries=args.max_retries,
+                                 timeout=args.timeout, base_url=args.base_url,
+                                 cache_dir=None if args.no_cache else args.cache_dir)
+    start = time.perf_counter()
+    results = backend.describe_tables(tables)
+    for path, result in zip(args.tables, results):
+        if result['status'] != 'sukses':
+            print(f"❌ {path}: {result['error']}")
+            continue
+        report_path = os.path.join(os.path.dirname(path) or '.', 'laporan_ai.md')
+        engine.render(AI_LAYOUT, {'analysis': result['analysis']}, report_path)
+        source = ' (cache)' if result['cached'] else ' (duplikat)' if result['deduplicated'] else ''
+        print(f"✅ {path} -> '{report_path}'{source}")
+    print(f"⏱️ {len(tables)} tabel dalam {time.perf_counter() - start:.2f} detik; statistik: {backend.stats}")
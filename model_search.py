@@ -0,0 +1,335 @@
+# ==============================================================================
+# STRATEGI PENCARIAN MODEL ALTERNATIF UNTUK TRAIN_MODEL
+# ==============================================================================
+#
+# TUJUAN:
+# `compare_models()` bawaan PyCaret melatih setiap estimator dengan 10-fold pada
+# seluruh baris data. Modul ini menyediakan strategi pencarian yang lebih hemat
+# waktu namun tetap menghasilkan tabel perbandingan dengan skema yang sama
+# (index = ID model, kolom 'Model', metrik-metrik, dan 'TT (Sec)'), sehingga
+# `generate_offline_report` tetap dapat dipakai tanpa perubahan.
+#
+# STRATEGI:
+# - Successive halving: semua kandidat dinilai pada sampel kecil dengan sedikit
+#   fold, separuh terlemah dibuang, lalu sisanya dinilai ulang dengan data dan
+#   fold yang lebih banyak hingga anggaran waktu habis.
+# - Paralel: setiap kandidat estimator dikirim utuh ke process pool. Setiap worker
+#   menjalankan `setup()` sekali dan jumlah thread BLAS/OpenMP-nya dibatasi agar
+#   total thread tidak melebihi jumlah core.
+#
+# ==============================================================================
+
+import os
+import math
+import time
+import importlib
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from instrumentation import stage, record_event
+
+# Variabel lingkungan yang mengatur jumlah thread library numerik native
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                   'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+# Metrik pengurutan bawaan `compare_models()` untuk setiap jenis masalah
+SORT_METRIC = {
+    'classification': 'Accuracy',
+    'regression': 'R2',
+}
+
+
+def pycaret_module(problem_type: str):
+    """Mengembalikan modul PyCaret (functional API) sesuai jenis masalah."""
+    if problem_type not in SORT_METRIC:
+        raise ValueError("Tipe masalah tidak valid. Pilih 'classification' atau 'regression'.")
+    return importlib.import_module(f'pycaret.{problem_type}')
+
+
+def candidate_models(api, include: list = None) -> pd.Series:
+    """
+    Daftar kandidat yang sama dengan yang dipakai `compare_models(turbo=True)`.
+
+    Returns:
+        pd.Series: Nama model dengan index ID model PyCaret (misal 'lr', 'rf').
+    """
+    table = api.models()
+    if include:
+        table = table.loc[[model_id for model_id in include if model_id in table.index]]
+    else:
+        table = table[table['Turbo']]
+    return table['Name']
+
+
+def _sample_rows(data: pd.DataFrame, n_rows: int, target_column: str,
+                 problem_type: str, seed: int) -> pd.DataFrame:
+    """Mengambil sampel baris; untuk klasifikasi proporsi kelas dipertahankan."""
+    if n_rows >= len(data):
+        return data
+    if problem_type == 'classification':
+        frac = n_rows / len(data)
+        return data.groupby(target_column, group_keys=False, observed=True).sample(
+            frac=frac, random_state=seed)
+    return data.sample(n=n_rows, random_state=seed)
+
+
+def _score_candidate(api, model_id: str, name: str):
+    """
+    Menilai satu kandidat dengan cross-validation tanpa melatih ulang pada seluruh
+    data latih (`refit=False`, sama seperti `compare_models()`), lalu mengambil baris 'Mean'.
+
+    Returns:
+        tuple: (baris tabel perbandingan, pengukuran waktu). Pengukuran dikembalikan
+        (bukan langsung dicatat) agar bisa dibawa pulang dari proses worker.
+    """
+    # `create_model()` publik selalu melatih ulang setelah CV, sehingga waktunya
+    # ikut terhitung di 'TT (Sec)'; jalur internal compare_models dipakai langsung
+    experiment = api.get_current_experiment()
+    start, wall0, cpu0 = time.time(), time.perf_counter(), time.process_time()
+    experiment._create_model(model_id, refit=False, verbose=False, system=False, error_score='raise')
+    timing = {'start': start, 'wall': time.perf_counter() - wall0,
+              'cpu': time.process_time() - cpu0, 'tid': os.getpid()}
+    scores = experiment.pull(pop=True)
+    row = scores.loc['Mean'].to_dict()
+    # Waktu CV per fold, definisi yang sama dengan 'TT (Sec)' compare_models
+    row['TT (Sec)'] = timing['wall'] / max(len(scores) - 2, 1)  # tanpa baris 'Mean' & 'Std'
+    return {'Model': name, **row}, timing
+
+
+def build_comparison_table(rows: dict, sort_metric: str) -> pd.DataFrame:
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    table.index.name = None
+    table = table.sort_values(sort_metric, ascending=False, kind='stable')
+    table['TT (Sec)'] = table['TT (Sec)'].round(3)
+    return table
+
+
+def successive_halving(problem_type: str, data: pd.DataFrame, target_column: str,
+                       session_id: int = 123, budget_seconds: float = None,
+                       include: list = None, min_rows: int = 500, min_folds: int = 3,
+                       max_folds: int = 10, eta: int = 2):
+    """
+    Pencarian model dengan successive halving dan anggaran waktu.
+
+    Args:
+        problem_type (str): 'classification' atau 'regression'.
+        data (pd.DataFrame): Data lengkap.
+        target_column (str): Nama kolom target.
+        session_id (int): Seed PyCaret dan pengambilan sampel.
+        budget_seconds (float): Batas waktu total (detik). None berarti tanpa batas.
+        include (list): Daftar ID model yang dicoba. None berarti semua model turbo.
+        min_rows (int): Jumlah baris pada rung pertama.
+        min_folds (int): Jumlah fold pada rung pertama.
+        max_folds (int): Jumlah fold pada rung terakhir (data penuh).
+        eta (int): Faktor pengurangan kandidat di setiap rung.
+
+    Returns:
+        tuple: (model terbaik yang sudah dilatih, tabel perbandingan). Catatan rung
+        tempat setiap model tereliminasi disimpan di `tabel.attrs['search_log']`.
+    """
+    api = pycaret_module(problem_type)
+    sort_metric = SORT_METRIC[problem_type]
+    deadline = time.perf_counter() + budget_seconds if budget_seconds else None
+
+    # `models()` hanya tersedia setelah `setup()`, jadi rung pertama disiapkan dulu
+    n_total = len(data)
+    first_sample = _sample_rows(data, min_rows, target_column, problem_type, session_id)
+    with stage('setup (rung 0)', rows=len(first_sample)):
+        api.setup(data=first_sample, target=target_column, verbose=False,
+                  session_id=session_id, fold=min_folds)
+    survivors = candidate_models(api, include)
+    names = survivors.to_dict()
+    survivors = list(survivors.index)
+
+    n_rungs = max(math.ceil(math.log(len(survivors), eta)), 1) if len(survivors) > 1 else 1
+    latest_scores = {}
+    search_log = {model_id: {'Model': names[model_id], 'Rung': None, 'Rows': None,
+                             'Folds': None, 'Eliminated': None} for model_id in survivors}
+    setup_is_full = n_total <= min_rows  # setup() terakhir memakai seluruh data?
+
+    for rung in range(n_rungs + 1):
+        # Ukuran data tumbuh eksponensial hingga rung terakhir memakai seluruh baris
+        n_rows = n_total if rung == n_rungs else max(min_rows, int(n_total / eta ** (n_rungs - rung)))
+        n_rows = min(n_rows, n_total)
+        n_folds = min_folds + round((max_folds - min_folds) * rung / n_rungs)
+        print(f"🪜 Rung {rung}: {len(survivors)} kandidat, {n_rows} baris, {n_folds} fold")
+
+        if rung > 0:
+            sample = _sample_rows(data, n_rows, target_column, problem_type, session_id + rung)
+            with stage(f'setup (rung {rung})', rows=len(sample)):
+                api.setup(data=sample, target=target_column, verbose=False,
+                          session_id=session_id, fold=n_folds)
+
+        rung_scores = {}
+        for model_id in survivors:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            try:
+                rung_scores[model_id], timing = _score_candidate(api, model_id, names[model_id])
+                record_event(f'{model_id} (rung {rung})', category='estimator', rows=n_rows, **timing)
+            except Exception as e:
+                print(f"⚠️ Model '{model_id}' gagal dilatih dan dibuang: {e}")
+                search_log[model_id].update({'Rung': rung, 'Eliminated': 'error'})
+            else:
+                search_log[model_id].update({'Rung': rung, 'Rows': n_rows, 'Folds': n_folds})
+
+        latest_scores.update(rung_scores)
+        budget_exhausted = len(rung_scores) < len([m for m in survivors if search_log[m]['Eliminated'] is None])
+        ranked = sorted(rung_scores, key=lambda m: rung_scores[m][sort_metric], reverse=True)
+        setup_is_full = n_rows == n_total
+
+        if budget_exhausted:
+            # Kandidat yang belum sempat dinilai di rung ini berhenti di rung sebelumnya
+            for model_id in survivors:
+                if model_id not in rung_scores and search_log[model_id]['Eliminated'] is None:
+                    search_log[model_id]['Eliminated'] = 'budget'
+            print("⏱️ Anggaran waktu habis, pencarian dihentikan.")
+            break
+
+        if rung == n_rungs:
+            break
+        keep = max(math.ceil(len(ranked) / eta), 1)
+        for model_id in ranked[keep:]:
+            search_log[model_id]['Eliminated'] = 'halving'
+        survivors = ranked[:keep]
+
+    if not latest_scores:
+        raise RuntimeError("Tidak ada model yang selesai dinilai dalam anggaran waktu.")
+
+    # Urutkan: model yang bertahan paling jauh di atas, lalu berdasarkan metrik
+    comparison_table = build_comparison_table(latest_scores, sort_metric)
+    reached = {m: search_log[m]['Rung'] for m in comparison_table.index}
+    order = sorted(comparison_table.index,
+                   key=lambda m: (-reached[m], -comparison_table.loc[m, sort_metric]))
+    comparison_table = comparison_table.loc[order]
+    winner = comparison_table.index[0]
+
+    if not setup_is_full:
+        # Pemenang dinilai pada sampel; latih ulang pada seluruh data agar siap dipakai
+        with stage('setup (data penuh)', rows=n_total):
+            api.setup(data=data, target=target_column, verbose=False, session_id=session_id)
+    # Kandidat dinilai tanpa refit, jadi hanya pemenang yang dilatih pada seluruh data latih
+    with stage(f'{winner} (latih ulang)', rows=n_total, category='estimator'):
+        best_model = api.create_model(winner, cross_validation=False, verbose=False)
+    comparison_table.attrs['search_log'] = sorted(
+        ({'ID': model_id, **entry} for model_id, entry in search_log.items()),
+        key=lambda entry: -1 if entry['Rung'] is None else -entry['Rung']
+    )
+    return best_model, comparison_table
+
+
+# ------------------------------------------------------------------------------
+# EKSEKUSI PARALEL KANDIDAT ESTIMATOR
+# ------------------------------------------------------------------------------
+# State per proses worker: modul PyCaret yang sudah di-setup dan pembatas thread.
+_WORKER = {}
+
+
+@contextlib.contextmanager
+def limit_native_threads(threads: int):
+    """Mengatur batas thread native selama pool hidup agar diwarisi proses worker."""
+    previous = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _init_worker(problem_type: str, data: pd.DataFrame, target_column: str,
+                 session_id: int, threads: int, deadline: float):
+    """Dijalankan sekali per worker: impor PyCaret dan `setup()` hanya dibayar sekali."""
+    from threadpoolctl import threadpool_limits
+
+    _WORKER['limits'] = threadpool_limits(limits=threads)
+    api = pycaret_module(problem_type)
+    api.setup(data=data, target=target_column, verbose=False,
+              session_id=session_id, n_jobs=threads)
+    _WORKER.update({'api': api, 'deadline': deadline})
+
+
+def _worker_score(model_id: str, name: str):
+    """
+    Menilai satu kandidat di dalam worker.
+
+    Returns:
+        tuple: (ID model, baris tabel atau None, pengukuran waktu atau pesan error).
+    """
+    deadline = _WORKER['deadline']
+    if deadline is not None and time.time() > deadline:
+        return model_id, None, 'budget'
+    try:
+        row, timing = _score_candidate(_WORKER['api'], model_id, name)
+    except Exception as e:
+        return model_id, None, str(e)
+    return model_id, row, timing
+
+
+def parallel_compare(problem_type: str, data: pd.DataFrame, target_column: str,
+                     session_id: int = 123, workers: int = None, threads_per_worker: int = None,
+                     budget_seconds: float = None, include: list = None):
+    """
+    Padanan `compare_models()` yang menjalankan setiap kandidat di process pool.
+
+    Args:
+        problem_type (str): 'classification' atau 'regression'.
+        data (pd.DataFrame): Data lengkap.
+        target_column (str): Nama kolom target.
+        session_id (int): Seed PyCaret; sama dengan jalur sekuensial sehingga fold identik.
+        workers (int): Jumlah proses worker. None berarti jumlah core.
+        threads_per_worker (int): Batas thread BLAS/OpenMP per worker. None berarti
+            core dibagi rata ke semua worker.
+        budget_seconds (float): Batas waktu; kandidat yang belum mulai saat batas
+            terlewati akan dilewati.
+        include (list): Daftar ID model. None berarti semua model turbo.
+
+    Returns:
+        tuple: (model terbaik yang sudah dilatih, tabel perbandingan).
+    """
+    api = pycaret_module(problem_type)
+    sort_metric = SORT_METRIC[problem_type]
+    cpu_count = os.cpu_count() or 1
+    workers = workers or cpu_count
+    threads = threads_per_worker or max(cpu_count // workers, 1)
+    # Batas waktu absolut (epoch) karena perf_counter tidak sebanding antar proses
+    deadline = time.time() + budget_seconds if budget_seconds else None
+
+    # Setup di proses utama: dipakai untuk daftar kandidat dan melatih ulang pemenang
+    with stage('setup', rows=len(data)):
+        api.setup(data=data, target=target_column, verbose=False, session_id=session_id)
+    candidates = candidate_models(api, include)
+    print(f"⚙️ Menjalankan {len(candidates)} kandidat pada {workers} worker "
+          f"({threads} thread/worker)...")
+
+    rows = {}
+    context = multiprocessing.get_context('spawn')
+    with limit_native_threads(threads), ProcessPoolExecutor(
+            max_workers=workers, mp_context=context, initializer=_init_worker,
+            initargs=(problem_type, data, target_column, session_id, threads, deadline)) as pool:
+        futures = [pool.submit(_worker_score, model_id, name) for model_id, name in candidates.items()]
+        for future in as_completed(futures):
+            model_id, row, detail = future.result()
+            if row is not None:
+                rows[model_id] = row
+                record_event(model_id, category='estimator', rows=len(data), **detail)
+                print(f"   ✔ {row['Model']}: {sort_metric} = {row[sort_metric]:.4f}")
+            elif detail == 'budget':
+                print(f"   ⏱️ {candidates[model_id]} dilewati (anggaran waktu habis)")
+            else:
+                print(f"   ⚠️ {candidates[model_id]} gagal: {detail}")
+
+    if not rows:
+        raise RuntimeError("Tidak ada model yang selesai dinilai.")
+
+    # Susun dalam urutan kandidat asli sebelum diurutkan, sama seperti compare_models
+    comparison_table = build_comparison_table({m: rows[m] for m in candidates.index if m in rows}, sort_metric)
+    with stage(f'{comparison_table.index[0]} (latih ulang)', rows=len(data), category='estimator'):
+        best_model = api.create_model(comparison_table.index[0], cross_validation=False, verbose=False)
+    return best_model, comparison_table
@@ -0,0 +1,537 @@
+# ==============================================================================
+# PELATIHAN OUT-OF-CORE UNTUK DATA YANG LEBIH BESAR DARI RAM
+# ==============================================================================
+#
+# TUJUAN:
+# `train_model` membutuhkan seluruh data sebagai satu DataFrame di memori
+# sebelum `setup()` berjalan. Untuk tabel yang tidak muat di RAM, modul ini
+# melatih model langsung dari file, chunk demi chunk:
+# 1. PASS SKEMA: satu kali baca untuk menghitung jumlah baris, rata-rata &
+#    simpangan baku kolom numerik, kategori terbanyak per kolom teks, dan
+#    daftar kelas target. Hasilnya menjadi `ChunkEncoder` (standarisasi +
+#    one-hot) yang dipakai sama persis untuk semua chunk.
+# 2. PASS LATIH (sebanyak `epochs`): setiap chunk di-encode lalu diumpankan ke
+#    semua learner inkremental sekaligus lewat `partial_fit` (SGD, Passive
+#    Aggressive, Naive Bayes, MLP) dan ke LightGBM yang menambah pohon per
+#    chunk lewat `init_model` (boosting histogram bertahap).
+# 3. PASS EVALUASI: baris holdout dinilai dengan metrik streaming (confusion
+#    matrix, histogram skor untuk AUC, jumlahan galat untuk regresi), sehingga
+#    prediksi tidak pernah dikumpulkan seluruhnya.
+# Baris holdout dipilih acak dengan seed tetap (`session_id`), sama di setiap
+# pass. Ukuran chunk diturunkan dari `memory_limit_mb` sehingga memori kerja
+# (chunk mentah + matriks hasil encode) tetap di bawah batas tersebut.
+# Tabel hasil memakai skema yang sama dengan `compare_models()`, sehingga
+# `generate_offline_report` bisa dipakai tanpa perubahan.
+#
+# CATATAN: ini bukan padanan `compare_models()` (tidak ada cross-validation,
+# kandidat terbatas pada learner yang bisa dilatih bertahap). Pakai mode ini
+# hanya jika data memang tidak muat di memori.
+#
+# ==============================================================================
+
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from data_loader import DEFAULT_CHUNKSIZE, iter_chunks, peak_rss_mb
+from model_search import SORT_METRIC, build_comparison_table
+from instrumentation import stage, record_event
+
+# Kategori terbanyak yang di-one-hot per kolom teks; sisanya dianggap "lainnya"
+CATEGORY_MAX_LEVELS = 50
+# Batas kamus hitungan kategori selama pass skema (kolom mirip ID tidak boleh
+# membuat kamus tumbuh tanpa batas); dipangkas ke kategori terbanyak
+CATEGORY_TRACK_LIMIT = 100 * CATEGORY_MAX_LEVELS
+# Chunk mentah + matriks float64 hasil encode + salinan sementara saat acak/predict
+WORKING_SET_FACTOR = 3
+SCHEMA_SAMPLE_ROWS = 1_000
+MIN_CHUNKSIZE = 1_000
+AUC_BINS = 1_000
+# Total pohon LightGBM yang dibagi rata ke semua chunk & epoch. Setiap `init_model`
+# memprediksi ulang chunk baru dengan semua pohon lama, jadi jumlah pohon yang
+# tumbuh tanpa batas membuat biaya pelatihan kuadratik terhadap jumlah chunk.
+BOOSTING_TOTAL_ROUNDS = 200
+# Sama dengan `train_size=0.7` bawaan `setup()` PyCaret
+HOLDOUT_FRACTION = 0.3
+
+
+# ------------------------------------------------------------------------------
+# PASS SKEMA & ENCODER
+# ------------------------------------------------------------------------------
+class ChunkEncoder(BaseEstimator, TransformerMixin):
+    """
+    Standarisasi kolom numerik (nilai kosong -> rata-rata) dan one-hot kolom teks
+    dengan statistik yang dihitung sekali dari seluruh file (lihat `scan_schema`).
+    Ikut disimpan di dalam pipeline pemenang sehingga `predict_service.py` bisa
+    memakainya seperti pipeline PyCaret.
+    """
+
+    def __init__(self, features=None, numeric=None, means=None, stds=None, categories=None):
+        self.features = features
+        self.numeric = numeric
+        self.means = means
+        self.stds = stds
+        self.categories = categories
+
+    @property
+    def n_features_out(self) -> int:
+        return len(self.numeric) + sum(len(levels) for levels in self.categories.values())
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        names = list(self.numeric) + [f"{col}_{level}" for col, levels in self.categories.items()
+                                      for level in levels]
+        return np.asarray(names, dtype=object)
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        out = np.zeros((len(X), self.n_features_out), dtype=np.float64)
+        for i, col in enumerate(self.numeric):
+            values = pd.to_numeric(X[col], errors='coerce').to_numpy(dtype=np.float64)
+            values = (values - self.means[col]) / self.stds[col]
+            out[:, i] = np.nan_to_num(values, nan=0.0)
+        offset = len(self.numeric)
+        rows = np.arange(len(X))
+        for col, levels in self.categories.items():
+            codes = pd.Categorical(X[col], categories=levels).codes
+            known = codes >= 0
+            out[rows[known], offset + codes[known]] = 1.0
+            offset += len(levels)
+        return out
+
+
+def _chunksize_for(memory_limit_mb: float, bytes_per_row: float, upper: int) -> int:
+    rows = int(memory_limit_mb * 1024 ** 2 / (bytes_per_row * WORKING_SET_FACTOR))
+    return max(min(rows, upper), MIN_CHUNKSIZE)
+
+
+def scan_schema(path: str, target_column: str, problem_type: str, columns: list = None,
+                memory_limit_mb: float = 512, chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+    """
+    Pass pertama: statistik kolom untuk `ChunkEncoder` dan ukuran chunk pelatihan.
+
+    Returns:
+        dict: encoder, features, classes (klasifikasi), target_scale (regresi:
+        rata-rata & simpangan baku target), rows, chunksize.
+    """
+    sample = next(iter_chunks(path, SCHEMA_SAMPLE_ROWS, columns))
+    if target_column not in sample:
+        raise KeyError(f"Kolom target '{target_column}' tidak ada di file.")
+    features = [col for col in sample.columns if col != target_column]
+    numeric = [col for col in features if pd.api.types.is_numeric_dtype(sample[col])
+               and not pd.api.types.is_bool_dtype(sample[col])]
+    text = [col for col in features if col not in numeric]
+    raw_bytes = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+    scan_chunksize = _chunksize_for(memory_limit_mb, raw_bytes, chunksize)
+
+    rows = 0
+    sums, squares, counts = pd.Series(0.0, index=numeric), pd.Series(0.0, index=numeric), pd.Series(0, index=numeric)
+    levels = {col: pd.Series(dtype='int64') for col in text}
+    classes = pd.Series(dtype='int64')
+    target_sum, target_square = 0.0, 0.0
+    for chunk in iter_chunks(path, scan_chunksize, columns):
+        rows += len(chunk)
+        values = chunk[numeric].apply(pd.to_numeric, errors='coerce')
+        sums += values.sum()
+        squares += (values ** 2).sum()
+        counts += values.count()
+        for col in text:
+            merged = levels[col].add(chunk[col].value_counts(), fill_value=0)
+            levels[col] = merged.nlargest(CATEGORY_TRACK_LIMIT) if len(merged) > CATEGORY_TRACK_LIMIT else merged
+        if problem_type == 'classification':
+            classes = classes.add(chunk[target_column].value_counts(), fill_value=0)
+        else:
+            target = chunk[target_column].astype(np.float64)
+            if target.isna().any():
+                raise ValueError("Kolom target berisi nilai kosong.")
+            target_sum += target.sum()
+            target_square += (target ** 2).sum()
+
+    means = (sums / counts.clip(lower=1)).fillna(0.0)
+    stds = np.sqrt((squares / counts.clip(lower=1) - means ** 2).clip(lower=0)).replace(0, 1.0).fillna(1.0)
+    target_mean = target_sum / max(rows, 1)
+    target_std = float(np.sqrt(max(target_square / max(rows, 1) - target_mean ** 2, 0.0))) or 1.0
+    categories = {col: list(levels[col].nlargest(CATEGORY_MAX_LEVELS).index) for col in text}
+    encoder = ChunkEncoder(features=features, numeric=numeric, means=means.to_dict(), stds=stds.to_dict(), categories=categories)
+
+    # Ukuran chunk pelatihan: baris mentah + baris hasil encode (float64)
+    bytes_per_row = raw_bytes + 8 * (encoder.n_features_out + 1)
+    return {
+        'encoder': encoder,
+        'features': features,
+        'classes': np.array(sorted(classes.index)) if problem_type == 'classification' else None,
+        'target_scale': (target_mean, target_std) if problem_type == 'regression' else None,
+        'rows': rows,
+        'chunksize': _chunksize_for(memory_limit_mb, bytes_per_row, chunksize),
+    }
+
+
+# ------------------------------------------------------------------------------
+# LEARNER INKREMENTAL
+# ------------------------------------------------------------------------------
+class ChunkedBoosting(BaseEstimator):
+    """
+    LightGBM yang dilatih bertahap: setiap `partial_fit` menambah `rounds_per_chunk`
+    pohon di atas model sebelumnya (`init_model`), jadi hanya satu chunk yang perlu
+    ada di memori. Label kelas asli dipetakan ke indeks `classes`.
+    """
+
+    def __init__(self, objective: str = 'regression', rounds_per_chunk: int = 20,
+                 learning_rate: float = 0.1, num_leaves: int = 31, seed: int = 123):
+        self.objective = objective
+        self.rounds_per_chunk = rounds_per_chunk
+        self.learning_rate = learning_rate
+        self.num_leaves = num_leaves
+        self.seed = seed
+
+    @property
+    def _estimator_type(self):
+        return 'regressor' if self.objective == 'regression' else 'classifier'
+
+    def partial_fit(self, X, y, classes=None):
+        import lightgbm
+
+        params = {'objective': self.objective, 'learning_rate': self.learning_rate,
+                  'num_leaves': self.num_leaves, 'seed': self.seed, 'verbose': -1}
+        if self.objective != 'regression':
+            if not hasattr(self, 'classes_'):
+                self.classes_ = np.asarray(classes)
+            y = np.searchsorted(self.classes_, y)
+            if self.objective == 'multiclass':
+                params['num_class'] = len(self.classes_)
+        self.booster_ = lightgbm.train(params, lightgbm.Dataset(X, y), num_boost_round=self.rounds_per_chunk,
+                                       init_model=getattr(self, 'booster_', None), keep_training_booster=True)
+        return self
+
+    def predict_proba(self, X):
+        proba = self.booster_.predict(X)
+        return np.column_stack([1 - proba, proba]) if proba.ndim == 1 else proba
+
+    def predict(self, X):
+        if self.objective == 'regression':
+            return self.booster_.predict(X)
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+class ScaledTargetRegressor(BaseEstimator):
+    """
+    Melatih regresor pada target yang distandarisasi (statistik dari pass skema).
+    `TransformedTargetRegressor` sklearn tidak punya `partial_fit`; tanpa ini SGD
+    dan MLP lambat konvergen untuk target berskala besar (misal harga).
+    """
+
+    _estimator_type = 'regressor'
+
+    def __init__(self, estimator=None, mean: float = 0.0, std: float = 1.0):
+        self.estimator = estimator
+        self.mean = mean
+        self.std = std
+
+    def partial_fit(self, X, y):
+        self.estimator.partial_fit(X, (y - self.mean) / self.std)
+        return self
+
+    def predict(self, X):
+        return self.estimator.predict(X) * self.std + self.mean
+
+
+def incremental_learners(problem_type: str, n_classes: int = None, target_scale: tuple = (0.0, 1.0),
+                         n_updates: int = 1, session_id: int = 123) -> dict:
+    """
+    Kandidat yang mendukung pelatihan per chunk: {ID: (nama, estimator)}.
+
+    `n_updates` adalah jumlah panggilan `partial_fit` (chunk x epoch); dipakai
+    untuk membagi `BOOSTING_TOTAL_ROUNDS` pohon LightGBM.
+    """
+    from sklearn.linear_model import (SGDClassifier, SGDRegressor,
+                                      PassiveAggressiveClassifier, PassiveAggressiveRegressor)
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.neural_network import MLPClassifier, MLPRegressor
+
+    rounds = max(BOOSTING_TOTAL_ROUNDS // max(n_updates, 1), 1)
+    if problem_type == 'classification':
+        return {
+            'sgd': ('SGD Classifier', SGDClassifier(loss='log_loss', random_state=session_id)),
+            'pa': ('Passive Aggressive Classifier', PassiveAggressiveClassifier(random_state=session_id)),
+            # Fitur sudah distandarisasi (varians ~1); smoothing bawaan 1e-9 membuat
+            # kolom one-hot yang konstan dalam satu kelas mendominasi likelihood
+            'nb': ('Naive Bayes', GaussianNB(var_smoothing=1e-2)),
+            'mlp': ('MLP Classifier', MLPClassifier(hidden_layer_sizes=(64,), random_state=session_id)),
+            'lightgbm': ('Light Gradient Boosting Machine',
+                         ChunkedBoosting('binary' if n_classes == 2 else 'multiclass', rounds, seed=session_id)),
+        }
+    mean, std = target_scale
+    return {
+        'sgd': ('SGD Regressor', ScaledTargetRegressor(SGDRegressor(random_state=session_id), mean, std)),
+        'pa': ('Passive Aggressive Regressor',
+               ScaledTargetRegressor(PassiveAggressiveRegressor(random_state=session_id), mean, std)),
+        'mlp': ('MLP Regressor',
+                ScaledTargetRegressor(MLPRegressor(hidden_layer_sizes=(64,), random_state=session_id), mean, std)),
+        'lightgbm': ('Light Gradient Boosting Machine', ChunkedBoosting('regression', rounds, seed=session_id)),
+    }
+
+
+# ------------------------------------------------------------------------------
+# METRIK STREAMING (SKEMA SAMA DENGAN TABEL `compare_models()`)
+# ------------------------------------------------------------------------------
+class ClassificationMetrics:
+    """Akumulator confusion matrix + histogram skor per kelas (untuk AUC)."""
+
+    def __init__(self, n_classes: int):
+        self.confusion = np.zeros((n_classes, n_classes), dtype=np.int64)
+        self.positive = np.zeros((n_classes, AUC_BINS), dtype=np.int64)
+        self.negative = np.zeros((n_classes, AUC_BINS), dtype=np.int64)
+        self.has_proba = True
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray, proba: np.ndarray = None):
+        n = len(self.confusion)
+        self.confusion += np.bincount(y_true * n + y_pred, minlength=n * n).reshape(n, n)
+        if proba is None:
+            self.has_proba = False
+            return
+        bins = np.clip((proba * AUC_BINS).astype(np.int64), 0, AUC_BINS - 1)
+        for k in range(n):
+            is_k = y_true == k
+            self.positive[k] += np.bincount(bins[is_k, k], minlength=AUC_BINS)
+            self.negative[k] += np.bincount(bins[~is_k, k], minlength=AUC_BINS)
+
+    def _auc(self, k: int) -> float:
+        pos, neg = self.positive[k], self.negative[k]
+        if not pos.sum() or not neg.sum():
+            return 0.0
+        # Pasangan (positif, negatif) dengan skor positif lebih tinggi; seri dihitung setengah
+        below = np.cumsum(neg) - neg
+        return float((pos * (below + 0.5 * neg)).sum() / (pos.sum() * neg.sum()))
+
+    def result(self) -> dict:
+        c = self.confusion.astype(np.float64)
+        total, support, predicted, correct = c.sum(), c.sum(axis=1), c.sum(axis=0), np.diag(c)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            recall = np.nan_to_num(correct / support)
+            precision = np.nan_to_num(correct / predicted)
+            f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+        if len(c) == 2:
+            # Biner: metrik kelas positif (indeks 1), sama seperti PyCaret
+            weights = np.array([0.0, 1.0])
+        else:
+            weights = support / total
+        chance = (support * predicted).sum() / total ** 2
+        accuracy = correct.sum() / total
+        mcc_denominator = np.sqrt((total ** 2 - (predicted ** 2).sum()) * (total ** 2 - (support ** 2).sum()))
+        auc = sum(weights[k] * self._auc(k) for k in range(len(c))) if self.has_proba else 0.0
+        return {
+            'Accuracy': accuracy,
+            'AUC': auc,
+            'Recall': (weights * recall).sum(),
+            'Prec.': (weights * precision).sum(),
+            'F1': (weights * f1).sum(),
+            'Kappa': (accuracy - chance) / (1 - chance) if chance < 1 else 0.0,
+            'MCC': (correct.sum() * total - (support * predicted).sum()) / mcc_denominator if mcc_denominator else 0.0,
+        }
+
+
+class RegressionMetrics:
+    """Akumulator jumlahan galat untuk MAE/MSE/RMSE/R2/RMSLE/MAPE."""
+
+    def __init__(self):
+        self.n = 0
+        self.sums = dict.fromkeys(('abs', 'sq', 'y', 'y2', 'log_sq', 'ape'), 0.0)
+        self.ape_count = 0
+        self.log_valid = True
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray, proba=None):
+        error = y_pred - y_true
+        self.n += len(y_true)
+        self.sums['abs'] += np.abs(error).sum()
+        self.sums['sq'] += (error ** 2).sum()
+        self.sums['y'] += y_true.sum()
+        self.sums['y2'] += (y_true ** 2).sum()
+        if (y_true < 0).any() or (y_pred < 0).any():
+            self.log_valid = False
+        elif self.log_valid:
+            self.sums['log_sq'] += ((np.log1p(y_pred) - np.log1p(y_true)) ** 2).sum()
+        nonzero = y_true != 0
+        self.sums['ape'] += np.abs(error[nonzero] / y_true[nonzero]).sum()
+        self.ape_count += int(nonzero.sum())
+
+    def result(self) -> dict:
+        s, n = self.sums, max(self.n, 1)
+        total_variance = s['y2'] - s['y'] ** 2 / n
+        return {
+            'MAE': s['abs'] / n,
+            'MSE': s['sq'] / n,
+            'RMSE': np.sqrt(s['sq'] / n),
+            'R2': 1 - s['sq'] / total_variance if total_variance else 0.0,
+            # Sama seperti PyCaret: RMSLE tidak terdefinisi untuk nilai negatif -> 0
+            'RMSLE': np.sqrt(s['log_sq'] / n) if self.log_valid else 0.0,
+            'MAPE': s['ape'] / self.ape_count if self.ape_count else 0.0,
+        }
+
+
+# ------------------------------------------------------------------------------
+# PERBANDINGAN OUT-OF-CORE
+# ------------------------------------------------------------------------------
+def _holdout_chunks(path: str, schema: dict, target_column: str, columns: list,
+                    holdout_fraction: float, session_id: int):
+    """
+    Membaca file per chunk dan membaginya menjadi (X_train, y_train, X_holdout, y_holdout).
+
+    Pembagian memakai aliran acak dengan seed tetap sehingga setiap pass memilih
+    baris holdout yang sama; baris latih diacak di dalam chunk untuk SGD/MLP.
+    """
+    split_rng = np.random.default_rng(session_id)
+    shuffle_rng = np.random.default_rng(session_id + 1)
+    encoder = schema['encoder']
+    for chunk in iter_chunks(path, schema['chunksize'], columns):
+        holdout = split_rng.random(len(chunk)) < holdout_fraction
+        X = encoder.transform(chunk)
+        y = chunk[target_column].to_numpy()
+        train_idx = shuffle_rng.permutation(np.flatnonzero(~holdout))
+        yield X[train_idx], y[train_idx], X[holdout], y[holdout]
+
+
+def holdout_sample(path: str, target_column: str, columns: list = None, n_rows: int = 1000,
+                   holdout_fraction: float = HOLDOUT_FRACTION, session_id: int = 123,
+                   chunksize: int = DEFAULT_CHUNKSIZE) -> pd.DataFrame:
+    """
+    Sampel acak seragam (maksimal `n_rows`) dari baris holdout `_holdout_chunks`,
+    dalam bentuk kolom asli. Aliran acak pembagian sama dengan pelatihan dan tidak
+    bergantung pada ukuran chunk, sehingga baris latih tidak ikut terambil.
+    Memori dibatasi satu chunk + `n_rows` baris.
+    """
+    split_rng = np.random.default_rng(session_id)
+    key_rng = np.random.default_rng(session_id + 2)
+    kept = None
+    for chunk in iter_chunks(path, chunksize, columns):
+        holdout = chunk[split_rng.random(len(chunk)) < holdout_fraction]
+        holdout = holdout.assign(_key=key_rng.random(len(holdout)))
+        # Bottom-k: simpan n_rows baris dengan kunci acak terkecil
+        kept = holdout if kept is None else pd.concat([kept, holdout])
+        kept = kept.nsmallest(n_rows, '_key')
+    if kept is None or target_column not in kept:
+        raise KeyError(f"Kolom target '{target_column}' tidak ada di file.")
+    return kept.drop(columns='_key').reset_index(drop=True)
+
+
+def out_of_core_compare(path: str, problem_type: str, target_column: str, columns: list = None,
+                        memory_limit_mb: float = 512, chunksize: int = DEFAULT_CHUNKSIZE,
+                        epochs: int = 2, holdout_fraction: float = HOLDOUT_FRACTION,
+                        session_id: int = 123, budget_seconds: float = None, include: list = None):
+    """
+    Membandingkan learner inkremental langsung dari file tanpa memuat seluruh data.
+
+    Args:
+        path (str): File CSV/Parquet/Arrow (dibaca per chunk lewat `iter_chunks`).
+        problem_type (str): 'classification' atau 'regression'.
+        target_column (str): Nama kolom target.
+        columns (list): Proyeksi kolom (harus memuat target). None berarti semua kolom.
+        memory_limit_mb (float): Batas memori kerja data; menentukan ukuran chunk.
+        chunksize (int): Batas atas ukuran chunk.
+        epochs (int): Jumlah pass pelatihan atas file.
+        holdout_fraction (float): Porsi baris untuk evaluasi.
+        session_id (int): Seed pembagian holdout & learner.
+        budget_seconds (float): Batas waktu; epoch berikutnya dilewati jika habis
+            (minimal satu epoch selalu dijalankan).
+        include (list): Daftar ID learner. None berarti semua.
+
+    Returns:
+        tuple: (pipeline terbaik (encoder + model), tabel perbandingan). Ringkasan
+        run disimpan di `tabel.attrs['out_of_core']`.
+    """
+    from sklearn.pipeline import Pipeline
+
+    sort_metric = SORT_METRIC[problem_type]
+    is_classifier = problem_type == 'classification'
+    deadline = time.time() + budget_seconds if budget_seconds else None
+
+    with stage('scan_schema') as info:
+        schema = scan_schema(path, target_column, problem_type, columns, memory_limit_mb, chunksize)
+        info['rows'] = schema['rows']
+    classes = schema['classes']
+    print(f"📐 Skema dari {schema['rows']} baris: {schema['encoder'].n_features_out} fitur hasil encode, "
+          f"chunk {schema['chunksize']} baris (batas memori {memory_limit_mb:.0f} MB).")
+
+    n_updates = -(-schema['rows'] // schema['chunksize']) * epochs
+    learners = incremental_learners(problem_type, len(classes) if is_classifier else None,
+                                    schema['target_scale'] or (0.0, 1.0), n_updates, session_id)
+    if include:
+        learners = {model_id: spec for model_id, spec in learners.items() if model_id in include}
+    fit_seconds, failed = dict.fromkeys(learners, 0.0), {}
+
+    epochs_run = 0
+    for epoch in range(1, epochs + 1):
+        if epoch > 1 and deadline is not None and time.time() > deadline:
+            print(f"   ⏱️ Epoch {epoch}-{epochs} dilewati (anggaran waktu habis)")
+            break
+        with stage(f'epoch_{epoch}', rows=schema['rows']):
+            for X_train, y_train, _, _ in _holdout_chunks(path, schema, target_column, columns,
+                                                          holdout_fraction, session_id):
+                if not len(y_train):
+                    continue
+                for model_id, (name, estimator) in learners.items():
+                    if model_id in failed:
+                        continue
+                    fit_start = time.perf_counter()
+                    try:
+                        if is_classifier:
+                            estimator.partial_fit(X_train, y_train, classes=classes)
+                        else:
+                            estimator.partial_fit(X_train, y_train.astype(np.float64))
+                    except Exception as e:
+                        failed[model_id] = str(e)
+                        print(f"   ⚠️ {name} gagal: {e}")
+                    fit_seconds[model_id] += time.perf_counter() - fit_start
+        epochs_run = epoch
+        print(f"   🔄 Epoch {epoch}/{epochs} selesai")
+
+    trained = {model_id: spec for model_id, spec in learners.items() if model_id not in failed}
+    if not trained:
+        raise RuntimeError("Tidak ada model yang selesai dilatih.")
+    metrics = {model_id: ClassificationMetrics(len(classes)) if is_classifier else RegressionMetrics()
+               for model_id in trained}
+    holdout_rows = 0
+    with stage('evaluate_holdout', rows=schema['rows']):
+        for _, _, X_holdout, y_holdout in _holdout_chunks(path, schema, target_column, columns,
+                                                          holdout_fraction, session_id):
+            if not len(y_holdout):
+                continue
+            holdout_rows += len(y_holdout)
+            y_true = np.searchsorted(classes, y_holdout) if is_classifier else y_holdout.astype(np.float64)
+            for model_id, (name, estimator) in trained.items():
+                proba = None
+                if is_classifier and hasattr(estimator, 'predict_proba'):
+                    # Kolom probabilitas berurutan sesuai `classes`; cukup satu kali predict
+                    proba = estimator.predict_proba(X_holdout)
+                    y_pred = proba.argmax(axis=1)
+                elif is_classifier:
+                    y_pred = np.searchsorted(classes, estimator.predict(X_holdout))
+                else:
+                    y_pred = estimator.predict(X_holdout)
+                metrics[model_id].update(y_true, y_pred, proba)
+
+    rows = {}
+    for model_id, (name, estimator) in trained.items():
+        record_event(model_id, time.time() - fit_seconds[model_id], fit_seconds[model_id],
+                     category='estimator', rows=schema['rows'], epochs=epochs_run)
+        rows[model_id] = {'Model': name,
+                          **{metric: round(float(value), 4) for metric, value in metrics[model_id].result().items()},
+                          # Sama dengan jalur lain, 'TT (Sec)' = waktu latih per fold; di sini satu
+                          # pass atas data latih (per epoch). Total seluruh epoch ada di attrs.
+                          'TT (Sec)': fit_seconds[model_id] / max(epochs_run, 1)}
+        print(f"   ✔ {name}: {sort_metric} = {rows[model_id][sort_metric]:.4f}")
+
+    comparison_table = build_comparison_table(rows, sort_metric)
+    comparison_table.attrs['out_of_core'] = {
+        'rows': schema['rows'], 'holdout_rows': holdout_rows, 'chunksize': schema['chunksize'],
+        'memory_limit_mb': memory_limit_mb, 'epochs': epochs_run,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'fit_seconds': {model_id: round(fit_seconds[model_id], 3) for model_id in trained},
+        'fit_seconds_per_epoch': {model_id: round(fit_seconds[model_id] / max(epochs_run, 1), 3)
+                                  for model_id in trained},
+    }
+    best_id = comparison_table.index[0]
+    best_model = Pipeline([('encoder', schema['encoder']), ('model', trained[best_id][1])])
+    return best_model, comparison_table
@@ -0,0 +1,402 @@
+# ==============================================================================
+# LAYANAN PREDIKSI: SCORING BATCH & ENDPOINT HTTP DENGAN MICRO-BATCHING
+# ==============================================================================
+#
+# TUJUAN:
+# `train_model` kini menyimpan pipeline pemenang (pra-pemrosesan + model) ke
+# `<model_output>.pkl` beserta metadata `<model_output>.meta.json`. Modul ini
+# memakai pipeline tersebut tanpa pelatihan ulang, lewat dua jalur:
+# 1. SCORING BATCH: file CSV/Parquet/Arrow besar dibaca per chunk, setiap chunk
+#    diprediksi sekaligus (vektorisasi) oleh pipeline, lalu hasilnya ditulis
+#    bertahap sehingga memori tetap kecil berapa pun ukuran file.
+# 2. ENDPOINT HTTP: `POST /predict` menerima baris dalam JSON. Permintaan yang
+#    datang hampir bersamaan digabung (micro-batching) menjadi satu panggilan
+#    `predict()`, karena biaya per panggilan pipeline jauh lebih besar dari
+#    biaya per baris.
+# Keduanya punya benchmark latensi (p50/p99) dan throughput (baris/detik).
+#
+# PEMAKAIAN:
+#   python predict_service.py --mode score --model best_model --input data.csv --output prediksi.csv
+#   python predict_service.py --mode serve --model best_model --port 8080
+#   python predict_service.py --mode bench --model best_model --input data.csv
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import queue
+import argparse
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import request as urlrequest
+
+import numpy as np
+import pandas as pd
+
+from data_loader import COLUMNAR_EXTENSIONS, DEFAULT_CHUNKSIZE, iter_chunks
+from model_search import SORT_METRIC
+
+META_SUFFIX = '.meta.json'
+PREDICTION_COLUMN = 'prediction_label'  # nama kolom yang sama dengan `predict_model` PyCaret
+# Chunk mode bench sengaja kecil agar data.csv (6 ribu baris) terbagi ke beberapa chunk
+# dan persentil latensi per chunk bermakna
+BENCH_CHUNKSIZE = 1_000
+
+
+# ------------------------------------------------------------------------------
+# MENYIMPAN & MEMUAT PIPELINE
+# ------------------------------------------------------------------------------
+def write_model_metadata(model_output: str, data: pd.DataFrame, target_column: str,
+                         problem_type: str, comparison_table: pd.DataFrame):
+    """Menulis metadata pipeline (kolom fitur, target, model) di samping file `.pkl`."""
+    meta = {
+        'target_column': target_column,
+        'problem_type': problem_type,
+        'features': [str(col) for col in data.columns if col != target_column],
+        'model_id': str(comparison_table.index[0]),
+        'model_name': str(comparison_table.iloc[0]['Model']),
+        'metric': SORT_METRIC[problem_type],
+        'score': float(comparison_table.iloc[0][SORT_METRIC[problem_type]]),
+        'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    tmp_path = f"{model_output}{META_SUFFIX}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, model_output + META_SUFFIX)
+
+
+def load_pipeline(model_path: str):
+    """
+    Memuat pipeline tersimpan dan metadatanya.
+
+    Args:
+        model_path (str): Path pipeline dengan atau tanpa ekstensi '.pkl'
+            (sama seperti `save_model`/`load_model` PyCaret).
+
+    Returns:
+        tuple: (pipeline, metadata dict).
+    """
+    import joblib  # membuka pickle pipeline akan mengimpor PyCaret (lambat), jadi ditunda
+
+    base = model_path[:-4] if model_path.endswith('.pkl') else model_path
+    pipeline = joblib.load(base + '.pkl')
+    meta = {}
+    if os.path.exists(base + META_SUFFIX):
+        with open(base + META_SUFFIX, encoding='utf-8') as f:
+            meta = json.load(f)
+    if not meta.get('features'):
+        # Pipeline PyCaret mencatat target sebagai kolom terakhir `feature_names_in_`
+        meta['features'] = [str(col) for col in pipeline.feature_names_in_[:-1]]
+    return pipeline, meta
+
+
+def _predict(pipeline, features: list, frame: pd.DataFrame) -> np.ndarray:
+    return np.asarray(pipeline.predict(frame[features]))
+
+
+def _percentiles(latencies: list) -> dict:
+    values = np.asarray(latencies) * 1000
+    return {'p50 (ms)': round(float(np.percentile(values, 50)), 2),
+            'p99 (ms)': round(float(np.percentile(values, 99)), 2)}
+
+
+# ------------------------------------------------------------------------------
+# JALUR 1: SCORING BATCH PER CHUNK
+# ------------------------------------------------------------------------------
+def _input_columns(path: str) -> list:
+    """Nama kolom file input tanpa membaca barisnya (untuk output file kosong)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    if extension in COLUMNAR_EXTENSIONS:
+        from pyarrow import feather
+        return feather.read_table(path, memory_map=True).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def score_file(pipeline, features: list, input_path: str, output_path: str,
+               chunksize: int = DEFAULT_CHUNKSIZE) -> dict:
+    """
+    Memprediksi seluruh baris file input per chunk dan menulis hasilnya bertahap.
+
+    Output berisi kolom input ditambah `prediction_label`. Ekstensi `output_path`
+    menentukan format: '.parquet' (lewat ParquetWriter) atau CSV. Input tanpa baris
+    menghasilkan output kosong yang tetap memiliki header. File sementara dihapus
+    jika scoring gagal di tengah jalan.
+
+    Returns:
+        dict: Jumlah baris, waktu total, baris/detik, dan latensi per chunk (detik).
+    """
+    tmp_path = f"{output_path}.tmp"
+    as_parquet = output_path.lower().endswith('.parquet')
+    writer, rows, chunk_latencies = None, 0, []
+
+    def write(chunk):
+        nonlocal writer
+        if as_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+        else:
+            chunk.to_csv(tmp_path, mode='a' if rows else 'w', header=not rows, index=False)
+
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunksize=chunksize):
+            if chunk.empty:
+                continue
+            chunk_start = time.perf_counter()
+            chunk[PREDICTION_COLUMN] = _predict(pipeline, features, chunk)
+            chunk_latencies.append(time.perf_counter() - chunk_start)
+            write(chunk)
+            rows += len(chunk)
+        if not rows:
+            write(pd.DataFrame(columns=[*_input_columns(input_path), PREDICTION_COLUMN]))
+        if writer is not None:
+            writer.close()
+            writer = None
+        os.replace(tmp_path, output_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    elapsed = time.perf_counter() - start
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed > 0 else None,
+            'chunk_latencies': chunk_latencies}
+
+
+# ------------------------------------------------------------------------------
+# JALUR 2: ENDPOINT HTTP DENGAN MICRO-BATCHING
+# ------------------------------------------------------------------------------
+class MicroBatcher:
+    """
+    Menggabungkan permintaan prediksi yang datang bersamaan menjadi satu batch.
+
+    Batch dikirim ke pipeline saat jumlah baris mencapai `max_batch_rows`, atau
+    `max_wait_ms` setelah permintaan pertama di batch tersebut tiba.
+    """
+
+    def __init__(self, predict_fn, max_batch_rows: int = 1024, max_wait_ms: float = 5.0):
+        self.predict_fn = predict_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.stats = {'requests': 0, 'batches': 0, 'rows': 0}
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: pd.DataFrame) -> Future:
+        future = Future()
+        self._queue.put((frame, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first) -> tuple:
+        batch, rows = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            rows += len(item[0])
+        return batch, False
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            frames = [frame for frame, _ in batch]
+            try:
+                predictions = self.predict_fn(pd.concat(frames, ignore_index=True))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                offset = 0
+                for frame, future in batch:
+                    future.set_result(predictions[offset:offset + len(frame)].tolist())
+                    offset += len(frame)
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['rows'] += sum(len(frame) for frame in frames)
+            if stop:
+                return
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """`POST /predict` (JSON: list baris atau {"records": [...]}), `GET /health`, `GET /stats`."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        path = self.path.rstrip('/')
+        if path == '/health':
+            self._send_json(200, {'status': 'ok', 'model': self.server.meta.get('model_name')})
+        elif path == '/stats':
+            self._send_json(200, dict(self.server.batcher.stats))
+        else:
+            self._send_json(404, {'error': f"Path tidak dikenal: {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/predict':
+            self._send_json(404, {'error': f"Path tidak dikenal: {self.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            records = body['records'] if isinstance(body, dict) else body
+            frame = pd.DataFrame.from_records(records, columns=self.server.meta['features'])
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f"Body JSON tidak valid: {e}"})
+            return
+        try:
+            predictions = self.server.batcher.submit(frame).result(timeout=self.server.request_timeout)
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, {'predictions': predictions})
+
+
+def start_prediction_server(pipeline, meta: dict, host: str = '127.0.0.1', port: int = 8080,
+                            max_batch_rows: int = 1024, max_wait_ms: float = 5.0,
+                            request_timeout: float = 30.0):
+    """
+    Menjalankan endpoint HTTP di thread latar belakang.
+
+    Returns:
+        tuple: (objek server, base URL). Hentikan dengan `server.shutdown()`.
+    """
+    features = meta['features']
+    server = ThreadingHTTPServer((host, port), PredictionHandler)
+    server.meta = meta
+    server.request_timeout = request_timeout
+    server.batcher = MicroBatcher(lambda frame: _predict(pipeline, features, frame),
+                                  max_batch_rows=max_batch_rows, max_wait_ms=max_wait_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK LATENSI & THROUGHPUT
+# ------------------------------------------------------------------------------
+def benchmark_http(url: str, sample: pd.DataFrame, n_requests: int = 200,
+                   rows_per_request: int = 1, concurrency: int = 8) -> dict:
+    """
+    Mengirim `n_requests` permintaan (masing-masing `rows_per_request` baris) dari
+    `concurrency` klien bersamaan, lalu mengukur latensi per permintaan.
+    """
+    records = json.loads(sample.to_json(orient='records'))
+    payloads = []
+    for i in range(n_requests):
+        start = (i * rows_per_request) % max(len(records) - rows_per_request, 1)
+        payloads.append(json.dumps({'records': records[start:start + rows_per_request]}).encode('utf-8'))
+
+    def send(payload):
+        req = urlrequest.Request(f"{url}/predict", data=payload, headers={'Content-Type': 'application/json'})
+        t0 = time.perf_counter()
+        with urlrequest.urlopen(req) as response:
+            response.read()
+        return time.perf_counter() - t0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(send, payloads))
+    elapsed = time.perf_counter() - start
+    return {'Jalur': f"HTTP ({concurrency} klien, {rows_per_request} baris/permintaan)",
+            **_percentiles(latencies), 'Baris/detik': round(n_requests * rows_per_request / elapsed)}
+
+
+def run_benchmark(model_path: str, input_path: str, chunksize: int = BENCH_CHUNKSIZE, n_requests: int = 200,
+                  concurrency: int = 8, max_batch_rows: int = 1024, max_wait_ms: float = 5.0) -> pd.DataFrame:
+    """Benchmark jalur batch dan HTTP (dengan & tanpa micro-batching) untuk satu pipeline."""
+    pipeline, meta = load_pipeline(model_path)
+    results = []
+
+    output_path = os.path.join(os.path.dirname(os.path.abspath(input_path)), '.bench_predictions.csv')
+    stats = score_file(pipeline, meta['features'], input_path, output_path, chunksize=chunksize)
+    os.remove(output_path)
+    results.append({'Jalur': f"Batch (chunk {chunksize} baris)", **_percentiles(stats['chunk_latencies']),
+                    'Baris/detik': round(stats['rows_per_sec'])})
+
+    sample = next(iter_chunks(input_path, chunksize=5_000, columns=None))[meta['features']]
+    for batch_rows, label in ((1, 'tanpa micro-batching'), (max_batch_rows, 'micro-batching')):
+        server, url = start_prediction_server(pipeline, meta, port=0, max_batch_rows=batch_rows,
+                                              max_wait_ms=0 if batch_rows == 1 else max_wait_ms)
+        try:
+            benchmark_http(url, sample, n_requests=min(20, n_requests), concurrency=concurrency)  # pemanasan
+            result = benchmark_http(url, sample, n_requests=n_requests, concurrency=concurrency)
+            result['Jalur'] += f", {label}"
+            result['Rata-rata baris/batch'] = round(server.batcher.stats['rows'] / max(server.batcher.stats['batches'], 1), 1)
+            results.append(result)
+        finally:
+            server.shutdown()
+            server.batcher.close()
+    return pd.DataFrame(results)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Layanan prediksi dari pipeline terbaik hasil train_model")
+    parser.add_argument('--mode', type=str, required=True, choices=["score", "serve", "bench"], help='score: scoring file, serve: endpoint HTTP, bench: benchmark.')
+    parser.add_argument('--model', type=str, default='best_model', help='Path pipeline tersimpan (tanpa/dengan .pkl).')
+    parser.add_argument('--input', type=str, default=None, help='File CSV/Parquet/Arrow untuk mode score & bench.')
+    parser.add_argument('--output', type=str, default='prediksi.csv', help='File hasil mode score (.csv atau .parquet).')
+    parser.add_argument('--chunksize', type=int, default=None, help=f'Jumlah baris per chunk (bawaan: {DEFAULT_CHUNKSIZE} untuk mode score, {BENCH_CHUNKSIZE} untuk mode bench).')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Alamat server (mode serve).')
+    parser.add_argument('--port', type=int, default=8080, help='Port server (mode serve).')
+    parser.add_argument('--max_batch_rows', type=int, default=1024, help='Ukuran maksimum micro-batch (baris).')
+    parser.add_argument('--max_wait_ms', type=float, default=5.0, help='Waktu tunggu maksimum pengisian micro-batch (ms).')
+    parser.add_argument('--requests', type=int, default=200, help='Jumlah permintaan HTTP (mode bench).')
+    parser.add_argument('--concurrency', type=int, default=8, help='Jumlah klien HTTP bersamaan (mode bench).')
+    args = parser.parse_args()
+
+    if args.mode in ('score', 'bench') and not args.input:
+        parser.error("--input wajib diisi untuk mode score dan bench.")
+
+    if args.mode == 'score':
+        pipeline, meta = load_pipeline(args.model)
+        stats = score_file(pipeline, meta['features'], args.input, args.output,
+                           chunksize=args.chunksize or DEFAULT_CHUNKSIZE)
+        print(f"✅ {stats['rows']} baris diprediksi dalam {stats['seconds']:.2f} detik "
+              f"({stats['rows_per_sec']:.0f} baris/detik) -> '{args.output}'")
+    elif args.mode == 'serve':
+        pipeline, meta = load_pipeline(args.model)
+        server, url = start_prediction_server(pipeline, meta, host=args.host, port=args.port,
+                                              max_batch_rows=args.max_batch_rows, max_wait_ms=args.max_wait_ms)
+        print(f"🚀 Endpoint prediksi ({meta.get('model_name', 'model')}) berjalan di {url}/predict (Ctrl+C untuk berhenti)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+            server.batcher.close()
+    else:
+        results = run_benchmark(args.model, args.input, chunksize=args.chunksize or BENCH_CHUNKSIZE,
+                                n_requests=args.requests, concurrency=args.concurrency,
+                                max_batch_rows=args.max_batch_rows, max_wait_ms=args.max_wait_ms)
+        print("\n" + results.fillna('-').to_markdown(index=False))
@@ -0,0 +1,222 @@
+# ==============================================================================
+# MODE PEMANGKASAN (PRUNING): HENTIKAN KANDIDAT YANG TIDAK MUNGKIN MASUK TOP-N
+# ==============================================================================
+#
+# TUJUAN:
+# `compare_models()` menjalankan 10 fold penuh untuk setiap kandidat, termasuk
+# kandidat yang sejak fold-fold awal sudah jelas jauh di bawah pemimpin. Mode ini
+# menilai kandidat fold demi fold (memakai matriks fold dari fold_cache.py) dan:
+# - Setelah setiap fold (minimal `min_folds`), menghitung batas atas optimistis
+#   skor akhir kandidat: rata-rata fold sejauh ini + `z` x standard error.
+#   Jika batas itu pun di bawah skor model ke-N terbaik yang sudah selesai,
+#   kandidat dihentikan (dipangkas) dan fold sisanya tidak dijalankan.
+# - Model boosting (LightGBM, XGBoost, CatBoost, Gradient Boosting sklearn)
+#   dilatih dengan early stopping pada potongan validasi dari data latih fold,
+#   sehingga tidak selalu menjalankan semua iterasi. Pemenang dilatih ulang
+#   dengan median jumlah iterasi hasil early stopping di fold-foldnya. Log
+#   pelatihan booster dimatikan (`quiet_args`) dan CatBoost tidak menulis
+#   `catboost_info/`.
+# Tabel perbandingan mendapat kolom `Pruned` dan `Folds` (jumlah fold yang
+# selesai). Model yang dipangkas tidak pernah bisa menjadi pemenang.
+#
+# CATATAN: batas atas bersifat heuristik (bukan jaminan). Naikkan `z` untuk
+# pemangkasan yang lebih hati-hati.
+#
+# ==============================================================================
+
+import os
+import time
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from model_search import SORT_METRIC, pycaret_module, candidate_models, build_comparison_table
+from fold_cache import precompute_folds, load_fold, metric_scorers, quiet_args, score_fold
+from instrumentation import stage, record_event
+
+BOOSTING_PREFIXES = ('LGBM', 'XGB', 'CatBoost')
+SKLEARN_BOOSTING = ('GradientBoostingClassifier', 'GradientBoostingRegressor')
+
+
+def _prune_threshold(completed_scores: list, top_n: int):
+    """Skor ke-N terbaik dari kandidat yang sudah selesai penuh (None jika belum ada N)."""
+    if len(completed_scores) < top_n:
+        return None
+    return sorted(completed_scores, reverse=True)[top_n - 1]
+
+
+def _upper_bound(fold_scores: list, z: float) -> float:
+    """Batas atas optimistis skor akhir: rata-rata fold sejauh ini + `z` x standard error."""
+    values = np.asarray(fold_scores, dtype=np.float64)
+    return float(values.mean() + z * values.std(ddof=1) / np.sqrt(len(values)))
+
+
+def _early_stopping_fit(estimator, X, y, rounds: int, seed: int, is_classifier: bool):
+    """
+    Melatih estimator; model boosting memakai early stopping pada 10% data latih.
+
+    Returns:
+        estimator: Estimator yang sudah dilatih.
+    """
+    name = type(estimator).__name__
+    if name in SKLEARN_BOOSTING:
+        # Early stopping bawaan sklearn memakai potongan validasi internal
+        return estimator.set_params(n_iter_no_change=rounds, validation_fraction=0.1).fit(X, y)
+    if not name.startswith(BOOSTING_PREFIXES):
+        return estimator.fit(X, y)
+
+    from sklearn.model_selection import train_test_split
+
+    try:
+        X_fit, X_stop, y_fit, y_stop = train_test_split(
+            X, y, test_size=0.1, random_state=seed, stratify=y if is_classifier else None)
+    except ValueError:
+        # Kelas yang terlalu jarang untuk stratifikasi
+        X_fit, X_stop, y_fit, y_stop = train_test_split(X, y, test_size=0.1, random_state=seed)
+
+    if name.startswith('LGBM'):
+        import lightgbm
+        return estimator.fit(X_fit, y_fit, eval_set=[(X_stop, y_stop)],
+                             callbacks=[lightgbm.early_stopping(rounds, verbose=False)])
+    if name.startswith('XGB'):
+        estimator.set_params(early_stopping_rounds=rounds)
+        return estimator.fit(X_fit, y_fit, eval_set=[(X_stop, y_stop)], verbose=False)
+    return estimator.fit(X_fit, y_fit, eval_set=(X_stop, y_stop),
+                         early_stopping_rounds=rounds, verbose=False)
+
+
+def _fitted_rounds(estimator):
+    """Jumlah iterasi yang dipakai model boosting setelah early stopping (None untuk model lain)."""
+    name = type(estimator).__name__
+    if name in SKLEARN_BOOSTING:
+        return int(estimator.n_estimators_)
+    if name.startswith('LGBM'):
+        # best_iteration_ = 0 berarti early stopping tidak aktif
+        return int(estimator.best_iteration_ or estimator.n_estimators)
+    if name.startswith('XGB'):
+        return int(estimator.best_iteration) + 1
+    if name.startswith('CatBoost'):
+        best = estimator.get_best_iteration()
+        return None if best is None else int(best) + 1
+    return None
+
+
+def pruned_compare(problem_type: str, data: pd.DataFrame, target_column: str,
+                   session_id: int = 123, budget_seconds: float = None, include: list = None,
+                   top_n: int = 3, z: float = 2.0, min_folds: int = 3,
+                   early_stopping_rounds: int = 20, workdir: str = None):
+    """
+    Perbandingan model dengan pemangkasan per fold dan early stopping untuk boosting.
+
+    Args:
+        problem_type (str): 'classification' atau 'regression'.
+        data (pd.DataFrame): Data lengkap.
+        target_column (str): Nama kolom target.
+        session_id (int): Seed PyCaret; fold identik dengan jalur `compare_models()`.
+        budget_seconds (float): Batas waktu; kandidat yang belum mulai dilewati.
+        include (list): Daftar ID model. None berarti semua model turbo.
+        top_n (int): Kandidat dipangkas jika tidak mungkin masuk N besar.
+        z (float): Lebar batas atas optimistis (kelipatan standard error).
+        min_folds (int): Jumlah fold minimum sebelum kandidat boleh dipangkas.
+        early_stopping_rounds (int): Jumlah iterasi tanpa perbaikan sebelum boosting berhenti.
+        workdir (str): Folder matriks fold. None berarti folder sementara yang
+            dihapus setelah selesai.
+
+    Returns:
+        tuple: (model terbaik yang sudah dilatih, tabel perbandingan). Ringkasan
+        pemangkasan disimpan di `tabel.attrs['pruning']`.
+    """
+    api = pycaret_module(problem_type)
+    sort_metric = SORT_METRIC[problem_type]
+    is_classifier = problem_type == 'classification'
+    deadline = time.time() + budget_seconds if budget_seconds else None
+
+    with stage('setup', rows=len(data)):
+        api.setup(data=data, target=target_column, verbose=False, session_id=session_id)
+    candidates = candidate_models(api, include)
+    internal = api.models(internal=True)
+    scorers = metric_scorers(api)
+
+    cleanup = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='pruning_')
+    os.makedirs(workdir, exist_ok=True)
+    rows, completed_scores, fitted_rounds = {}, [], {}
+    try:
+        with stage('precompute_folds', rows=len(data)):
+            folds = precompute_folds(api, workdir)
+        n_folds = len(folds)
+
+        for model_id, name in candidates.items():
+            if deadline is not None and time.time() > deadline:
+                print(f"   ⏱️ {name} dilewati (anggaran waktu habis)")
+                continue
+            estimator_class = internal.loc[model_id, 'Class']
+            args = quiet_args(estimator_class, internal.loc[model_id, 'Args'])
+            threshold = _prune_threshold(completed_scores, top_n)
+
+            start, wall0, cpu0 = time.time(), time.perf_counter(), time.process_time()
+            fold_scores, fit_times, pruned = {display: [] for display, _, _ in scorers}, [], False
+            try:
+                for k, paths in enumerate(folds, start=1):
+                    fold = load_fold(paths)
+                    fit_start = time.perf_counter()
+                    estimator = _early_stopping_fit(estimator_class(**args), fold['X_train'], fold['y_train'],
+                                                    early_stopping_rounds, session_id, is_classifier)
+                    fit_times.append(time.perf_counter() - fit_start)
+                    rounds = _fitted_rounds(estimator)
+                    if rounds is not None:
+                        fitted_rounds.setdefault(model_id, []).append(rounds)
+                    scores = score_fold(estimator, fold['X_valid'], fold['y_valid'], scorers)
+                    for display, _, greater in scorers:
+                        fold_scores[display].append(scores[display] if greater else -scores[display])
+
+                    if threshold is not None and min_folds <= k < n_folds \
+                            and _upper_bound(fold_scores[sort_metric], z) < threshold:
+                        pruned = True
+                        break
+            except Exception as e:
+                print(f"   ⚠️ {name} gagal: {e}")
+                continue
+
+            record_event(model_id, start, time.perf_counter() - wall0, cpu=time.process_time() - cpu0,
+                         category='estimator', rows=len(data), folds=len(fit_times), pruned=pruned)
+            rows[model_id] = {'Model': name,
+                              **{display: round(float(np.mean(values)), 4) for display, values in fold_scores.items()},
+                              'TT (Sec)': float(np.mean(fit_times)), 'Pruned': pruned, 'Folds': len(fit_times)}
+            if pruned:
+                print(f"   ✂️ {name} dipangkas setelah {len(fit_times)}/{n_folds} fold "
+                      f"({sort_metric} = {rows[model_id][sort_metric]:.4f} < ambang {threshold:.4f})")
+            else:
+                completed_scores.append(rows[model_id][sort_metric])
+                print(f"   ✔ {name}: {sort_metric} = {rows[model_id][sort_metric]:.4f}")
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if not rows:
+        raise RuntimeError("Tidak ada model yang selesai dinilai.")
+
+    comparison_table = build_comparison_table({m: rows[m] for m in candidates.index if m in rows}, sort_metric)
+    # Pemenang selalu kandidat yang menjalani semua fold
+    comparison_table = pd.concat([comparison_table[~comparison_table['Pruned']],
+                                  comparison_table[comparison_table['Pruned']]])
+    folds_run = int(comparison_table['Folds'].sum())
+    comparison_table.attrs['pruning'] = {
+        'metric': sort_metric, 'top_n': top_n, 'z': z, 'min_folds': min_folds, 'n_folds': n_folds,
+        'folds_run': folds_run, 'folds_saved': n_folds * len(comparison_table) - folds_run,
+    }
+
+    best_id = comparison_table.index[0]
+    extra = {'allow_writing_files': False} if internal.loc[best_id, 'Class'].__name__.startswith('CatBoost') else {}
+    if fitted_rounds.get(best_id):
+        # Latih ulang dengan jumlah iterasi hasil early stopping di fold (median),
+        # bukan jumlah iterasi penuh yang tidak pernah dinilai
+        extra['n_estimators'] = int(np.median(fitted_rounds[best_id]))
+        comparison_table.attrs['pruning']['refit_iterations'] = extra['n_estimators']
+        print(f"   🌲 {comparison_table.loc[best_id, 'Model']} dilatih ulang dengan "
+              f"{extra['n_estimators']} iterasi (median early stopping per fold).")
+    with stage(f'{best_id} (latih ulang)', rows=len(data), category='estimator'):
+        best_model = api.create_model(best_id, cross_validation=False, verbose=False, **extra)
+    return best_model, comparison_table
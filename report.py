@@ -14,111 +14,280 @@
 # BAGIAN 1: MENGIMPOR LIBRARY YANG DIBUTUHKAN
 # ------------------------------------------------------------------------------
 import os
+import shutil
+import tempfile
 import argparse  # Untuk membuat antarmuka baris perintah (command-line interface)
 import json      # Untuk bekerja dengan data format JSON (meskipun tidak dipakai di versi ini)
 import pandas as pd # Library utama untuk manipulasi data (DataFrame)
 
-# Mengimpor modul-modul spesifik dari PyCaret
-from pycaret.classification import setup as setup_clf, compare_models as compare_clf, pull as pull_clf
-from pycaret.regression import setup as setup_reg, compare_models as compare_reg, pull as pull_reg
+# PyCaret (dan scikit-learn) TIDAK diimpor di sini: impornya memakan beberapa detik,
+# sehingga `--help`, argumen salah, file tidak ditemukan, dan cache hit akan ikut
+# membayar biaya tersebut. Modul PyCaret sesuai jenis masalah dimuat di dalam
+# `train_model` lewat `pycaret_module()` hanya ketika pelatihan benar-benar berjalan.
+
+# Cache hasil pelatihan agar data yang tidak berubah tidak dilatih ulang
+from result_cache import ResultCache, dataset_fingerprint
+# Strategi pencarian model alternatif (successive halving & eksekusi paralel)
+from model_search import pycaret_module, successive_halving, parallel_compare
+# Pra-pemrosesan dihitung sekali per fold dan dipakai bersama semua kandidat
+from fold_cache import fold_cached_compare
+# Mode pemangkasan per fold + early stopping untuk model boosting
+from pruning import pruned_compare
+# Pemuatan data (CSV per chunk atau snapshot Parquet/Arrow) dengan tipe ringkas
+from data_loader import load_dataset, DEFAULT_CHUNKSIZE
+# Penyimpanan metadata pipeline terbaik untuk layanan prediksi (predict_service.py)
+from predict_service import write_model_metadata
+# Hyperparameter tuning paralel untuk model teratas (studi SQLite yang bisa dilanjutkan)
+from tuning import tune_top_models
+# Permutation importance & atribusi SHAP untuk pipeline terbaik yang tersimpan
+from explain import explain_model
+# Mesin laporan: template terkompilasi, render inkremental, keluaran MD/HTML/JSON
+from report_engine import OFFLINE_LAYOUT, default_engine, parse_formats
+# Instrumentasi waktu & memori per tahap (Chrome trace + bagian laporan)
+from instrumentation import start_tracing, stage, record_comparison_estimates
 
 # ------------------------------------------------------------------------------
 # BAGIAN 2: FUNGSI UNTUK MELATIH MODEL (TRAIN_MODEL)
 # ------------------------------------------------------------------------------
-def train_model(data_input: pd.DataFrame, problem_type: str, target_column: str):
+def holdout_positions(data: pd.DataFrame, holdout_index: pd.Index):
+    """
+    Posisi baris (untuk `iloc`) dari label `holdout_index` di `data`, atau None jika
+    ada label yang tidak ditemukan. `get_indexer` memberi -1 untuk label yang hilang
+    dan `iloc[-1]` akan diam-diam mengambil baris terakhir, jadi hasilnya dicek.
+    """
+    if not data.index.is_unique or not len(holdout_index):
+        return None
+    positions = data.index.get_indexer(holdout_index)
+    return positions if (positions >= 0).all() else None
+
+
+def train_model(data_input: pd.DataFrame, problem_type: str, target_column: str,
+                cache_dir: str = None, cache_max_mb: int = 512, session_id: int = 123,
+                search: str = "compare", budget_seconds: float = None, workers: int = 1,
+                incremental: bool = False, state_dir: str = ".automl_state", top_n: int = 3,
+                model_output: str = None, fold_cache: bool = False, dataset_name: str = None,
+                fold_dir: str = None):
     """
     Fungsi ini menjalankan seluruh proses pelatihan model menggunakan PyCaret.
+    Jika `cache_dir` diisi, hasil untuk data yang sama diambil dari cache.
+    `search` memilih strategi: 'compare' (compare_models bawaan) atau
+    'successive-halving' (lihat model_search.py), atau 'pruning' (kandidat yang tidak
+    mungkin masuk `top_n` dihentikan per fold, lihat pruning.py); semuanya dibatasi
+    `budget_seconds`.
+    `workers` > 1 menjalankan kandidat mode 'compare' secara paralel di process pool.
+    `fold_cache` menghitung pra-pemrosesan sekali per fold lalu memakainya untuk
+    semua kandidat mode 'compare' (lihat fold_cache.py). Jika `fold_dir` diisi, matriks
+    fold mode fold-cache/pruning disimpan di sana agar bisa dipakai ulang oleh tuning.
+    Jika `incremental` aktif dan data hanya bertambah baris sejak run sebelumnya,
+    hanya `top_n` model teratas yang dinilai ulang (lihat incremental.py); state
+    disimpan per dataset (`dataset_name`, misal path file, ditambah skema kolom).
+    Jika `model_output` diisi, pipeline pemenang disimpan ke `<model_output>.pkl`
+    (beserta metadata) untuk dipakai `predict_service.py` tanpa pelatihan ulang.
     """
     print(f"🎯 Kolom Target: {target_column}")
     print(f"🧠 Jenis Masalah: {problem_type}")
 
-    if problem_type == "classification":
-        # Mempersiapkan data untuk klasifikasi
-        setup_clf(data=data_input, target=target_column, verbose=False, session_id=123)
-        print("\n🚀 Memulai perbandingan model untuk Klasifikasi...")
-        best_model = compare_clf()
-        comparison_table = pull_clf()
-
-    elif problem_type == "regression":
-        # Mempersiapkan data untuk regresi
-        setup_reg(data=data_input, target=target_column, verbose=False, session_id=123)
-        print("\n🚀 Memulai perbandingan model untuk Regresi...")
-        best_model = compare_reg()
-        comparison_table = pull_reg()
-    else:
+    if problem_type not in ("classification", "regression"):
         raise ValueError("Tipe masalah tidak valid. Pilih 'classification' atau 'regression'.")
+    if search not in ("compare", "successive-halving", "pruning"):
+        raise ValueError("Strategi pencarian tidak valid. Pilih 'compare', 'successive-halving', atau 'pruning'.")
+
+    # Cek cache terlebih dahulu: jika data & parameter sama, lewati pelatihan
+    cache, cache_key = None, None
+    if cache_dir:
+        cache = ResultCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        # Semua opsi yang bisa mengubah isi tabel perbandingan ikut menjadi kunci
+        cache_key = dataset_fingerprint(data_input, target_column, problem_type, session_id,
+                                        extra={'search': search, 'budget_seconds': budget_seconds,
+                                               'incremental': incremental, 'fold_cache': fold_cache,
+                                               'top_n': top_n, 'parallel': bool(workers and workers > 1),
+                                               'state_dir': os.path.abspath(state_dir) if incremental else None})
+        # Jika pipeline pemenang diminta, entri tanpa `best_model.pkl` dianggap miss
+        cached_table = cache.load(cache_key, require_model=bool(model_output))
+        if cached_table is not None and model_output:
+            # Pipeline pemenang ikut tersimpan di cache; cukup disalin. Entri bisa
+            # dihapus (evict) oleh proses lain di antara `load` dan penyalinan.
+            try:
+                shutil.copyfile(cache.model_path(cache_key) + '.pkl', model_output + '.pkl')
+            except OSError as e:
+                print(f"⚠️ Pipeline di cache tidak bisa disalin ({e}); pelatihan dijalankan ulang.")
+                cached_table = None
+        if cached_table is not None:
+            print(f"♻️ Hasil ditemukan di cache ({cache_key[:12]}), pelatihan dilewati.")
+            print(f"✅ Model terbaik (dari cache): {cached_table.iloc[0]['Model']}")
+            if model_output:
+                write_model_metadata(model_output, data_input, target_column, problem_type, cached_table)
+                print(f"💾 Pipeline terbaik disalin dari cache ke '{model_output}.pkl'")
+            return cached_table
+
+    # Impor tertunda: hanya modul PyCaret untuk jenis masalah yang dipilih
+    api = pycaret_module(problem_type)
+    suffix = 'clf' if problem_type == "classification" else 'reg'
+    # `budget_time` pada compare_models memakai satuan menit
+    budget_minutes = budget_seconds / 60 if budget_seconds else None
+    # Mode inkremental butuh top-N model terlatih sebagai titik awal warm start
+    n_select = top_n if incremental else 1
+
+    incremental_dir, incremental_result = None, None
+    if incremental:
+        # Impor tertunda: incremental.py bergantung pada scikit-learn
+        from incremental import state_path, incremental_retrain, save_state
+        incremental_dir = state_path(state_dir, problem_type, target_column, data_input, dataset_name)
+        incremental_result = incremental_retrain(
+            problem_type, data_input, target_column, incremental_dir,
+            top_n=top_n, session_id=session_id
+        )
+
+    fitted_models, compare_info = None, None
+    if incremental_result is not None:
+        print("\n🔁 Pelatihan ulang inkremental selesai.")
+        best_model, comparison_table, fitted_models = incremental_result
+
+    elif search == "successive-halving":
+        print("\n🚀 Memulai pencarian model dengan successive halving...")
+        best_model, comparison_table = successive_halving(
+            problem_type, data_input, target_column,
+            session_id=session_id, budget_seconds=budget_seconds
+        )
+
+    elif search == "pruning":
+        print(f"\n🚀 Memulai perbandingan model dengan pemangkasan (top-{top_n})...")
+        best_model, comparison_table = pruned_compare(
+            problem_type, data_input, target_column,
+            session_id=session_id, budget_seconds=budget_seconds, top_n=top_n, workdir=fold_dir
+        )
+
+    elif fold_cache:
+        print("\n🚀 Memulai perbandingan model dengan cache pra-pemrosesan per fold...")
+        best_model, comparison_table = fold_cached_compare(
+            problem_type, data_input, target_column,
+            session_id=session_id, workers=workers, budget_seconds=budget_seconds, workdir=fold_dir
+        )
+
+    elif workers and workers > 1:
+        print(f"\n🚀 Memulai perbandingan model secara paralel ({workers} worker)...")
+        best_model, comparison_table = parallel_compare(
+            problem_type, data_input, target_column,
+            session_id=session_id, workers=workers, budget_seconds=budget_seconds
+        )
+
+    else:
+        # Mempersiapkan data (klasifikasi atau regresi sesuai modul `api`)
+        with stage(f'setup_{suffix}', rows=len(data_input)):
+            api.setup(data=data_input, target=target_column, verbose=False, session_id=session_id)
+        label = "Klasifikasi" if problem_type == "classification" else "Regresi"
+        print(f"\n🚀 Memulai perbandingan model untuk {label}...")
+        with stage(f'compare_{suffix}', rows=len(data_input)) as compare_info:
+            best_model = api.compare_models(budget_time=budget_minutes, n_select=n_select)
+        with stage(f'pull_{suffix}'):
+            comparison_table = api.pull()
+        n_folds = api.get_config('fold_generator').get_n_splits()
+
+    if compare_info is not None:
+        # compare_models tidak mengekspos waktu per estimator; turunkan dari 'TT (Sec)'
+        record_comparison_estimates(comparison_table, compare_info['start'], n_folds)
+
+    if isinstance(best_model, list):
+        # compare_models(n_select > 1) mengembalikan daftar model sesuai urutan tabel
+        fitted_models = dict(zip(comparison_table.index, best_model))
+        best_model = best_model[0]
 
     print(f"✅ Model terbaik ditemukan: {type(best_model).__name__}")
+
+    # Posisi baris holdout `setup()` di `data_input`: pipeline pemenang tidak dilatih
+    # pada baris ini, sehingga analisis kepentingan fitur (explain.py) bisa out-of-sample
+    positions = holdout_positions(data_input, api.get_config('X_test').index)
+    if positions is not None:
+        comparison_table.attrs['holdout_rows'] = positions
+    else:
+        print("⚠️ Baris holdout setup() tidak cocok dengan indeks data; "
+              "analisis kepentingan fitur akan memakai sampel data penuh (in-sample).")
+
+    # Simpan snapshot run ini sebagai acuan mode inkremental berikutnya
+    if incremental_dir:
+        save_state(incremental_dir, data_input, comparison_table,
+                   fitted_models or {comparison_table.index[0]: best_model})
+
+    # Simpan tabel perbandingan & pipeline terbaik ke cache untuk run berikutnya
+    if cache is not None:
+        cache.store(cache_key, comparison_table,
+                    lambda path: api.save_model(best_model, path, verbose=False))
+
+    # Simpan pipeline pemenang (pra-pemrosesan + model) untuk layanan prediksi
+    if model_output:
+        api.save_model(best_model, model_output, verbose=False)
+        write_model_metadata(model_output, data_input, target_column, problem_type, comparison_table)
+        print(f"💾 Pipeline terbaik disimpan ke '{model_output}.pkl'")
+    return comparison_table
+
+def train_model_out_of_core(data_path: str, problem_type: str, target_column: str,
+                            columns: list = None, memory_limit_mb: float = 512,
+                            chunksize: int = DEFAULT_CHUNKSIZE, session_id: int = 123,
+                            budget_seconds: float = None, model_output: str = None):
+    """
+    Padanan `train_model` untuk data yang tidak muat di memori: file dibaca per
+    chunk dan hanya learner inkremental yang dibandingkan (lihat out_of_core.py).
+    Memori kerja data dibatasi `memory_limit_mb`. Cache hasil tidak dipakai karena
+    sidik jari data membutuhkan seluruh DataFrame.
+    """
+    print(f"🎯 Kolom Target: {target_column}")
+    print(f"🧠 Jenis Masalah: {problem_type}")
+    print(f"\n🚀 Memulai pelatihan out-of-core (batas memori {memory_limit_mb:.0f} MB)...")
+
+    # Impor tertunda: out_of_core.py bergantung pada scikit-learn
+    from out_of_core import out_of_core_compare
+
+    best_model, comparison_table = out_of_core_compare(
+        data_path, problem_type, target_column, columns=columns,
+        memory_limit_mb=memory_limit_mb, chunksize=chunksize,
+        session_id=session_id, budget_seconds=budget_seconds
+    )
+    print(f"✅ Model terbaik ditemukan: {comparison_table.iloc[0]['Model']}")
+
+    if model_output:
+        import joblib  # format yang sama dengan `save_model` PyCaret (<path>.pkl)
+
+        joblib.dump(best_model, model_output + '.pkl')
+        # Metadata hanya membutuhkan nama kolom; cukup kerangka DataFrame kosong
+        header = pd.DataFrame(columns=[*best_model.named_steps['encoder'].features, target_column])
+        write_model_metadata(model_output, header, target_column, problem_type, comparison_table)
+        print(f"💾 Pipeline terbaik disimpan ke '{model_output}.pkl'")
     return comparison_table
 
 # ------------------------------------------------------------------------------
 # BAGIAN 3: FUNGSI UNTUK MEMBUAT LAPORAN (VERSI OFFLINE TANPA AI)
 # ------------------------------------------------------------------------------
-def generate_offline_report(comparison_table: pd.DataFrame, problem_type: str):
+def generate_offline_report(comparison_table: pd.DataFrame, problem_type: str,
+                            output_path: str = 'laporan_analisis_otomatis.md',
+                            performance: pd.DataFrame = None, formats: tuple = ('md',),
+                            explanation: dict = None):
     """
     Fungsi ini membuat laporan template berdasarkan hasil dari PyCaret.
-    Tidak memerlukan koneksi ke API AI.
+    Tidak memerlukan koneksi ke API AI. Laporan disimpan ke `output_path`
+    (ekstensi diganti sesuai `formats`: md, html, json) lewat report_engine.py;
+    bagian yang isiannya tidak berubah sejak render sebelumnya tidak dirender ulang.
+    `performance` (ringkasan `Tracer.summary()`) menambahkan bagian performa dan
+    `explanation` (hasil `explain_model`) menambahkan tabel kepentingan fitur.
     """
     print("🤖 Membuat laporan analisis otomatis (mode offline)...")
 
-    # Ambil informasi dari baris pertama (model terbaik)
-    best_model_stats = comparison_table.iloc[0]
-    best_model_name = best_model_stats['Model']
-
-    # Buat template laporan dalam format Markdown
-    md = [f"# Laporan Analisis Pelatihan Model Otomatis\n"]
-    md.append(f"### Proyek: Analisis Data (Jenis Masalah: {problem_type})\n")
-    md.append("---\n")
-
-    # Bagian 1: Analisis Perbandingan Model
-    md.append("## 1. Analisis Perbandingan Model\n")
-    comments = (
-        f"Proses pelatihan otomatis telah selesai dijalankan untuk menemukan model terbaik.\n\n"
-        f"**Wawasan Utama:**\n"
-        f"* **Model Pemenang 🏆:** **{best_model_name}** menunjukkan performa terbaik secara keseluruhan, unggul dalam metrik evaluasi utama.\n"
-        f"* Model-model berbasis *ensemble* (seperti CatBoost, Random Forest, Extra Trees) umumnya menunjukkan performa yang solid, menandakan dataset ini memiliki pola yang cukup kompleks.\n"
-    )
-    md.append(comments)
-
-    # Tambahkan tabel ringkasan 3 model teratas
-    top_3_models = comparison_table.head(3).to_markdown(index=False)
-    md.append("\n**Tabel Ringkasan Performa (3 Model Teratas):**\n")
-    md.append(top_3_models)
-    md.append("\n")
-
-    # Bagian 2: Rincian Pipeline
-    md.append("## 2. Rincian Pipeline Pra-Pemrosesan\n")
-    pipeline_desc = (
-        "Sebelum model dilatih, data mentah telah melalui serangkaian proses persiapan otomatis untuk memastikan kualitasnya, seperti:\n"
-        "- **Imputasi Data:** Mengisi nilai yang hilang secara otomatis.\n"
-        "- **Encoding Kategorikal:** Mengubah data teks menjadi format numerik yang dapat diproses oleh model.\n"
-    )
-    md.append(pipeline_desc)
-    md.append("\n")
-
-    # Bagian 3: Rekomendasi
-    md.append("## 3. Saran dan Rekomendasi Perbaikan\n")
-    suggestions = (
-        f"Model **{best_model_name}** menunjukkan performa yang sangat baik dan dapat menjadi kandidat kuat untuk implementasi.\n\n"
-        f"**Langkah selanjutnya yang direkomendasikan:**\n"
-        f"- **Lakukan *Hyperparameter Tuning*:** Jalankan optimisasi pada model `{best_model_name}` untuk potensi peningkatan akurasi lebih lanjut.\n"
-        f"- **Analisis Kepentingan Fitur:** Gunakan model yang sudah dilatih untuk memahami fitur mana yang paling berpengaruh terhadap prediksi.\n"
-        f"- **Finalisasi Model:** Latih ulang model terbaik pada keseluruhan dataset, lalu simpan untuk digunakan di masa depan.\n"
+    result = default_engine().render(
+        OFFLINE_LAYOUT,
+        {'comparison_table': comparison_table, 'problem_type': problem_type,
+         'performance': performance, 'explanation': explanation},
+        output_path, formats
     )
-    md.append(suggestions)
-
-    # Gabungkan semua bagian menjadi satu string
-    final_report = "\n".join(md)
-
-    # Menyimpan laporan ke file
-    with open('laporan_analisis_otomatis.md', 'w', encoding='utf-8') as f:
-        f.write(final_report)
-
-    print("✅ Laporan analisis berhasil dibuat dan disimpan sebagai 'laporan_analisis_otomatis.md'")
+    saved = ", ".join(f"'{path}'" for path in result['paths'].values())
+    print(f"✅ Laporan analisis berhasil dibuat dan disimpan sebagai {saved}")
+    if result['reused']:
+        print(f"   ♻️ Bagian tidak berubah (tidak dirender ulang): {', '.join(result['reused'])}")
 
+    documents = result['documents']
     return {
         'status': 'sukses',
-        'report': final_report
+        'report': documents.get('md', next(iter(documents.values()))),
+        'path': result['paths'].get('md', next(iter(result['paths'].values()))),
+        'paths': result['paths']
     }
 
 # ------------------------------------------------------------------------------
@@ -126,30 +295,178 @@ def generate_offline_report(comparison_table: pd.DataFrame, problem_type: str):
 # ------------------------------------------------------------------------------
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="AutoML and AI Reporting Tool")
-    parser.add_argument('--data_input', type=str, required=True, help='Path menuju file input CSV.')
+    parser.add_argument('--data_input', type=str, required=True, help='Path menuju file input (CSV, Parquet, atau Arrow).')
     parser.add_argument('--target_column', type=str, required=True, help='Nama kolom target yang akan diprediksi.')
     parser.add_argument('--problem_type', type=str, required=True, choices=["classification", "regression"], help='Tipe masalah machine learning.')
+    parser.add_argument('--cache_dir', type=str, default='.automl_cache', help='Folder cache hasil pelatihan.')
+    parser.add_argument('--cache_max_mb', type=int, default=512, help='Batas ukuran total cache (MB).')
+    parser.add_argument('--no_cache', action='store_true', help='Nonaktifkan cache hasil pelatihan.')
+    parser.add_argument('--search', type=str, default='compare', choices=["compare", "successive-halving", "pruning"], help='Strategi pencarian model.')
+    parser.add_argument('--budget_seconds', type=float, default=None, help='Batas waktu pencarian model (detik).')
+    parser.add_argument('--workers', type=int, default=1, help='Jumlah proses paralel untuk perbandingan model.')
+    parser.add_argument('--incremental', action='store_true', help='Nilai ulang hanya top-N model jika data hanya bertambah baris.')
+    parser.add_argument('--state_dir', type=str, default='.automl_state', help='Folder snapshot untuk mode inkremental.')
+    parser.add_argument('--top_n', type=int, default=3, help='Jumlah model teratas yang dinilai ulang (mode inkremental) atau dipertahankan (mode pruning).')
+    parser.add_argument('--fold_cache', action='store_true', help='Hitung pra-pemrosesan sekali per fold untuk semua kandidat (memory-mapped).')
+    parser.add_argument('--model_output', type=str, default='best_model', help='Path pipeline terbaik (tanpa .pkl) untuk predict_service.py.')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='Jumlah baris per chunk saat membaca CSV.')
+    parser.add_argument('--sample_rows', type=int, default=None, help='Hanya muat sejumlah baris sampel.')
+    parser.add_argument('--sample_method', type=str, default='reservoir', choices=["reservoir", "stratified"], help='Metode sampling baris (stratified memakai kolom target; target numerik kontinu dibagi ke kuantil).')
+    parser.add_argument('--columns', type=str, default=None, help='Daftar kolom fitur dipisah koma (kolom target otomatis ikut dimuat).')
+    parser.add_argument('--snapshot', type=str, default=None, help='Path snapshot .parquet/.arrow untuk input CSV (dibuat jika belum ada).')
+    parser.add_argument('--out_of_core', action='store_true', help='Latih langsung dari file per chunk (data lebih besar dari RAM).')
+    parser.add_argument('--memory_limit_mb', type=float, default=512, help='Batas memori kerja data pada mode out-of-core (MB).')
+    parser.add_argument('--tune', action='store_true', help='Tuning hyperparameter model-model teratas setelah perbandingan.')
+    parser.add_argument('--tune_top_k', type=int, default=3, help='Jumlah model teratas yang di-tuning (bersamaan).')
+    parser.add_argument('--tune_trials', type=int, default=20, help='Jumlah trial per model (trial tersimpan ikut dihitung).')
+    parser.add_argument('--tune_budget_seconds', type=float, default=None, help='Batas waktu tuning (detik).')
+    parser.add_argument('--tune_workers', type=int, default=None, help='Jumlah proses tuning (default: min(top_k, jumlah CPU)).')
+    parser.add_argument('--tune_storage', type=str, default='.automl_tuning.sqlite3', help='File SQLite studi tuning (run terputus dilanjutkan).')
+    parser.add_argument('--explain', action='store_true', help='Hitung permutation importance & atribusi SHAP untuk pipeline terbaik.')
+    parser.add_argument('--explain_rows', type=int, default=1000, help='Jumlah baris sampel untuk analisis kepentingan fitur.')
+    parser.add_argument('--shap_rows', type=int, default=200, help='Jumlah baris sampel yang dihitung atribusi SHAP-nya.')
+    parser.add_argument('--explain_repeats', type=int, default=5, help='Jumlah pengacakan per fitur (permutation importance).')
+    parser.add_argument('--explain_workers', type=int, default=1, help='Jumlah proses paralel untuk permutation importance.')
+    parser.add_argument('--explain_cache_dir', type=str, default='.explain_cache', help='Folder cache hasil analisis kepentingan fitur.')
+    parser.add_argument('--report_output', type=str, default='laporan_analisis_otomatis.md', help='Path laporan (ekstensi diganti per format).')
+    parser.add_argument('--report_formats', type=parse_formats, default=('md',), help='Format laporan dipisah koma: md, html, json.')
+    parser.add_argument('--trace_output', type=str, default='performance_trace.json', help='Path file trace performa (format Chrome Trace JSON).')
 
     args = parser.parse_args()
+    tracer = start_tracing()
 
-    try:
-        df = pd.read_csv(args.data_input)
-    except FileNotFoundError:
-        print(f"❌ Error: File tidak ditemukan di path '{args.data_input}'")
-        exit()
+    # Proyeksi kolom: hanya fitur yang diminta ditambah kolom target
+    columns = None
+    if args.columns:
+        columns = [col.strip() for col in args.columns.split(',') if col.strip()]
+        if args.target_column not in columns:
+            columns.append(args.target_column)
 
-    # Langkah 1: Jalankan workflow data mining dengan PyCaret.
-    comparison_table_result = train_model(
-        data_input=df,
-        problem_type=args.problem_type,
-        target_column=args.target_column
-    )
+    if args.out_of_core:
+        # Langkah 1 (out-of-core): data tidak dimuat ke memori; file dibaca per chunk
+        if not os.path.exists(args.data_input):
+            print(f"❌ Error: File tidak ditemukan di path '{args.data_input}'")
+            exit()
+        with stage('train_model'):
+            comparison_table_result = train_model_out_of_core(
+                data_path=args.data_input,
+                problem_type=args.problem_type,
+                target_column=args.target_column,
+                columns=columns,
+                memory_limit_mb=args.memory_limit_mb,
+                chunksize=args.chunksize,
+                budget_seconds=args.budget_seconds,
+                model_output=args.model_output
+            )
+    else:
+        try:
+            with stage('load_data') as load_info:
+                df = load_dataset(
+                    args.data_input,
+                    columns=columns,
+                    snapshot=args.snapshot,
+                    chunksize=args.chunksize,
+                    sample_rows=args.sample_rows,
+                    sample_method=args.sample_method,
+                    stratify_column=args.target_column
+                )
+                load_info['rows'] = len(df)
+        except FileNotFoundError:
+            print(f"❌ Error: File tidak ditemukan di path '{args.data_input}'")
+            exit()
+
+        # Langkah 1: Jalankan workflow data mining dengan PyCaret.
+        # Fold yang dihitung saat pelatihan dipakai ulang oleh tuning (tanpa setup kedua)
+        fold_dir = tempfile.mkdtemp(prefix='folds_') if args.tune else None
+        with stage('train_model', rows=len(df)):
+            comparison_table_result = train_model(
+                data_input=df,
+                problem_type=args.problem_type,
+                target_column=args.target_column,
+                cache_dir=None if args.no_cache else args.cache_dir,
+                cache_max_mb=args.cache_max_mb,
+                search=args.search,
+                budget_seconds=args.budget_seconds,
+                workers=args.workers,
+                incremental=args.incremental,
+                state_dir=args.state_dir,
+                top_n=args.top_n,
+                model_output=args.model_output,
+                fold_cache=args.fold_cache,
+                dataset_name=os.path.abspath(args.data_input),
+                fold_dir=fold_dir
+            )
+
+    # Langkah 1b (opsional): Tuning hyperparameter model-model teratas.
+    if args.tune and args.out_of_core:
+        print("⚠️ --tune belum didukung pada mode out-of-core; tuning dilewati.")
+    elif args.tune:
+        with stage('tune_models', rows=len(df)):
+            comparison_table_result = tune_top_models(
+                args.problem_type, df, args.target_column, comparison_table_result,
+                top_k=args.tune_top_k,
+                n_trials=args.tune_trials,
+                budget_seconds=args.tune_budget_seconds,
+                workers=args.tune_workers,
+                storage_path=args.tune_storage,
+                model_output=args.model_output,
+                fold_dir=fold_dir
+            )
+        shutil.rmtree(fold_dir, ignore_errors=True)
+
+    # Langkah 1c (opsional): Analisis kepentingan fitur pada pipeline terbaik yang tersimpan.
+    explanation = None
+    if args.explain and not args.model_output:
+        print("⚠️ --explain membutuhkan --model_output; analisis kepentingan fitur dilewati.")
+    elif args.explain:
+        with stage('explain_model'):
+            holdout_rows = comparison_table_result.attrs.get('holdout_rows')
+            if holdout_rows is not None and not (len(holdout_rows) and min(holdout_rows) >= 0
+                                                 and max(holdout_rows) < len(df)):
+                # Misal tabel cache lama yang mencatat posisi -1 untuk label yang tidak ditemukan
+                print("⚠️ Posisi baris holdout di tabel tidak valid untuk data ini; memakai data penuh.")
+                holdout_rows = None
+            if args.out_of_core:
+                # Sampel dari baris holdout out-of-core; data lengkap tidak pernah dimuat
+                from out_of_core import holdout_sample
+                explain_data = holdout_sample(args.data_input, args.target_column, columns=columns,
+                                              n_rows=args.explain_rows, chunksize=args.chunksize)
+            elif holdout_rows is not None:
+                explain_data = df.iloc[holdout_rows]
+            else:
+                explain_data = df
+            explanation = explain_model(
+                args.model_output, explain_data, args.target_column, args.problem_type,
+                holdout=args.out_of_core or holdout_rows is not None,
+                background_rows=args.explain_rows,
+                shap_rows=args.shap_rows,
+                n_repeats=args.explain_repeats,
+                workers=args.explain_workers,
+                cache_dir=None if args.no_cache else args.explain_cache_dir
+            )
 
     # Langkah 2: Buat laporan dari hasil data mining (tanpa AI).
+    with stage('generate_offline_report'):
+        output_report_dict = generate_offline_report(
+            comparison_table=comparison_table_result,
+            problem_type=args.problem_type,
+            output_path=args.report_output,
+            formats=args.report_formats,
+            explanation=explanation
+        )
+
+    # Tambahkan bagian performa ke laporan (hanya bagian itu yang dirender ulang)
+    # & simpan trace untuk analisis lanjutan
     output_report_dict = generate_offline_report(
         comparison_table=comparison_table_result,
-        problem_type=args.problem_type
+        problem_type=args.problem_type,
+        output_path=args.report_output,
+        performance=tracer.summary(),
+        formats=args.report_formats,
+        explanation=explanation
     )
+    tracer.write_chrome_trace(args.trace_output)
+    print(f"⏱️ Trace performa disimpan ke '{args.trace_output}'")
 
     # Langkah 3: Tampilkan laporan akhir di terminal.
     if output_report_dict['status'] == 'sukses':
@@ -0,0 +1,642 @@
+# ==============================================================================
+# MESIN LAPORAN: TEMPLATE TERKOMPILASI, RENDER INKREMENTAL, MULTI-FORMAT
+# ==============================================================================
+#
+# TUJUAN:
+# `generate_offline_report` dan `json_to_markdown` dulu menyusun laporan dengan
+# menambahkan string ke list lalu menulis ulang seluruh file ke path yang sama
+# (`laporan_analisis_otomatis.md`), sehingga run yang berjalan bersamaan saling
+# menimpa. Modul ini:
+# - Mendefinisikan laporan sebagai daftar BAGIAN (section). Setiap bagian punya
+#   template Markdown & HTML (`string.Template`, dikompilasi sekali saat modul
+#   dimuat) dan fungsi yang mengambil isian bagian dari input laporan.
+# - Merender Markdown, HTML, dan JSON dalam SATU pass dari isian yang sama.
+# - Render inkremental: setiap bagian punya digest isiannya. Bagian yang
+#   digest-nya sama dengan render sebelumnya (di memori, atau dari file
+#   `<laporan>.sections.json` milik run sebelumnya) tidak dirender ulang.
+#   Contoh: setelah pelatihan, laporan dirender sekali; saat tabel performa
+#   ditambahkan, hanya bagian performa yang dirender ulang.
+# - Path keluaran per job dan penulisan atomik (file sementara unik di folder
+#   yang sama lalu `os.replace`), sehingga pembaca tidak pernah melihat file
+#   setengah jadi dan run bersamaan tidak saling merusak.
+#
+# PEMAKAIAN (uji throughput mode batch):
+#   python report_engine.py --bench 500 --formats md,html,json
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import html
+import hashlib
+import argparse
+import tempfile
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+REPORT_FORMATS = ('md', 'html', 'json')
+STATE_SUFFIX = '.sections.json'
+EXPLANATION_TOP_FEATURES = 10
+# Naikkan jika cara render (`Section._format`, HTML_DOCUMENT) berubah agar fragmen
+# tersimpan dari versi lama tidak dipakai ulang
+TEMPLATE_VERSION = 1
+
+HTML_DOCUMENT = Template("""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { font-family: sans-serif; max-width: 960px; margin: 2em auto; line-height: 1.5; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+.teks { white-space: pre-line; }
+</style>
+</head>
+<body>
+$body
+</body>
+</html>
+""")
+
+
+# ------------------------------------------------------------------------------
+# BAGIAN LAPORAN & FORMAT NILAI
+# ------------------------------------------------------------------------------
+def _scalar(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None  # NaN -> null (JSON valid)
+    return value
+
+
+class Table:
+    """
+    Tabel isian bagian: kolom + baris berisi skalar Python. DataFrame dikonversi
+    sekali per render lalu dipakai untuk digest, Markdown, HTML, dan JSON; jalur
+    `to_html`/`to_json` pandas jauh lebih lambat untuk tabel kecil seperti ini.
+    """
+
+    __slots__ = ('columns', 'rows')
+
+    def __init__(self, frame: pd.DataFrame):
+        self.columns = [str(col) for col in frame.columns]
+        self.rows = [[_scalar(value) for value in row] for row in frame.to_numpy(dtype=object).tolist()]
+
+    def to_markdown(self) -> str:
+        from tabulate import tabulate  # dependensi `DataFrame.to_markdown`
+        return tabulate(self.rows, headers=self.columns, tablefmt='pipe')
+
+    def to_html(self) -> str:
+        def cell(value):
+            if value is None:
+                return '-'
+            return html.escape(format(value, 'g') if isinstance(value, float) else str(value))
+
+        head = "".join(f"<th>{html.escape(col)}</th>" for col in self.columns)
+        body = "".join("<tr>" + "".join(f"<td>{cell(value)}</td>" for value in row) + "</tr>\n"
+                       for row in self.rows)
+        return f"<table>\n<thead><tr>{head}</tr></thead>\n<tbody>\n{body}</tbody>\n</table>"
+
+
+def _prepare(value):
+    """DataFrame (juga di dalam list/dict) -> `Table`."""
+    if isinstance(value, pd.DataFrame):
+        return Table(value)
+    if isinstance(value, dict):
+        return {key: _prepare(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_prepare(item) for item in value]
+    return value
+
+
+def _jsonable(value):
+    """Isian bagian dalam bentuk yang bisa ditulis ke JSON (juga dipakai untuk digest)."""
+    if isinstance(value, Table):
+        return {'columns': value.columns, 'data': value.rows}
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return _scalar(value)
+
+
+def _digest(fields: dict, template: str = '') -> str:
+    """Sidik isian bagian beserta sumber template-nya dan `TEMPLATE_VERSION`."""
+    payload = json.dumps({'version': TEMPLATE_VERSION, 'template': template, 'fields': _jsonable(fields)},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class Section:
+    """
+    Satu bagian laporan. `context(inputs)` mengembalikan isian template (atau None
+    jika bagian tidak ditampilkan). Isian berupa DataFrame (`Table`) menjadi tabel, list of
+    str menjadi daftar butir, list of dict dirender per item dengan `item_md` /
+    `item_html`, selain itu teks biasa (di-escape untuk HTML).
+    """
+
+    def __init__(self, name: str, md: str, html: str, context, item_md: str = None, item_html: str = None):
+        self.name = name
+        self.context = context
+        self.templates = {'md': Template(md), 'html': Template(html)}
+        self.item_templates = {'md': Template(item_md or ''), 'html': Template(item_html or '')}
+        self.source = "\0".join((md, html, item_md or '', item_html or ''))
+
+    def _format(self, value, fmt: str) -> str:
+        if isinstance(value, Table):
+            return value.to_markdown() if fmt == 'md' else value.to_html()
+        if isinstance(value, list):
+            if value and isinstance(value[0], dict):
+                return ("\n" if fmt == 'md' else "").join(
+                    self.item_templates[fmt].substitute(index=i, **{key: self._format(item, fmt) for key, item in row.items()})
+                    for i, row in enumerate(value, start=1))
+            if fmt == 'md':
+                return "\n".join(f"- {item}" for item in value)
+            return "<ul>" + "".join(f"<li>{html.escape(str(item))}</li>" for item in value) + "</ul>"
+        return str(value) if fmt == 'md' else html.escape(str(value))
+
+    def render(self, fields: dict, fmt: str):
+        if fmt == 'json':
+            return _jsonable(fields)
+        return self.templates[fmt].substitute({key: self._format(value, fmt) for key, value in fields.items()})
+
+
+class Layout:
+    """Urutan bagian sebuah jenis laporan beserta judul dokumennya."""
+
+    def __init__(self, name: str, title: str, sections: list):
+        self.name = name
+        self.title = title
+        self.sections = sections
+
+
+# ------------------------------------------------------------------------------
+# LAYOUT LAPORAN OFFLINE (report.py)
+# ------------------------------------------------------------------------------
+# Input: comparison_table (DataFrame + attrs), problem_type, performance & explanation (opsional)
+def _header(inputs):
+    return {'problem_type': inputs['problem_type']}
+
+
+def _comparison(inputs):
+    table = inputs['comparison_table']
+    return {'best_model_name': table.iloc[0]['Model'], 'top_table': table.head(3)}
+
+
+def _pipeline(inputs):
+    return {}
+
+
+def _search_log(inputs):
+    search_log = inputs['comparison_table'].attrs.get('search_log')
+    return {'table': pd.DataFrame(search_log)} if search_log else None
+
+
+def _pruning(inputs):
+    table = inputs['comparison_table']
+    pruning = table.attrs.get('pruning')
+    if not pruning:
+        return None
+    pruned_models = table[table['Pruned']]
+    return {
+        'top_n': pruning['top_n'],
+        'n_pruned': len(pruned_models),
+        'folds_saved': pruning['folds_saved'],
+        'folds_total': pruning['folds_run'] + pruning['folds_saved'],
+        'table': pruned_models[['Model', 'Folds', pruning['metric']]] if not pruned_models.empty else '',
+    }
+
+
+def _out_of_core(inputs):
+    info = inputs['comparison_table'].attrs.get('out_of_core')
+    if not info:
+        return None
+    table = inputs['comparison_table']
+    fit_seconds = info.get('fit_seconds', {})
+    timing = pd.DataFrame({'Model': table['Model'],
+                           'Per Epoch (Sec)': pd.Series(info.get('fit_seconds_per_epoch', {})),
+                           'Total (Sec)': pd.Series(fit_seconds)}).loc[list(table.index)] if fit_seconds else ''
+    return {**info, 'memory_limit_mb': f"{info['memory_limit_mb']:.0f}", 'table': timing}
+
+
+def _metric_drift(inputs):
+    table = inputs['comparison_table']
+    metric_drift = table.attrs.get('metric_drift')
+    if not metric_drift:
+        return None
+    info = table.attrs.get('incremental', {})
+    return {
+        'new_rows': info.get('new_rows', '?'),
+        'previous_rows': info.get('previous_rows', '?'),
+        'previous_run': info.get('previous_run', '-'),
+        'table': pd.DataFrame(metric_drift),
+    }
+
+
+def _recommendations(inputs):
+    return {'best_model_name': inputs['comparison_table'].iloc[0]['Model']}
+
+
+def _tuning(inputs):
+    tuning = inputs['comparison_table'].attrs.get('tuning')
+    if not tuning or not tuning['results']:
+        return None
+    metric = tuning['metric']
+    table = pd.DataFrame(tuning['results']).drop(columns=['model_id'])
+    table['Parameter'] = [", ".join(f"{key}={value}" for key, value in params.items()) or '(bawaan)'
+                          for params in table['Parameter']]
+    table = table.rename(columns={'Bawaan': f'{metric} Bawaan', 'Tuning': f'{metric} Tuning'}).fillna('-')
+    return {
+        'n_trials': tuning['n_trials'],
+        'storage': tuning['storage'],
+        'saved': (f"Pipeline tersimpan diganti dengan {tuning['saved']} hasil tuning."
+                  if tuning['saved'] else "Pipeline tersimpan tetap memakai model pemenang tanpa tuning."),
+        'table': table,
+    }
+
+
+def _explanation(inputs):
+    explanation = inputs.get('explanation')
+    if not explanation:
+        return None
+    metric = explanation['metric']
+    table = pd.DataFrame(explanation['importance']).head(EXPLANATION_TOP_FEATURES).rename(
+        columns={'Penurunan': f'Penurunan {metric}', 'SHAP': 'SHAP (rata-rata absolut)'})
+    return {
+        'metric': metric,
+        'baseline': explanation['baseline'],
+        'rows': explanation['rows'],
+        'sample': ("baris holdout (tidak dipakai melatih model)" if explanation.get('holdout') else
+                   "baris sampel. PERHATIAN: sampel mencakup baris latih model, sehingga angka ini bersifat "
+                   "in-sample (optimistis) dan tidak sebanding dengan skor cross-validation"),
+        'n_repeats': explanation['n_repeats'],
+        'shap': (f"dihitung dengan {explanation['shap_method']} pada {explanation['shap_rows']} baris sampel"
+                 if explanation['shap_method'] else "tidak tersedia untuk model ini"),
+        'table': table.fillna('-'),
+    }
+
+
+def _performance(inputs):
+    performance = inputs.get('performance')
+    if performance is None:
+        return None
+    return {'table': performance.fillna('-')}
+
+
+OFFLINE_LAYOUT = Layout('offline', 'Laporan Analisis Pelatihan Model Otomatis', [
+    Section('header',
+            "# Laporan Analisis Pelatihan Model Otomatis\n\n"
+            "### Proyek: Analisis Data (Jenis Masalah: $problem_type)\n\n"
+            "---\n",
+            "<h1>Laporan Analisis Pelatihan Model Otomatis</h1>\n"
+            "<h3>Proyek: Analisis Data (Jenis Masalah: $problem_type)</h3>\n<hr>",
+            _header),
+    Section('comparison',
+            "## 1. Analisis Perbandingan Model\n\n"
+            "Proses pelatihan otomatis telah selesai dijalankan untuk menemukan model terbaik.\n\n"
+            "**Wawasan Utama:**\n"
+            "* **Model Pemenang 🏆:** **$best_model_name** menunjukkan performa terbaik secara keseluruhan, unggul dalam metrik evaluasi utama.\n"
+            "* Model-model berbasis *ensemble* (seperti CatBoost, Random Forest, Extra Trees) umumnya menunjukkan performa yang solid, menandakan dataset ini memiliki pola yang cukup kompleks.\n\n"
+            "\n**Tabel Ringkasan Performa (3 Model Teratas):**\n\n"
+            "$top_table\n\n",
+            "<h2>1. Analisis Perbandingan Model</h2>\n"
+            "<p>Proses pelatihan otomatis telah selesai dijalankan untuk menemukan model terbaik.</p>\n"
+            "<p><strong>Wawasan Utama:</strong></p>\n<ul>\n"
+            "<li><strong>Model Pemenang 🏆:</strong> <strong>$best_model_name</strong> menunjukkan performa terbaik secara keseluruhan, unggul dalam metrik evaluasi utama.</li>\n"
+            "<li>Model-model berbasis <em>ensemble</em> (seperti CatBoost, Random Forest, Extra Trees) umumnya menunjukkan performa yang solid, menandakan dataset ini memiliki pola yang cukup kompleks.</li>\n"
+            "</ul>\n<p><strong>Tabel Ringkasan Performa (3 Model Teratas):</strong></p>\n$top_table",
+            _comparison),
+    Section('pipeline',
+            "## 2. Rincian Pipeline Pra-Pemrosesan\n\n"
+            "Sebelum model dilatih, data mentah telah melalui serangkaian proses persiapan otomatis untuk memastikan kualitasnya, seperti:\n"
+            "- **Imputasi Data:** Mengisi nilai yang hilang secara otomatis.\n"
+            "- **Encoding Kategorikal:** Mengubah data teks menjadi format numerik yang dapat diproses oleh model.\n\n",
+            "<h2>2. Rincian Pipeline Pra-Pemrosesan</h2>\n"
+            "<p>Sebelum model dilatih, data mentah telah melalui serangkaian proses persiapan otomatis untuk memastikan kualitasnya, seperti:</p>\n<ul>\n"
+            "<li><strong>Imputasi Data:</strong> Mengisi nilai yang hilang secara otomatis.</li>\n"
+            "<li><strong>Encoding Kategorikal:</strong> Mengubah data teks menjadi format numerik yang dapat diproses oleh model.</li>\n</ul>",
+            _pipeline),
+    Section('search_log',
+            "**Catatan Pencarian (Successive Halving):**\n\n"
+            "Model yang tereliminasi lebih awal hanya dinilai pada sampel data dengan fold yang lebih sedikit.\n\n"
+            "$table\n\n",
+            "<p><strong>Catatan Pencarian (Successive Halving):</strong></p>\n"
+            "<p>Model yang tereliminasi lebih awal hanya dinilai pada sampel data dengan fold yang lebih sedikit.</p>\n$table",
+            _search_log),
+    Section('pruning',
+            "**Catatan Pemangkasan (Pruning):**\n\n"
+            "Kandidat dihentikan jika batas atas optimistis skornya tidak bisa mencapai $top_n model teratas. "
+            "$n_pruned model dipangkas; $folds_saved dari $folds_total fold tidak perlu dijalankan.\n\n"
+            "$table\n\n",
+            "<p><strong>Catatan Pemangkasan (Pruning):</strong></p>\n"
+            "<p>Kandidat dihentikan jika batas atas optimistis skornya tidak bisa mencapai $top_n model teratas. "
+            "$n_pruned model dipangkas; $folds_saved dari $folds_total fold tidak perlu dijalankan.</p>\n$table",
+            _pruning),
+    Section('out_of_core',
+            "**Catatan Pelatihan Out-of-Core:**\n\n"
+            "Data ($rows baris) dibaca per chunk $chunksize baris tanpa dimuat seluruhnya "
+            "(batas memori $memory_limit_mb MB, puncak RSS $peak_rss_mb MB). Model dilatih bertahap selama "
+            "$epochs epoch dan dinilai pada $holdout_rows baris holdout, bukan cross-validation. "
+            "`TT (Sec)` adalah waktu latih per epoch; waktu latih total seluruh epoch per model:\n\n"
+            "$table\n",
+            "<p><strong>Catatan Pelatihan Out-of-Core:</strong></p>\n"
+            "<p>Data ($rows baris) dibaca per chunk $chunksize baris tanpa dimuat seluruhnya "
+            "(batas memori $memory_limit_mb MB, puncak RSS $peak_rss_mb MB). Model dilatih bertahap selama "
+            "$epochs epoch dan dinilai pada $holdout_rows baris holdout, bukan cross-validation. "
+            "<code>TT (Sec)</code> adalah waktu latih per epoch; waktu latih total seluruh epoch per model:</p>\n$table",
+            _out_of_core),
+    Section('metric_drift',
+            "**Pergeseran Metrik (Pelatihan Ulang Inkremental):**\n\n"
+            "Data bertambah $new_rows baris dari $previous_rows baris pada run sebelumnya ($previous_run). "
+            "Hanya model teratas yang dinilai ulang.\n\n"
+            "$table\n\n",
+            "<p><strong>Pergeseran Metrik (Pelatihan Ulang Inkremental):</strong></p>\n"
+            "<p>Data bertambah $new_rows baris dari $previous_rows baris pada run sebelumnya ($previous_run). "
+            "Hanya model teratas yang dinilai ulang.</p>\n$table",
+            _metric_drift),
+    Section('recommendations',
+            "## 3. Saran dan Rekomendasi Perbaikan\n\n"
+            "Model **$best_model_name** menunjukkan performa yang sangat baik dan dapat menjadi kandidat kuat untuk implementasi.\n\n"
+            "**Langkah selanjutnya yang direkomendasikan:**\n"
+            "- **Lakukan *Hyperparameter Tuning*:** Jalankan optimisasi pada model `$best_model_name` untuk potensi peningkatan akurasi lebih lanjut.\n"
+            "- **Analisis Kepentingan Fitur:** Gunakan model yang sudah dilatih untuk memahami fitur mana yang paling berpengaruh terhadap prediksi.\n"
+            "- **Finalisasi Model:** Latih ulang model terbaik pada keseluruhan dataset, lalu simpan untuk digunakan di masa depan.\n",
+            "<h2>3. Saran dan Rekomendasi Perbaikan</h2>\n"
+            "<p>Model <strong>$best_model_name</strong> menunjukkan performa yang sangat baik dan dapat menjadi kandidat kuat untuk implementasi.</p>\n"
+            "<p><strong>Langkah selanjutnya yang direkomendasikan:</strong></p>\n<ul>\n"
+            "<li><strong>Lakukan <em>Hyperparameter Tuning</em>:</strong> Jalankan optimisasi pada model <code>$best_model_name</code> untuk potensi peningkatan akurasi lebih lanjut.</li>\n"
+            "<li><strong>Analisis Kepentingan Fitur:</strong> Gunakan model yang sudah dilatih untuk memahami fitur mana yang paling berpengaruh terhadap prediksi.</li>\n"
+            "<li><strong>Finalisasi Model:</strong> Latih ulang model terbaik pada keseluruhan dataset, lalu simpan untuk digunakan di masa depan.</li>\n</ul>",
+            _recommendations),
+    Section('tuning',
+            "\n**Hasil Hyperparameter Tuning:**\n\n"
+            "Hingga $n_trials trial per model (studi tersimpan di `$storage`); trial yang rata-rata fold-nya di bawah "
+            "median trial lain dipangkas lebih awal. Skor bawaan = parameter bawaan pada fold yang sama. $saved\n\n"
+            "$table\n",
+            "<p><strong>Hasil Hyperparameter Tuning:</strong></p>\n"
+            "<p>Hingga $n_trials trial per model (studi tersimpan di <code>$storage</code>); trial yang rata-rata fold-nya di bawah "
+            "median trial lain dipangkas lebih awal. Skor bawaan = parameter bawaan pada fold yang sama. $saved</p>\n$table",
+            _tuning),
+    Section('explanation',
+            "\n**Hasil Analisis Kepentingan Fitur:**\n\n"
+            "Penurunan $metric (skor dasar $baseline) saat nilai satu fitur diacak, rata-rata $n_repeats pengulangan "
+            "pada $rows $sample. Semakin besar penurunannya, semakin bergantung model pada fitur tersebut. "
+            "Atribusi SHAP $shap.\n\n"
+            "$table\n",
+            "<p><strong>Hasil Analisis Kepentingan Fitur:</strong></p>\n"
+            "<p>Penurunan $metric (skor dasar $baseline) saat nilai satu fitur diacak, rata-rata $n_repeats pengulangan "
+            "pada $rows $sample. Semakin besar penurunannya, semakin bergantung model pada fitur tersebut. "
+            "Atribusi SHAP $shap.</p>\n$table",
+            _explanation),
+    Section('performance',
+            "\n## 4. Performa Eksekusi\n\n"
+            "Waktu dan memori setiap tahap pipeline pada run ini. Hanya baris bertanda *(estimasi)* yang diturunkan dari "
+            "kolom `TT (Sec)` PyCaret (`TT (Sec)` x jumlah fold, tanpa CPU/RSS) karena `compare_models()` tidak mengekspos "
+            "waktu per estimator; baris lainnya, termasuk estimator dari fold cache, pruning, dan pencarian paralel, "
+            "diukur langsung.\n\n"
+            "$table\n",
+            "<h2>4. Performa Eksekusi</h2>\n"
+            "<p>Waktu dan memori setiap tahap pipeline pada run ini. Hanya baris bertanda <em>(estimasi)</em> yang diturunkan dari "
+            "kolom <code>TT (Sec)</code> PyCaret (<code>TT (Sec)</code> x jumlah fold, tanpa CPU/RSS) karena <code>compare_models()</code> "
+            "tidak mengekspos waktu per estimator; baris lainnya, termasuk estimator dari fold cache, pruning, dan pencarian "
+            "paralel, diukur langsung.</p>\n$table",
+            _performance),
+])
+
+
+# ------------------------------------------------------------------------------
+# LAYOUT LAPORAN AI (automatic_ml_reporting.py / llm_reporting.py)
+# ------------------------------------------------------------------------------
+# Input: analysis (dict JSON hasil tool `describe_training_job`)
+def _ai_comparison(inputs):
+    return {'comments': inputs['analysis'].get('comparison_breakdown', {}).get('comments', 'Tidak ada komentar.')}
+
+
+def _ai_pipeline(inputs):
+    steps = inputs['analysis'].get('pipeline_breakdown', {}).get('steps', [])
+    return {'steps': [{'name': step.get('name', 'Tanpa Nama'),
+                       'type': step.get('type', 'Tidak diketahui'),
+                       'description': step.get('description', 'Tidak ada deskripsi.')} for step in steps]
+            or 'Tidak ada rincian pipeline.'}
+
+
+def _ai_suggestions(inputs):
+    improvements = inputs['analysis'].get('model_suggestions', {}).get('improvements', [])
+    return {'improvements': [str(item) for item in improvements] or 'Tidak ada saran perbaikan.'}
+
+
+AI_LAYOUT = Layout('ai', 'Laporan Analisis Pelatihan Model Otomatis', [
+    Section('header',
+            "# Laporan Analisis Pelatihan Model Otomatis\n",
+            "<h1>Laporan Analisis Pelatihan Model Otomatis</h1>",
+            lambda inputs: {}),
+    Section('comparison',
+            "## 1. Analisis Perbandingan Model\n\n$comments\n",
+            "<h2>1. Analisis Perbandingan Model</h2>\n<p class=\"teks\">$comments</p>",
+            _ai_comparison),
+    Section('pipeline',
+            "## 2. Rincian Pipeline Pra-Pemrosesan\n\n$steps\n",
+            "<h2>2. Rincian Pipeline Pra-Pemrosesan</h2>\n$steps",
+            _ai_pipeline,
+            item_md="### Langkah $index: $name\n- **Tipe:** $type\n- **Deskripsi:** $description\n",
+            item_html="<h3>Langkah $index: $name</h3>\n<ul><li><strong>Tipe:</strong> $type</li>"
+                      "<li><strong>Deskripsi:</strong> $description</li></ul>\n"),
+    Section('suggestions',
+            "## 3. Saran dan Rekomendasi Perbaikan\n\n$improvements",
+            "<h2>3. Saran dan Rekomendasi Perbaikan</h2>\n$improvements",
+            _ai_suggestions),
+])
+
+
+# ------------------------------------------------------------------------------
+# MESIN RENDER
+# ------------------------------------------------------------------------------
+def write_atomic(path: str, text: str):
+    """Menulis ke file sementara unik di folder yang sama lalu `os.replace` (atomik)."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def output_paths(output_path: str, formats) -> dict:
+    """`laporan.md` -> {'md': 'laporan.md', 'html': 'laporan.html', 'json': 'laporan.json'}."""
+    base, extension = os.path.splitext(output_path)
+    if extension.lstrip('.') not in REPORT_FORMATS:
+        base = output_path
+    return {fmt: f"{base}.{fmt}" for fmt in formats}
+
+
+class ReportEngine:
+    """
+    Merender layout laporan ke beberapa format dan menyimpan fragmen per bagian
+    (beserta digest isiannya) agar render berikutnya hanya mengerjakan bagian
+    yang berubah. Fragmen disimpan di memori per path laporan dan, jika
+    `persist` aktif, di `<laporan>.sections.json` untuk run berikutnya.
+    """
+
+    def __init__(self, persist: bool = True):
+        self.persist = persist
+        self._fragments = {}
+        self.stats = {'rendered': 0, 'reused': 0}
+
+    def _state_path(self, paths: dict) -> str:
+        return os.path.splitext(next(iter(paths.values())))[0] + STATE_SUFFIX
+
+    def _previous(self, layout: Layout, state_path: str) -> dict:
+        key = (layout.name, state_path)
+        if key not in self._fragments and self.persist and os.path.exists(state_path):
+            try:
+                with open(state_path, encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('layout') == layout.name:
+                    self._fragments[key] = state['sections']
+            except (OSError, ValueError, KeyError):
+                pass  # state rusak: render ulang semua bagian
+        return self._fragments.get(key, {})
+
+    def render(self, layout: Layout, inputs: dict, output_path: str = None, formats=('md',)) -> dict:
+        """
+        Merender semua bagian layout (hanya yang isiannya berubah) ke `formats`.
+
+        Args:
+            layout (Layout): Susunan laporan (`OFFLINE_LAYOUT` / `AI_LAYOUT`).
+            inputs (dict): Input yang dibaca fungsi context setiap bagian.
+            output_path (str): Path laporan; ekstensi diganti per format. None
+                berarti hanya render ke memori.
+            formats (tuple): Subset dari `REPORT_FORMATS`.
+
+        Returns:
+            dict: documents (teks per format), paths, rendered & reused (nama bagian).
+        """
+        formats = tuple(formats)
+        unknown = set(formats) - set(REPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Format laporan tidak dikenal: {sorted(unknown)}. Pilih dari {REPORT_FORMATS}.")
+        paths = output_paths(output_path, formats) if output_path else {}
+        state_path = self._state_path(paths) if paths else None
+        previous = self._previous(layout, state_path) if state_path else {}
+
+        fragments, rendered, reused = {}, [], []
+        for section in layout.sections:
+            fields = section.context(inputs)
+            if fields is None:
+                continue
+            fields = _prepare(fields)
+            digest = _digest(fields, section.source)
+            cached = previous.get(section.name)
+            if cached and cached['digest'] == digest and all(fmt in cached for fmt in formats):
+                fragments[section.name] = cached
+                reused.append(section.name)
+            else:
+                fragments[section.name] = {'digest': digest, **{fmt: section.render(fields, fmt) for fmt in formats}}
+                rendered.append(section.name)
+        self.stats['rendered'] += len(rendered)
+        self.stats['reused'] += len(reused)
+
+        documents = {}
+        if 'md' in formats:
+            documents['md'] = "\n".join(fragment['md'] for fragment in fragments.values())
+        if 'html' in formats:
+            body = "\n".join(fragment['html'] for fragment in fragments.values())
+            documents['html'] = HTML_DOCUMENT.substitute(title=html.escape(layout.title), body=body)
+        if 'json' in formats:
+            documents['json'] = json.dumps({'layout': layout.name, 'title': layout.title,
+                                            'sections': {name: fragment['json'] for name, fragment in fragments.items()}},
+                                           indent=2, ensure_ascii=False, default=str)
+
+        if state_path:
+            self._fragments[(layout.name, state_path)] = fragments
+            for fmt, path in paths.items():
+                write_atomic(path, documents[fmt])
+            if self.persist:
+                write_atomic(state_path, json.dumps({'layout': layout.name, 'sections': fragments},
+                                                    ensure_ascii=False, default=str))
+        return {'documents': documents, 'paths': paths, 'rendered': rendered, 'reused': reused}
+
+    def render_many(self, jobs: list, formats=('md',)) -> list:
+        """Mode batch: `jobs` berisi tuple (layout, inputs, output_path)."""
+        return [self.render(layout, inputs, output_path, formats) for layout, inputs, output_path in jobs]
+
+
+_DEFAULT_ENGINE = None
+
+
+def default_engine() -> ReportEngine:
+    """Mesin bersama per proses, sehingga fragmen dipakai ulang antar pemanggilan."""
+    global _DEFAULT_ENGINE
+    if _DEFAULT_ENGINE is None:
+        _DEFAULT_ENGINE = ReportEngine()
+    return _DEFAULT_ENGINE
+
+
+def parse_formats(value: str) -> tuple:
+    """'md,html' -> ('md', 'html') untuk argumen CLI."""
+    formats = tuple(fmt.strip().lower() for fmt in value.split(',') if fmt.strip())
+    unknown = set(formats) - set(REPORT_FORMATS)
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"Format laporan harus kombinasi dari {', '.join(REPORT_FORMATS)}.")
+    return formats
+
+
+# ------------------------------------------------------------------------------
+# BENCHMARK MODE BATCH
+# ------------------------------------------------------------------------------
+def _sample_inputs(i: int, rng: np.random.Generator) -> dict:
+    metrics = ['Accuracy', 'AUC', 'Recall', 'Prec.', 'F1', 'Kappa', 'MCC']
+    table = pd.DataFrame(rng.random((15, len(metrics))).round(4), columns=metrics,
+                         index=[f"m{k}" for k in range(15)])
+    table.insert(0, 'Model', [f"Model {i}-{k}" for k in range(15)])
+    table['TT (Sec)'] = rng.random(15).round(3)
+    performance = pd.DataFrame({'Tahap': ['load_data', 'train_model', 'generate_offline_report'],
+                                'Wall (s)': rng.random(3).round(3)})
+    return {'comparison_table': table.sort_values('Accuracy', ascending=False),
+            'problem_type': 'classification', 'performance': performance}
+
+
+def bench_render(n_reports: int, output_dir: str, formats=REPORT_FORMATS, seed: int = 0) -> dict:
+    """
+    Throughput render batch: pass dingin (semua bagian baru) lalu pass hangat
+    (hanya tabel performa yang berubah).
+    """
+    rng = np.random.default_rng(seed)
+    engine = ReportEngine()
+    jobs = [(OFFLINE_LAYOUT, _sample_inputs(i, rng), os.path.join(output_dir, f"job{i}", 'laporan.md'))
+            for i in range(n_reports)]
+    results = {}
+    for label in ('dingin', 'hangat'):
+        start = time.perf_counter()
+        rendered = engine.render_many(jobs, formats)
+        seconds = time.perf_counter() - start
+        results[label] = {'laporan/detik': round(n_reports / seconds, 1),
+                          'bagian dirender': sum(len(r['rendered']) for r in rendered),
+                          'bagian dipakai ulang': sum(len(r['reused']) for r in rendered)}
+        for _, inputs, _ in jobs:
+            inputs['performance'] = inputs['performance'].assign(**{'Wall (s)': rng.random(3).round(3)})
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark mesin laporan (mode batch)")
+    parser.add_argument('--bench', type=int, default=200, help='Jumlah laporan yang dirender.')
+    parser.add_argument('--formats', type=parse_formats, default=REPORT_FORMATS, help='Format keluaran, misal md,html,json.')
+    parser.add_argument('--output_dir', type=str, default=None, help='Folder keluaran (default: folder sementara).')
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix='report_bench_')
+    for label, stats in bench_render(args.bench, output_dir, args.formats).items():
+        print(f"📄 Pass {label}: {stats}")
+    print(f"📁 Laporan ditulis ke '{output_dir}'")
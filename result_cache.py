@@ -0,0 +1,194 @@
+# ==============================================================================
+# CACHE HASIL PELATIHAN BERBASIS ISI DATA (CONTENT-ADDRESSED CACHE)
+# ==============================================================================
+#
+# TUJUAN:
+# Menghindari menjalankan ulang `setup()` + `compare_models()` jika data, kolom
+# target, jenis masalah, session_id, dan versi PyCaret tidak berubah.
+#
+# CARA KERJA:
+# - Setiap kombinasi input di-hash (isi baris + skema + parameter) menjadi sebuah
+#   "kunci". Kunci ini menjadi nama folder di dalam direktori cache.
+# - Setiap folder berisi tabel perbandingan (`comparison.pkl`) dan pipeline
+#   model terbaik (`best_model.pkl`).
+# - Ukuran total cache dibatasi; entri yang paling lama tidak dipakai (LRU)
+#   dihapus lebih dulu.
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from importlib import metadata
+
+import pandas as pd
+
+CACHE_FORMAT_VERSION = 1
+COMPARISON_FILE = 'comparison.pkl'
+MODEL_NAME = 'best_model'  # PyCaret `save_model` menambahkan ekstensi '.pkl'
+ACCESS_MARKER = '.last_access'
+
+
+def _pycaret_version() -> str:
+    """Membaca versi PyCaret tanpa mengimpor library-nya (impor PyCaret lambat)."""
+    try:
+        return metadata.version('pycaret')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def dataset_fingerprint(data: pd.DataFrame, target_column: str, problem_type: str,
+                        session_id: int, extra: dict = None) -> str:
+    """
+    Menghitung kunci cache (SHA-256) dari isi data dan parameter pelatihan.
+
+    Args:
+        data (pd.DataFrame): Data yang akan dilatih.
+        target_column (str): Nama kolom target.
+        problem_type (str): 'classification' atau 'regression'.
+        session_id (int): Seed yang dipakai oleh `setup()`.
+        extra (dict): Parameter tambahan yang memengaruhi hasil (opsional).
+
+    Returns:
+        str: Kunci cache dalam bentuk heksadesimal.
+    """
+    meta = {
+        'format': CACHE_FORMAT_VERSION,
+        'schema': [[str(col), str(dtype)] for col, dtype in data.dtypes.items()],
+        'target': target_column,
+        'problem_type': problem_type,
+        'session_id': session_id,
+        'pycaret': _pycaret_version(),
+        'extra': extra or {},
+    }
+    digest = hashlib.sha256(json.dumps(meta, sort_keys=True, default=str).encode('utf-8'))
+    # Hash per baris dihitung secara vektorisasi oleh pandas, lalu digabung
+    row_hashes = pd.util.hash_pandas_object(data, index=False).values
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ResultCache:
+    """
+    Cache di disk untuk tabel perbandingan model dan pipeline terbaik,
+    dengan penghapusan LRU berdasarkan batas ukuran total.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def model_path(self, key: str) -> str:
+        """Path pipeline terbaik tanpa ekstensi (format yang dipakai `load_model`)."""
+        return os.path.join(self.entry_path(key), MODEL_NAME)
+
+    def _touch(self, key: str):
+        marker = os.path.join(self.entry_path(key), ACCESS_MARKER)
+        try:
+            with open(marker, 'w', encoding='utf-8') as f:
+                f.write(str(time.time()))
+        except OSError:
+            pass  # entri baru saja dihapus proses lain (evict)
+
+    def _last_access(self, key: str) -> float:
+        for path in (os.path.join(self.entry_path(key), ACCESS_MARKER), self.entry_path(key)):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                continue
+        return 0.0  # entri sudah dihapus proses lain
+
+    def load(self, key: str, require_model: bool = False):
+        """
+        Mengambil tabel perbandingan dari cache.
+
+        Args:
+            key (str): Kunci dari `dataset_fingerprint`.
+            require_model (bool): Anggap entri tidak ada jika pipeline terbaik
+                (`best_model.pkl`) tidak ikut tersimpan.
+
+        Returns:
+            pd.DataFrame | None: Tabel perbandingan, atau None jika tidak ada di cache.
+        """
+        path = os.path.join(self.entry_path(key), COMPARISON_FILE)
+        if not os.path.exists(path):
+            return None
+        if require_model and not os.path.exists(self.model_path(key) + '.pkl'):
+            return None
+        try:
+            comparison_table = pd.read_pickle(path)
+        except FileNotFoundError:
+            return None  # dihapus proses lain setelah pengecekan di atas
+        except Exception as e:
+            # Entri rusak (misal proses terhenti di tengah jalan) dianggap tidak ada
+            print(f"⚠️ Entri cache rusak diabaikan ({key[:12]}): {e}")
+            shutil.rmtree(self.entry_path(key), ignore_errors=True)
+            return None
+        self._touch(key)
+        return comparison_table
+
+    def store(self, key: str, comparison_table: pd.DataFrame, save_model_fn=None):
+        """
+        Menyimpan hasil pelatihan ke cache secara atomik.
+
+        Args:
+            key (str): Kunci dari `dataset_fingerprint`.
+            comparison_table (pd.DataFrame): Tabel perbandingan dari `pull()`.
+            save_model_fn (callable): Fungsi yang menerima path (tanpa ekstensi) dan
+                menyimpan pipeline terbaik ke sana, misal `save_model` PyCaret.
+        """
+        # Tulis ke folder sementara dulu, lalu pindahkan sekaligus agar pembaca
+        # lain tidak pernah melihat entri yang setengah jadi.
+        staging = tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir)
+        try:
+            comparison_table.to_pickle(os.path.join(staging, COMPARISON_FILE))
+            if save_model_fn is not None:
+                save_model_fn(os.path.join(staging, MODEL_NAME))
+            final = self.entry_path(key)
+            if os.path.exists(final):
+                shutil.rmtree(final, ignore_errors=True)
+            try:
+                os.replace(staging, final)
+            except OSError:
+                # Proses lain (misal worker batch_runner) menyimpan kunci yang sama lebih
+                # dulu. Kuncinya berbasis isi, jadi entri yang sudah ada setara: anggap sukses.
+                if not os.path.isdir(final):
+                    raise
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._touch(key)
+        self.evict(keep=key)
+
+    def evict(self, keep: str = None):
+        """Menghapus entri yang paling lama tidak dipakai sampai ukuran cache <= batas."""
+        entries = [name for name in os.listdir(self.cache_dir)
+                   if not name.startswith('.') and os.path.isdir(self.entry_path(name))]
+        sizes = {name: _dir_size(self.entry_path(name)) for name in entries}
+        total = sum(sizes.values())
+        for name in sorted(entries, key=self._last_access):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(self.entry_path(name), ignore_errors=True)
+            total -= sizes[name]
@@ -0,0 +1,148 @@
+# ==============================================================================
+# SERVER STUB PENGGANTI API ANTHROPIC UNTUK UJI OFFLINE
+# ==============================================================================
+#
+# TUJUAN:
+# Menguji backend laporan AI (llm_reporting.py) tanpa koneksi internet dan
+# tanpa API key. Server ini meniru endpoint `POST /v1/messages` dan selalu
+# menjawab dengan blok `tool_use` sesuai skema `pycaret_training_explainer`.
+#
+# SIMULASI KONDISI NYATA:
+# - `--latency`   : jeda setiap respons (detik), untuk melihat efek konkurensi.
+# - `--fail_first`: N permintaan pertama untuk setiap prompt dijawab 529
+#                   (overloaded) agar jalur retry + backoff teruji.
+# - `GET /stats`  : jumlah permintaan yang diterima (untuk memeriksa cache).
+#
+# PEMAKAIAN:
+#   python stub_llm_server.py --port 8765 --latency 0.5 --fail_first 1
+#   python automatic_ml_reporting.py ... --llm_base_url http://127.0.0.1:8765
+#
+# ==============================================================================
+
+import io
+import json
+import time
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+
+def _fake_analysis(prompt: str) -> dict:
+    """Jawaban tiruan yang deterministik, diturunkan dari tabel CSV di dalam prompt."""
+    csv_start = prompt.find('ID,')
+    best_model, n_models = 'model tidak dikenal', 0
+    if csv_start != -1:
+        table = pd.read_csv(io.StringIO(prompt[csv_start:]))
+        n_models = len(table)
+        if n_models:
+            best_model = table.iloc[0]['Model']
+    return {
+        "comparison_breakdown": {
+            "comments": f"[STUB] {best_model} unggul di antara {n_models} model yang dibandingkan."
+        },
+        "pipeline_breakdown": {
+            "steps": [
+                {"name": "imputer", "type": "SimpleImputer", "description": "[STUB] Mengisi nilai kosong."},
+                {"name": "actual_estimator", "type": best_model, "description": "[STUB] Model terbaik."},
+            ]
+        },
+        "model_suggestions": {
+            "improvements": ["[STUB] Lakukan hyperparameter tuning pada model terbaik."]
+        },
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Handler HTTP yang meniru sebagian kecil API Messages."""
+
+    def log_message(self, format, *args):  # jangan kotori output terminal
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/v1/messages':
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        prompt = request['messages'][-1]['content']
+        prompt_id = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+        server = self.server
+        with server.lock:
+            server.stats['requests'] += 1
+            attempts = server.attempts[prompt_id] = server.attempts.get(prompt_id, 0) + 1
+        time.sleep(server.latency)
+
+        if attempts <= server.fail_first:
+            with server.lock:
+                server.stats['failures'] += 1
+            self._send_json(529, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded (stub)"}},
+                            headers={'retry-after': '0'})
+            return
+
+        tool = request['tools'][0]['name']
+        self._send_json(200, {
+            "id": f"msg_stub_{prompt_id[:16]}",
+            "type": "message",
+            "role": "assistant",
+            "model": request['model'],
+            "content": [{"type": "tool_use", "id": f"toolu_stub_{prompt_id[:16]}", "name": tool,
+                         "input": _fake_analysis(prompt)}],
+            "stop_reason": "tool_use",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": 100},
+        })
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, fail_first: int = 0):
+    """
+    Menjalankan server stub di thread latar belakang.
+
+    Args:
+        port (int): Port; 0 berarti dipilih otomatis oleh sistem operasi.
+
+    Returns:
+        tuple: (objek server, base URL). Hentikan dengan `server.shutdown()`.
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.latency = latency
+    server.fail_first = fail_first
+    server.attempts = {}
+    server.stats = {'requests': 0, 'failures': 0}
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Server stub API Anthropic untuk uji offline")
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Alamat server.')
+    parser.add_argument('--port', type=int, default=8765, help='Port server.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Jeda setiap respons (detik).')
+    parser.add_argument('--fail_first', type=int, default=0, help='Jumlah permintaan pertama per prompt yang dijawab 529.')
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.host, args.port, args.latency, args.fail_first)
+    print(f"🧪 Server stub berjalan di {url} (Ctrl+C untuk berhenti)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Modul proyek berada langsung di root repo (tanpa paket)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def diamonds():
+    """Dataset 'diamond' hasil `get_data.py` (dibaca sekali per sesi test)."""
+    return pd.read_csv(os.path.join(ROOT, 'data.csv'))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def workdir(tmp_path_factory):
+    """PyCaret menulis `logs.log` ke folder kerja; jalankan test di folder sementara."""
+    previous = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('workdir'))
+    yield
+    os.chdir(previous)
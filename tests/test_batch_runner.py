@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from batch_runner import REPORT_FILE, TRACE_FILE, read_manifest, run_job, schedule_largest_first, write_index
+
+
+def _manifest(tmp_path, *lines) -> str:
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def test_read_manifest_fills_job_ids_and_skips_comments(tmp_path):
+    path = _manifest(tmp_path,
+                     '# komentar',
+                     '{"data_input": "data/harga.csv", "target_column": "Price", "problem_type": "regression"}',
+                     '',
+                     '{"job_id": "potongan", "data_input": "data.csv", "target_column": "Cut", '
+                     '"problem_type": "classification", "top_n": 3}')
+    jobs = read_manifest(path)
+    assert [job['job_id'] for job in jobs] == ['001-harga-Price', 'potongan']
+    assert jobs[1]['top_n'] == 3
+
+
+@pytest.mark.parametrize('line, message', [
+    ('{"data_input": "data.csv", "problem_type": "regression"}', 'target_column'),
+    ('{"data_input": "data.csv", "target_column": "Price", "problem_type": "clustering"}', 'clustering'),
+])
+def test_read_manifest_rejects_invalid_jobs(tmp_path, line, message):
+    with pytest.raises(ValueError, match=message):
+        read_manifest(_manifest(tmp_path, line))
+
+
+def test_read_manifest_rejects_duplicate_job_ids(tmp_path):
+    line = '{"job_id": "a", "data_input": "data.csv", "target_column": "Price", "problem_type": "regression"}'
+    with pytest.raises(ValueError, match='ganda'):
+        read_manifest(_manifest(tmp_path, line, line))
+
+
+def test_schedule_largest_first_puts_missing_files_last(tmp_path):
+    for name, size in (('kecil.csv', 10), ('besar.csv', 1_000)):
+        (tmp_path / name).write_bytes(b'x' * size)
+    jobs = [{'job_id': name, 'data_input': str(tmp_path / name)}
+            for name in ('hilang.csv', 'kecil.csv', 'besar.csv')]
+    assert [job['job_id'] for job in schedule_largest_first(jobs)] == ['besar.csv', 'kecil.csv', 'hilang.csv']
+
+
+def test_run_job_reports_failure_and_still_writes_trace(tmp_path):
+    job = {'job_id': 'hilang', 'data_input': str(tmp_path / 'tidak_ada.csv'), 'target_column': 'Price',
+           'problem_type': 'regression'}
+    summary = run_job(job, str(tmp_path / 'reports'))
+    assert summary['status'] == 'gagal' and summary['error'].startswith('FileNotFoundError')
+    assert summary['metric'] == 'R2' and summary['report'] is None
+    assert os.path.exists(tmp_path / 'reports' / 'hilang' / TRACE_FILE)
+
+
+def test_write_index_links_reports_and_errors(tmp_path):
+    ok = {'job_id': 'a', 'data_input': 'a.csv', 'target_column': 'Price', 'problem_type': 'regression',
+          'status': 'sukses', 'best_model': 'Decision Tree', 'metric': 'R2', 'score': 0.91234,
+          'wall_seconds': 1.5, 'report': str(tmp_path / 'a' / REPORT_FILE), 'error': None}
+    failed = {**ok, 'job_id': 'b', 'status': 'gagal', 'best_model': None, 'score': None, 'report': None,
+              'error': 'FileNotFoundError: b.csv'}
+    md_path = write_index([ok, failed], str(tmp_path))
+    with open(md_path, encoding='utf-8') as f:
+        md = f.read()
+    assert '1 dari 2 job berhasil' in md
+    assert f"[{REPORT_FILE}](a/{REPORT_FILE})" in md and 'R2 = 0.9123' in md
+    assert 'FileNotFoundError: b.csv' in md
+    with open(tmp_path / 'index.json', encoding='utf-8') as f:
+        assert [s['job_id'] for s in json.load(f)] == ['a', 'b']
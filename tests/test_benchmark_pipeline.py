@@ -0,0 +1,35 @@
+from benchmark_pipeline import flag_regressions
+
+
+def _run(**overrides):
+    run = {'rows': 6000, 'problem_type': 'classification', 'workers': 1, 'search': 'compare',
+           'budget_seconds': None, 'wall_seconds': 10.0, 'peak_mb': 500.0, 'metric': 'Accuracy',
+           'score': 0.80, 'status': 'sukses'}
+    run.update(overrides)
+    return run
+
+
+def test_new_case_has_no_baseline():
+    runs = [_run(workers=2)]
+    assert flag_regressions(runs, [_run()]) == []
+    assert runs[0]['vs_baseline'] == 'baru'
+
+
+def test_within_tolerance_is_ok():
+    runs = [_run(wall_seconds=11.5, peak_mb=590.0, score=0.795)]
+    assert flag_regressions(runs, [_run()]) == []
+    assert runs[0]['vs_baseline'] == 'ok'
+
+
+def test_flags_time_memory_and_metric_regressions():
+    runs = [_run(wall_seconds=13.0, peak_mb=650.0, score=0.75)]
+    problems = flag_regressions(runs, [_run()])
+    assert len(problems) == 3
+    assert runs[0]['vs_baseline'].startswith('waktu 10.0 -> 13.0 s')
+    assert 'memori 500.0 -> 650.0 MB' in runs[0]['vs_baseline']
+    assert 'Accuracy 0.8000 -> 0.7500' in runs[0]['vs_baseline']
+
+
+def test_flags_failed_run_and_skips_missing_values():
+    runs = [_run(status='gagal', score=None, peak_mb=None)]
+    assert flag_regressions(runs, [_run()]) == ["6000 baris / classification / 1 worker: run gagal"]
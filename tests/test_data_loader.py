@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+from data_loader import (MAX_STRATA, NA_STRATUM, _Reservoir, _sample_frame, _strata, _strata_edges,
+                         iter_chunks, load_columnar, load_csv, load_dataset, write_snapshot)
+
+
+def _offer_in_chunks(reservoir: _Reservoir, n_rows: int, chunksize: int):
+    frame = pd.DataFrame({'value': np.arange(n_rows)})
+    for start in range(0, n_rows, chunksize):
+        reservoir.offer(frame.iloc[start:start + chunksize])
+    return reservoir.result()
+
+
+def test_reservoir_keeps_everything_when_small():
+    result = _offer_in_chunks(_Reservoir(50, np.random.default_rng(0)), 30, 7)
+    assert sorted(result['value']) == list(range(30))
+
+
+def test_reservoir_returns_unique_rows_of_requested_size():
+    result = _offer_in_chunks(_Reservoir(100, np.random.default_rng(0)), 5_000, 333)
+    assert len(result) == 100
+    assert result.index.is_unique
+    assert (result['value'] == result.index).all()
+
+
+def test_reservoir_is_uniform():
+    # Setiap baris seharusnya terpilih dengan peluang size / n
+    hits = np.zeros(200)
+    for seed in range(300):
+        result = _offer_in_chunks(_Reservoir(20, np.random.default_rng(seed)), 200, 37)
+        hits[result['value'].to_numpy()] += 1
+    first_half, second_half = hits[:100].mean(), hits[100:].mean()
+    assert first_half == pytest.approx(30, rel=0.15)
+    assert second_half == pytest.approx(30, rel=0.15)
+
+
+def test_strata_bins_continuous_columns_and_keeps_nan():
+    values = pd.Series(np.r_[np.linspace(0, 1, 1_000), np.nan])
+    edges = _strata_edges(values.value_counts(dropna=False))
+    assert edges is not None and len(edges) <= MAX_STRATA - 1
+    keys = _strata(values, edges)
+    assert keys.iloc[-1] == NA_STRATUM
+    assert keys.iloc[:-1].nunique() == len(edges) + 1
+
+
+def test_strata_keeps_labels_for_categorical_columns():
+    values = pd.Series(['a', 'b', None, 'a'])
+    assert _strata_edges(values.value_counts(dropna=False)) is None
+    assert list(_strata(values, None)) == ['a', 'b', NA_STRATUM, 'a']
+
+
+def test_stratified_csv_sample_keeps_class_ratio(diamonds, tmp_path):
+    data = diamonds.copy()
+    data.loc[data.sample(300, random_state=1).index, 'Cut'] = np.nan
+    path = tmp_path / 'nan.csv'
+    data.to_csv(path, index=False)
+    sample = load_csv(str(path), chunksize=700, sample_rows=600, sample_method='stratified',
+                      stratify_column='Cut', verbose=False)
+    assert len(sample) == pytest.approx(600, abs=5)
+    assert sample['Cut'].isna().sum() == 30
+    expected = data['Cut'].value_counts(normalize=True)
+    observed = sample['Cut'].value_counts(normalize=True)
+    assert (observed - expected).abs().max() < 0.01
+
+
+def test_stratified_csv_sample_on_regression_target(diamonds, tmp_path):
+    path = tmp_path / 'data.csv'
+    diamonds.to_csv(path, index=False)
+    sample = load_csv(str(path), chunksize=700, sample_rows=600, sample_method='stratified',
+                      stratify_column='Price', verbose=False)
+    assert len(sample) == pytest.approx(600, abs=MAX_STRATA)
+    assert sample['Price'].median() == pytest.approx(diamonds['Price'].median(), rel=0.05)
+
+
+def test_in_memory_stratified_sample(diamonds):
+    sample = _sample_frame(diamonds, 600, 'stratified', 'Price', seed=123)
+    assert len(sample) == pytest.approx(600, abs=MAX_STRATA)
+
+
+def test_iter_chunks_row_ids_are_global(diamonds, tmp_path):
+    path = tmp_path / 'data.csv'
+    diamonds.head(250).to_csv(path, index=False)
+    chunks = list(iter_chunks(str(path), chunksize=100))
+    assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+    assert list(chunks[-1].index) == list(range(200, 250))
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.arrow'])
+def test_snapshot_round_trip_keeps_types_and_projects_columns(diamonds, tmp_path, extension):
+    pytest.importorskip('pyarrow')
+    data = diamonds.head(300).astype({'Cut': 'category'})
+    path = str(tmp_path / f'data{extension}')
+    write_snapshot(data, path)
+    pd.testing.assert_frame_equal(load_columnar(path, verbose=False), data)
+    projected = load_columnar(path, columns=['Cut', 'Price'], verbose=False)
+    assert list(projected.columns) == ['Cut', 'Price'] and projected['Cut'].dtype == 'category'
+
+
+def test_csv_snapshot_is_written_then_reused(diamonds, tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    csv_path, snapshot = str(tmp_path / 'data.csv'), str(tmp_path / 'data.parquet')
+    diamonds.head(300).to_csv(csv_path, index=False)
+    first = load_dataset(csv_path, snapshot=snapshot, verbose=False)
+    assert os.path.exists(snapshot)
+
+    def no_csv(*args, **kwargs):
+        raise AssertionError('CSV dibaca ulang padahal snapshot masih baru')
+
+    monkeypatch.setattr(data_loader, 'load_csv', no_csv)
+    pd.testing.assert_frame_equal(load_dataset(csv_path, snapshot=snapshot, verbose=False), first)
+    projected = load_dataset(csv_path, snapshot=snapshot, columns=['Carat Weight', 'Price'], verbose=False)
+    assert list(projected.columns) == ['Carat Weight', 'Price']
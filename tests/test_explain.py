@@ -0,0 +1,78 @@
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.tree import DecisionTreeRegressor
+
+from explain import _saabas_tree, explain_model
+from predict_service import META_SUFFIX
+
+
+def _data(n_rows: int = 400) -> pd.DataFrame:
+    """Target hanya bergantung pada `sinyal` dan `warna`; `derau` tidak berpengaruh."""
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'sinyal': rng.normal(size=n_rows), 'derau': rng.normal(size=n_rows),
+                         'warna': rng.choice(['merah', 'biru'], size=n_rows)})
+    data['y'] = 3 * data['sinyal'] + np.where(data['warna'] == 'merah', 1.0, 0.0)
+    return data
+
+
+def _save(tmp_path, model) -> str:
+    data = _data()
+    encode = ColumnTransformer([('angka', 'passthrough', ['sinyal', 'derau']),
+                                ('kategori', OneHotEncoder(sparse_output=False), ['warna'])],
+                               verbose_feature_names_out=False)
+    pipeline = Pipeline([('encode', encode), ('model', model)]).fit(data.drop(columns='y'), data['y'])
+    base = str(tmp_path / 'best_model')
+    joblib.dump(pipeline, base + '.pkl')
+    with open(base + META_SUFFIX, 'w', encoding='utf-8') as f:
+        json.dump({'features': ['sinyal', 'derau', 'warna']}, f)
+    return base
+
+
+def test_linear_model_ranks_signal_first(tmp_path):
+    base = _save(tmp_path, LinearRegression())
+    result = explain_model(base, _data(), 'y', 'regression', n_repeats=3, cache_dir=None)
+    importance = {row['Fitur']: row for row in result['importance']}
+    assert result['importance'][0]['Fitur'] == 'sinyal'
+    assert result['shap_method'] == 'SHAP linear' and result['baseline'] == pytest.approx(1.0)
+    assert importance['derau']['Penurunan'] == pytest.approx(0.0, abs=1e-3)
+    # Kolom one-hot `warna_*` dijumlahkan kembali ke kolom aslinya
+    assert importance['warna']['SHAP'] == pytest.approx(0.5, abs=0.05)
+    assert importance['sinyal']['SHAP'] > importance['warna']['SHAP'] > importance['derau']['SHAP']
+
+
+def test_results_are_cached_by_model_and_sample(tmp_path, capsys):
+    base = _save(tmp_path, DecisionTreeRegressor(max_depth=4, random_state=0))
+    cache_dir = str(tmp_path / 'cache')
+    first = explain_model(base + '.pkl', _data(), 'y', 'regression', n_repeats=2, cache_dir=cache_dir)
+    assert first['shap_method'] == 'aproksimasi jalur pohon (Saabas)'
+    capsys.readouterr()
+    assert explain_model(base, _data(), 'y', 'regression', n_repeats=2, cache_dir=cache_dir) == first
+    assert 'diambil dari cache' in capsys.readouterr().out
+    explain_model(base, _data(), 'y', 'regression', n_repeats=3, cache_dir=cache_dir)
+    assert 'diambil dari cache' not in capsys.readouterr().out
+
+
+def test_saabas_contributions_sum_to_prediction():
+    data = _data()
+    X = data[['sinyal', 'derau']].to_numpy()
+    tree = DecisionTreeRegressor(max_depth=5, random_state=0).fit(X, data['y'])
+    contrib = _saabas_tree(tree, X[:20], classifier=False)
+    root = tree.tree_.value[0, 0, 0]
+    assert contrib.shape == (20, 2, 1)
+    np.testing.assert_allclose(contrib.sum(axis=1)[:, 0] + root, tree.predict(X[:20]))
+
+
+def test_in_sample_data_is_flagged(tmp_path, capsys):
+    base = _save(tmp_path, LinearRegression())
+    assert explain_model(base, _data(), 'y', 'regression', n_repeats=1, cache_dir=None)['holdout'] is False
+    assert 'in-sample' in capsys.readouterr().out
+    assert explain_model(base, _data(), 'y', 'regression', n_repeats=1, cache_dir=None, holdout=True)['holdout']
+    assert 'in-sample' not in capsys.readouterr().out
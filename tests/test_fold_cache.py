@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+from sklearn.svm import LinearSVC
+
+from fold_cache import fold_cached_compare, quiet_args, score_fold
+
+
+class _Counting(LogisticRegression):
+    """LogisticRegression yang menghitung pemanggilan predict/predict_proba."""
+
+    calls = {'predict': 0, 'predict_proba': 0}
+
+    def predict(self, X):
+        self.calls['predict'] += 1
+        return super().predict(X)
+
+    def predict_proba(self, X):
+        self.calls['predict_proba'] += 1
+        return super().predict_proba(X)
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    return X, (X[:, 0] + rng.normal(scale=0.5, size=200) > 0).astype(int)
+
+
+SCORERS = [('Accuracy', get_scorer('accuracy'), True), ('F1', get_scorer('f1'), True),
+           ('AUC', get_scorer('roc_auc'), True), ('Log Loss', get_scorer('neg_log_loss'), False)]
+
+
+def test_score_fold_matches_scorers_and_predicts_once():
+    X, y = _data()
+    model = _Counting().fit(X, y)
+    _Counting.calls.update(predict=0, predict_proba=0)
+    scores = score_fold(model, X, y, SCORERS)
+    assert _Counting.calls == {'predict': 1, 'predict_proba': 1}
+    for display, scorer, _ in SCORERS:
+        assert np.isclose(scores[display], scorer(LogisticRegression().fit(X, y), X, y))
+
+
+def test_unavailable_metric_scores_zero():
+    X, y = _data()
+    scores = score_fold(LinearSVC(dual=True).fit(X, y), X, y, SCORERS)
+    assert scores['Log Loss'] == 0.0  # LinearSVC tidak punya predict_proba
+    assert scores['Accuracy'] > 0.5
+
+
+def test_quiet_args_only_touches_boosters():
+    class LGBMClassifier:
+        pass
+
+    class CatBoostRegressor:
+        pass
+
+    assert quiet_args(LGBMClassifier, {'n_estimators': 5}) == {'n_estimators': 5, 'verbose': -1}
+    assert quiet_args(CatBoostRegressor, {})['allow_writing_files'] is False
+    assert quiet_args(LogisticRegression, {'C': 1.0}) == {'C': 1.0}
+
+
+def test_sequential_compare_restores_thread_limits(diamonds):
+    pytest.importorskip('pycaret')
+    from threadpoolctl import threadpool_info, threadpool_limits
+
+    fold_cached_compare('regression', diamonds.head(300), 'Price', include=['lr'])  # memuat semua pustaka native
+    with threadpool_limits(limits=3):
+        before = {info['filepath']: info['num_threads'] for info in threadpool_info()}
+        fold_cached_compare('regression', diamonds.head(300), 'Price', workers=1, threads_per_worker=1,
+                            include=['lr', 'dt'])
+        assert {info['filepath']: info['num_threads'] for info in threadpool_info()} == before
@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from incremental import (STATE_FILE, WARM_START_MAX_FACTOR, _warm_start_kwargs, detect_append,
+                         save_state, state_path)
+
+
+@pytest.fixture
+def data(diamonds):
+    return diamonds.head(300)
+
+
+def _table() -> pd.DataFrame:
+    return pd.DataFrame({'Model': ['Decision Tree'], 'R2': [0.8]}, index=['dt'])
+
+
+def test_state_path_is_keyed_on_dataset_and_schema(data, tmp_path):
+    base = state_path(str(tmp_path), 'regression', 'Price', data, dataset_name='/data/a.csv')
+    assert base == state_path(str(tmp_path), 'regression', 'Price', data.head(10), dataset_name='/data/a.csv')
+    assert base != state_path(str(tmp_path), 'regression', 'Price', data, dataset_name='/data/b.csv')
+    assert base != state_path(str(tmp_path), 'regression', 'Price', data.drop(columns='Report'),
+                              dataset_name='/data/a.csv')
+    assert base != state_path(str(tmp_path), 'classification', 'Price', data, dataset_name='/data/a.csv')
+
+
+def test_detect_append_statuses(data, tmp_path):
+    path = str(tmp_path / 'state')
+    assert detect_append(path, data)[0] == 'no-state'
+    save_state(path, data, _table(), {'dt': {'model': 'tiruan'}})
+    assert detect_append(path, data)[0] == 'unchanged'
+    assert detect_append(path, pd.concat([data, data.head(5)]))[0] == 'appended'
+    assert detect_append(path, data.iloc[1:])[0] == 'rewritten'
+    changed = data.copy()
+    changed.loc[0, 'Price'] += 1
+    assert detect_append(path, changed)[0] == 'rewritten'
+    assert detect_append(path, data.drop(columns='Report'))[0] == 'schema-changed'
+
+
+def test_save_state_replaces_previous_snapshot(data, tmp_path):
+    path = str(tmp_path / 'state')
+    save_state(path, data.head(100), _table(), {})
+    save_state(path, data, _table(), {})
+    with open(os.path.join(path, STATE_FILE), encoding='utf-8') as f:
+        state = json.load(f)
+    assert state['n_rows'] == len(data)
+    assert sorted(os.listdir(path)) == sorted([STATE_FILE, state['snapshot']])
+
+
+def test_missing_snapshot_means_no_state(data, tmp_path):
+    path = str(tmp_path / 'state')
+    save_state(path, data, _table(), {})
+    with open(os.path.join(path, STATE_FILE), encoding='utf-8') as f:
+        snapshot = json.load(f)['snapshot']
+    os.rename(os.path.join(path, snapshot), os.path.join(path, 'lain'))
+    assert detect_append(path, data)[0] == 'no-state'
+
+
+def test_warm_start_growth_is_capped(tmp_path):
+    lightgbm = pytest.importorskip('lightgbm')
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(200, 3)), rng.normal(size=200)
+    estimator = lightgbm.LGBMRegressor(n_estimators=20, verbose=-1)
+    model = lightgbm.LGBMRegressor(n_estimators=20, verbose=-1).fit(X, y)
+
+    fit_kwargs, params = _warm_start_kwargs(model, 'lightgbm', str(tmp_path), estimator, n_new=10, n_total=200)
+    assert os.path.exists(fit_kwargs['init_model'])
+    assert params == {'n_estimators': 10}  # minimal MIN_WARM_START_TREES pohon tambahan
+
+    grown = lightgbm.LGBMRegressor(n_estimators=20 * WARM_START_MAX_FACTOR, verbose=-1).fit(X, y)
+    assert _warm_start_kwargs(grown, 'lightgbm', str(tmp_path), estimator, n_new=10, n_total=200) == ({}, {})
+
+
+def test_linear_models_warm_start_from_coefficients():
+    from sklearn.linear_model import SGDRegressor
+
+    rng = np.random.default_rng(0)
+    model = SGDRegressor().fit(rng.normal(size=(50, 3)), rng.normal(size=50))
+    fit_kwargs, params = _warm_start_kwargs(model, 'sgd', '', SGDRegressor(), n_new=5, n_total=55)
+    assert params == {} and np.array_equal(fit_kwargs['coef_init'], model.coef_)
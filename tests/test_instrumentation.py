@@ -0,0 +1,83 @@
+import json
+import time
+
+import pandas as pd
+import pytest
+
+import instrumentation
+from instrumentation import Tracer, record_comparison_estimates, record_event, stage, start_tracing
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Tracer global baru yang dilepas lagi setelah test."""
+    monkeypatch.setattr(instrumentation, '_ACTIVE', None)
+    return start_tracing()
+
+
+def test_stage_measures_wall_cpu_and_rows():
+    tracer = Tracer()
+    with tracer.stage('muat_data') as info:
+        sum(range(200_000))
+        info['rows'] = 1_000
+    [event] = tracer.events
+    assert event['name'] == 'muat_data' and event['rows'] == 1_000
+    assert event['wall'] > 0 and event['cpu'] is not None
+    assert event['rows_per_sec'] == pytest.approx(1_000 / event['wall'])
+    assert event['peak_rss_mb'] > 0
+
+
+def test_stage_records_event_when_block_fails():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.stage('gagal'):
+            raise ValueError('uji')
+    assert [event['name'] for event in tracer.events] == ['gagal']
+
+
+def test_summary_is_ordered_by_start():
+    tracer = Tracer()
+    tracer.add_event('kedua', tracer.epoch + 2, 1.0, rows=10)
+    tracer.add_event('pertama', tracer.epoch + 1, 0.5)
+    summary = tracer.summary()
+    assert list(summary['Tahap']) == ['pertama', 'kedua']
+    assert list(summary.columns) == ['Tahap', 'Wall (s)', 'CPU (s)', 'Puncak RSS (MB)', 'Baris/detik']
+    assert summary.loc[1, 'Baris/detik'] == 10
+
+
+def test_chrome_trace_uses_microseconds(tmp_path):
+    tracer = Tracer()
+    tracer.add_event('latih', tracer.epoch + 0.25, 1.5, cpu=1.2, category='estimator', tid=7, model='dt')
+    path = tmp_path / 'trace.json'
+    tracer.write_chrome_trace(str(path))
+    with open(path, encoding='utf-8') as f:
+        [event] = json.load(f)['traceEvents']
+    assert (event['ph'], event['ts'], event['dur'], event['tid']) == ('X', 250_000, 1_500_000, 7)
+    assert event['args'] == {'cpu_sec': 1.2, 'model': 'dt'}
+
+
+def test_module_helpers_are_noops_without_tracer(monkeypatch):
+    monkeypatch.setattr(instrumentation, '_ACTIVE', None)
+    with stage('diam', rows=5) as info:
+        info['rows'] = 6
+    record_event('diam', time.time(), 1.0)
+    assert instrumentation._ACTIVE is None
+
+
+def test_module_helpers_record_on_active_tracer(tracer):
+    with stage('setup', rows=5):
+        pass
+    record_event('worker', time.time(), 0.5, category='estimator', tid=3)
+    assert [(event['name'], event['category']) for event in tracer.events] == [
+        ('setup', 'stage'), ('worker', 'estimator')]
+    assert tracer.events[1]['tid'] == 3
+
+
+def test_comparison_estimates_scale_tt_by_folds(tracer):
+    table = pd.DataFrame({'Model': ['Tree', 'Linear'], 'TT (Sec)': [0.2, 0.1]}, index=['dt', 'lr'])
+    record_comparison_estimates(table, tracer.epoch, n_folds=10)
+    walls = {event['name']: event['wall'] for event in tracer.events}
+    assert walls == pytest.approx({'dt (estimasi)': 2.0, 'lr (estimasi)': 1.0})
+    # Estimasi tidak disusun seolah berurutan: jalur sendiri, waktu mulai sama
+    assert {event['start'] for event in tracer.events} == {tracer.epoch}
+    assert len({event['tid'] for event in tracer.events}) == 2
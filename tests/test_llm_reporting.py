@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from llm_reporting import AsyncReportBackend, ResponseCache, build_prompt, prompt_key
+
+pytest.importorskip('anthropic')
+
+
+def _table(best: str) -> pd.DataFrame:
+    return pd.DataFrame({'Model': [best, 'Naive Bayes'], 'Accuracy': [0.91234567, 0.5]}, index=['m1', 'nb'])
+
+
+@pytest.fixture
+def stub():
+    from stub_llm_server import start_stub_server
+
+    servers = []
+
+    def start(**kwargs):
+        server, url = start_stub_server(**kwargs)
+        servers.append(server)
+        return server, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def _backend(url: str, cache_dir, **kwargs) -> AsyncReportBackend:
+    return AsyncReportBackend(base_url=url, api_key='stub', cache_dir=str(cache_dir) if cache_dir else None,
+                              backoff_base=0.01, timeout=10, **kwargs)
+
+
+def test_prompt_key_depends_on_prompt_and_model():
+    prompt = build_prompt(_table('Decision Tree'))
+    assert '0.9123' in prompt
+    assert prompt_key(prompt) == prompt_key(build_prompt(_table('Decision Tree')))
+    assert prompt_key(prompt) != prompt_key(build_prompt(_table('Random Forest')))
+    assert prompt_key(prompt) != prompt_key(prompt, model='model-lain')
+
+
+def test_response_cache_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    assert cache.load('abc') is None
+    cache.store('abc', {'hasil': 1})
+    assert cache.load('abc') == {'hasil': 1}
+
+
+def test_retries_transient_errors(stub):
+    server, url = stub(fail_first=2)
+    backend = _backend(url, None, max_retries=3)
+    [result] = backend.describe_tables([_table('Decision Tree')])
+    assert result['status'] == 'sukses'
+    assert 'Decision Tree' in result['analysis']['comparison_breakdown']['comments']
+    assert backend.stats['retries'] == 2 and server.stats['requests'] == 3
+
+
+def test_gives_up_after_max_retries(stub):
+    server, url = stub(fail_first=5)
+    backend = _backend(url, None, max_retries=1)
+    [result] = backend.describe_tables([_table('Decision Tree')])
+    assert result['status'] == 'gagal' and result['analysis'] is None
+    assert server.stats['requests'] == 2
+
+
+def test_identical_tables_share_one_call_and_disk_cache(stub, tmp_path):
+    server, url = stub(latency=0.05)
+    tables = [_table('Decision Tree'), _table('Decision Tree'), _table('Random Forest')]
+    backend = _backend(url, tmp_path)
+    results = backend.describe_tables(tables)
+    assert [result['status'] for result in results] == ['sukses'] * 3
+    assert results[0]['analysis'] == results[1]['analysis']
+    assert server.stats['requests'] == 2 and backend.stats['shared'] == 1
+    assert [result['deduplicated'] for result in results] == [False, True, False]
+    assert not any(result['cached'] for result in results)
+
+    again = _backend(url, tmp_path)
+    results = again.describe_tables(tables)
+    assert all(result['cached'] and not result['deduplicated'] for result in results)
+    assert again.stats['cache_hits'] == 3 and server.stats['requests'] == 2
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from model_search import _sample_rows, build_comparison_table, parallel_compare, successive_halving
+
+
+def test_build_comparison_table_sorts_by_metric():
+    rows = {'lr': {'Model': 'Linear', 'R2': 0.5, 'TT (Sec)': 0.12345},
+            'dt': {'Model': 'Tree', 'R2': 0.8, 'TT (Sec)': 0.5}}
+    table = build_comparison_table(rows, 'R2')
+    assert list(table.index) == ['dt', 'lr']
+    assert table.loc['lr', 'TT (Sec)'] == 0.123
+
+
+def test_sample_rows_keeps_every_class(diamonds):
+    sample = _sample_rows(diamonds, 300, 'Cut', 'classification', 123)
+    assert len(sample) == pytest.approx(300, abs=5)
+    assert set(sample['Cut']) == set(diamonds['Cut'])
+
+
+def test_successive_halving_eliminates_by_rung(diamonds):
+    pytest.importorskip('pycaret')
+    data = diamonds.head(1200)
+    best_model, table = successive_halving('regression', data, 'Price', include=['dt', 'lr', 'ridge', 'en'],
+                                           min_rows=300, min_folds=2, max_folds=3, eta=2)
+    log = {entry['ID']: entry for entry in table.attrs['search_log']}
+    winner = table.index[0]
+    assert log[winner]['Rung'] == 2 and log[winner]['Rows'] == len(data) and log[winner]['Eliminated'] is None
+    eliminated = sorted((entry['Rung'], entry['Eliminated']) for entry in log.values() if entry['Eliminated'])
+    assert eliminated == [(0, 'halving'), (0, 'halving'), (1, 'halving')]
+    assert hasattr(best_model, 'predict')
+
+
+def test_parallel_compare_matches_sequential_scores(diamonds):
+    pytest.importorskip('pycaret')
+    from pycaret.regression import compare_models, pull, setup
+
+    data = diamonds.head(300)
+    best_model, table = parallel_compare('regression', data, 'Price', workers=2, threads_per_worker=1,
+                                         include=['dt', 'lr'])
+    setup(data=data, target='Price', verbose=False, session_id=123)
+    compare_models(include=['dt', 'lr'], verbose=False)
+    expected = pull()
+    assert list(table.index) == list(expected.index)
+    pd.testing.assert_series_equal(table['R2'], expected['R2'], check_dtype=False, atol=1e-4)
+    assert (table['TT (Sec)'] > 0).all()
+    assert hasattr(best_model, 'predict')
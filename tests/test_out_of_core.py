@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from out_of_core import HOLDOUT_FRACTION, holdout_sample, out_of_core_compare
+
+pytest.importorskip('lightgbm')
+
+
+@pytest.fixture(scope='module')
+def csv_path(diamonds, tmp_path_factory):
+    path = tmp_path_factory.mktemp('ooc') / 'data.csv'
+    diamonds.head(2000).to_csv(path, index=False)
+    return str(path)
+
+
+def test_regression_compare_reads_file_in_chunks(csv_path, diamonds):
+    best_model, table = out_of_core_compare(csv_path, 'regression', 'Price', chunksize=1_000, epochs=2)
+    assert set(table.index) == {'sgd', 'pa', 'mlp', 'lightgbm'}
+    assert table['R2'].is_monotonic_decreasing
+    summary = table.attrs['out_of_core']
+    assert summary['rows'] == 2000 and summary['epochs'] == 2 and summary['chunksize'] == 1_000
+    assert summary['holdout_rows'] == pytest.approx(2000 * HOLDOUT_FRACTION, rel=0.1)
+    # Skema tabel sama dengan jalur lain; waktu total per model ada di attrs
+    assert list(table.columns) == ['Model', 'MAE', 'MSE', 'RMSE', 'R2', 'RMSLE', 'MAPE', 'TT (Sec)']
+    for model_id in table.index:
+        assert summary['fit_seconds'][model_id] == pytest.approx(2 * summary['fit_seconds_per_epoch'][model_id], abs=2e-3)
+    predictions = best_model.predict(diamonds.head(20).drop(columns='Price'))
+    assert predictions.shape == (20,) and np.isfinite(predictions).all()
+
+
+def test_classification_compare_respects_include(csv_path, diamonds):
+    best_model, table = out_of_core_compare(csv_path, 'classification', 'Cut', chunksize=1_000, epochs=1,
+                                            include=['sgd', 'nb'])
+    assert set(table.index) == {'sgd', 'nb'}
+    assert table['Accuracy'].between(0, 1).all()
+    assert set(best_model.predict(diamonds.head(50).drop(columns='Cut'))) <= set(diamonds['Cut'])
+
+
+def test_budget_stops_after_first_epoch(csv_path):
+    _, table = out_of_core_compare(csv_path, 'regression', 'Price', chunksize=1_000, epochs=3,
+                                   budget_seconds=1e-6, include=['sgd'])
+    assert table.attrs['out_of_core']['epochs'] == 1
+
+
+def test_holdout_sample_matches_evaluation_split(csv_path):
+    _, table = out_of_core_compare(csv_path, 'regression', 'Price', chunksize=1_000, epochs=1, include=['sgd'])
+    sample = holdout_sample(csv_path, 'Price', n_rows=10_000, chunksize=1_000)
+    assert len(sample) == table.attrs['out_of_core']['holdout_rows']
+    # Pembagian tidak bergantung ukuran chunk
+    pd.testing.assert_frame_equal(holdout_sample(csv_path, 'Price', n_rows=100, chunksize=1_000),
+                                  holdout_sample(csv_path, 'Price', n_rows=100, chunksize=1_500))
@@ -0,0 +1,80 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from predict_service import PREDICTION_COLUMN, MicroBatcher, score_file
+
+FEATURES = ['Carat Weight', 'Cut']
+
+
+class _CaratRule:
+    """Pipeline tiruan: prediksi = 1 jika berat karat > 1."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, frame: pd.DataFrame) -> np.ndarray:
+        self.calls += 1
+        assert list(frame.columns) == FEATURES
+        return (frame['Carat Weight'] > 1).astype(int).to_numpy()
+
+
+def test_scores_csv_in_chunks(diamonds, tmp_path):
+    input_path, output_path = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    diamonds.head(250).to_csv(input_path, index=False)
+    pipeline = _CaratRule()
+    stats = score_file(pipeline, FEATURES, str(input_path), str(output_path), chunksize=100)
+    assert stats['rows'] == 250 and len(stats['chunk_latencies']) == 3 and pipeline.calls == 3
+    output = pd.read_csv(output_path)
+    assert list(output.columns) == [*diamonds.columns, PREDICTION_COLUMN]
+    assert (output[PREDICTION_COLUMN] == (output['Carat Weight'] > 1)).all()
+    assert not os.path.exists(f"{output_path}.tmp")
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.parquet'])
+def test_empty_input_writes_header_only(diamonds, tmp_path, extension):
+    pytest.importorskip('pyarrow')
+    input_path, output_path = tmp_path / f'in{extension}', tmp_path / f'out{extension}'
+    empty = diamonds.head(0)
+    empty.to_csv(input_path, index=False) if extension == '.csv' else empty.to_parquet(input_path)
+    stats = score_file(_CaratRule(), FEATURES, str(input_path), str(output_path))
+    assert stats['rows'] == 0
+    output = pd.read_csv(output_path) if extension == '.csv' else pd.read_parquet(output_path)
+    assert output.empty and list(output.columns) == [*diamonds.columns, PREDICTION_COLUMN]
+
+
+def test_failed_scoring_leaves_no_partial_output(diamonds, tmp_path):
+    input_path, output_path = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    diamonds.head(250).to_csv(input_path, index=False)
+    with pytest.raises(KeyError):
+        score_file(_CaratRule(), ['kolom_tidak_ada'], str(input_path), str(output_path), chunksize=100)
+    assert os.listdir(tmp_path) == ['in.csv']
+
+
+def test_micro_batcher_merges_concurrent_requests():
+    sizes = []
+
+    def predict(frame):
+        sizes.append(len(frame))
+        return frame['x'].to_numpy() * 2
+
+    batcher = MicroBatcher(predict, max_batch_rows=1_000, max_wait_ms=200)
+    start = threading.Barrier(8)
+    results = [None] * 8
+
+    def client(i):
+        start.wait()
+        results[i] = batcher.submit(pd.DataFrame({'x': [i, i]})).result(timeout=10)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+    assert [list(result) for result in results] == [[2 * i, 2 * i] for i in range(8)]
+    assert sum(sizes) == 16 and len(sizes) < 8
+    assert batcher.stats['requests'] == 8
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from pruning import _prune_threshold, _upper_bound
+
+
+def test_threshold_needs_top_n_completed_candidates():
+    assert _prune_threshold([0.9, 0.8], top_n=3) is None
+    assert _prune_threshold([0.7, 0.9, 0.8], top_n=3) == 0.7
+    assert _prune_threshold([0.7, 0.9, 0.8], top_n=1) == 0.9
+
+
+def test_upper_bound_is_mean_plus_z_standard_errors():
+    scores = [0.60, 0.64, 0.62]
+    expected = np.mean(scores) + 2.0 * np.std(scores, ddof=1) / np.sqrt(3)
+    assert _upper_bound(scores, 2.0) == pytest.approx(expected)
+    assert _upper_bound(scores, 0.0) == pytest.approx(np.mean(scores))
+
+
+def test_wider_bound_prunes_less():
+    scores, threshold = [0.60, 0.70, 0.65], 0.70
+    assert _upper_bound(scores, 1.0) < threshold
+    assert _upper_bound(scores, 3.0) > threshold
+
+
+def test_winner_is_refit_with_early_stopped_iterations(diamonds):
+    pytest.importorskip('pycaret')
+    pytest.importorskip('lightgbm')
+    from pruning import pruned_compare
+
+    # Target acak: early stopping berhenti jauh sebelum 100 iterasi bawaan LightGBM
+    data = diamonds.head(600).assign(Price=np.random.default_rng(0).normal(size=600))
+    best_model, table = pruned_compare('regression', data, 'Price', include=['lightgbm'], top_n=1,
+                                       early_stopping_rounds=5)
+    refit = table.attrs['pruning']['refit_iterations']
+    assert 0 < refit < 100
+    assert best_model.n_estimators == refit
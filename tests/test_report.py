@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from report import holdout_positions
+
+
+def test_holdout_positions_follow_index_labels():
+    data = pd.DataFrame({'x': range(5)}, index=[10, 11, 12, 13, 14])
+    np.testing.assert_array_equal(holdout_positions(data, pd.Index([13, 10])), [3, 0])
+
+
+def test_missing_label_gives_no_positions():
+    # `get_indexer` memberi -1 untuk label 99; `iloc[-1]` akan mengambil baris terakhir
+    data = pd.DataFrame({'x': range(5)})
+    assert holdout_positions(data, pd.Index([1, 99])) is None
+    assert holdout_positions(data, pd.Index([])) is None
+    assert holdout_positions(pd.DataFrame({'x': range(3)}, index=[0, 0, 1]), pd.Index([1])) is None
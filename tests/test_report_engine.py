@@ -0,0 +1,76 @@
+import json
+
+import pandas as pd
+import pytest
+
+import report_engine
+from report_engine import Layout, ReportEngine, Section, _digest, output_paths, parse_formats
+
+
+def _layout(greeting: str = 'Halo') -> Layout:
+    return Layout('uji', 'Laporan Uji', [
+        Section('sapaan', f"{greeting} $name\n", f"<p>{greeting} $name</p>",
+                lambda inputs: {'name': inputs['name']}),
+        Section('tabel', "$table\n", "$table", lambda inputs: {'table': inputs['table']}),
+        Section('opsional', "$note\n", "<p>$note</p>",
+                lambda inputs: {'note': inputs['note']} if inputs.get('note') else None),
+    ])
+
+
+def _inputs(name: str = 'dunia', score: float = 0.9) -> dict:
+    return {'name': name, 'table': pd.DataFrame({'Model': ['dt'], 'Accuracy': [score]})}
+
+
+def test_digest_covers_fields_template_and_version(monkeypatch):
+    fields = {'name': 'dunia', 'score': 0.9}
+    base = _digest(fields, 'Halo $name')
+    assert base == _digest(dict(fields), 'Halo $name')
+    assert _digest({**fields, 'score': 0.8}, 'Halo $name') != base
+    assert _digest(fields, 'Hai $name') != base
+    monkeypatch.setattr(report_engine, 'TEMPLATE_VERSION', report_engine.TEMPLATE_VERSION + 1)
+    assert _digest(fields, 'Halo $name') != base
+
+
+def test_renders_all_formats_and_skips_empty_sections():
+    result = ReportEngine(persist=False).render(_layout(), _inputs(), formats=('md', 'html', 'json'))
+    assert result['rendered'] == ['sapaan', 'tabel']
+    assert result['documents']['md'].startswith('Halo dunia')
+    assert '<p>Halo dunia</p>' in result['documents']['html']
+    assert set(json.loads(result['documents']['json'])['sections']) == {'sapaan', 'tabel'}
+
+
+def test_html_escapes_text_fields():
+    result = ReportEngine(persist=False).render(_layout(), _inputs(name='<b>'), formats=('html',))
+    assert '&lt;b&gt;' in result['documents']['html']
+
+
+def test_unchanged_sections_are_reused(tmp_path):
+    path = str(tmp_path / 'laporan.md')
+    engine = ReportEngine()
+    engine.render(_layout(), _inputs(), path)
+    second = engine.render(_layout(), _inputs(score=0.8), path)
+    assert second['reused'] == ['sapaan'] and second['rendered'] == ['tabel']
+
+
+def test_persisted_fragments_are_reused_across_engines(tmp_path):
+    path = str(tmp_path / 'laporan.md')
+    ReportEngine().render(_layout(), _inputs(), path)
+    result = ReportEngine().render(_layout(), _inputs(), path)
+    assert result['reused'] == ['sapaan', 'tabel']
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == result['documents']['md']
+
+
+def test_template_change_invalidates_persisted_fragment(tmp_path):
+    path = str(tmp_path / 'laporan.md')
+    ReportEngine().render(_layout(), _inputs(), path)
+    result = ReportEngine().render(_layout(greeting='Hai'), _inputs(), path)
+    assert result['rendered'] == ['sapaan'] and result['reused'] == ['tabel']
+    assert result['documents']['md'].startswith('Hai dunia')
+
+
+def test_output_paths_and_formats():
+    assert output_paths('laporan.md', ('md', 'html')) == {'md': 'laporan.md', 'html': 'laporan.html'}
+    assert parse_formats('md, html') == ('md', 'html')
+    with pytest.raises(ValueError):
+        ReportEngine(persist=False).render(_layout(), _inputs(), formats=('pdf',))
@@ -0,0 +1,108 @@
+import os
+import shutil
+import time
+
+import pandas as pd
+
+from result_cache import ResultCache, dataset_fingerprint, COMPARISON_FILE
+
+
+def _table(score: float) -> pd.DataFrame:
+    return pd.DataFrame({'Model': ['Decision Tree'], 'Accuracy': [score]}, index=['dt'])
+
+
+def test_fingerprint_is_deterministic(diamonds):
+    data = diamonds.head(200)
+    first = dataset_fingerprint(data, 'Cut', 'classification', 123, extra={'top_n': 3})
+    assert first == dataset_fingerprint(data.copy(), 'Cut', 'classification', 123, extra={'top_n': 3})
+
+
+def test_fingerprint_covers_data_and_options(diamonds):
+    data = diamonds.head(200)
+    base = dataset_fingerprint(data, 'Cut', 'classification', 123, extra={'top_n': 3})
+    changed = data.copy()
+    changed.loc[0, 'Price'] += 1
+    assert dataset_fingerprint(changed, 'Cut', 'classification', 123, extra={'top_n': 3}) != base
+    assert dataset_fingerprint(data.iloc[::-1], 'Cut', 'classification', 123, extra={'top_n': 3}) != base
+    assert dataset_fingerprint(data, 'Cut', 'classification', 124, extra={'top_n': 3}) != base
+    assert dataset_fingerprint(data, 'Cut', 'classification', 123, extra={'top_n': 5}) != base
+    assert dataset_fingerprint(data, 'Color', 'classification', 123, extra={'top_n': 3}) != base
+
+
+def test_store_and_load_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.load('missing') is None
+    cache.store('abc', _table(0.9), save_model_fn=lambda path: open(path + '.pkl', 'wb').close())
+    loaded = cache.load('abc')
+    pd.testing.assert_frame_equal(loaded, _table(0.9))
+    assert os.path.exists(cache.model_path('abc') + '.pkl')
+    # Tidak ada folder staging yang tertinggal
+    assert sorted(os.listdir(tmp_path)) == ['abc']
+
+
+def test_corrupt_entry_is_dropped(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.store('abc', _table(0.9))
+    with open(os.path.join(cache.entry_path('abc'), COMPARISON_FILE), 'wb') as f:
+        f.write(b'bukan pickle')
+    assert cache.load('abc') is None
+    assert not os.path.exists(cache.entry_path('abc'))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    padding = 'x' * 20_000
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9)
+    for key in ('a', 'b', 'c'):
+        cache.store(key, _table(0.5).assign(Catatan=padding))
+        time.sleep(0.02)
+    cache.load('a')  # 'a' baru dipakai, jadi 'b' yang paling lama tidak dipakai
+    entry_size = sum(os.path.getsize(os.path.join(cache.entry_path('a'), name))
+                     for name in os.listdir(cache.entry_path('a')))
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+    cache.evict()
+    assert sorted(name for name in os.listdir(tmp_path)) == ['a', 'c']
+
+
+def test_evict_keeps_requested_entry(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1)
+    cache.store('a', _table(0.5))
+    time.sleep(0.02)
+    cache.store('b', _table(0.6))
+    assert os.listdir(tmp_path) == ['b']
+
+
+def test_entry_without_model_is_a_miss_when_model_required(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.store('abc', _table(0.9))
+    assert cache.load('abc', require_model=True) is None
+    pd.testing.assert_frame_equal(cache.load('abc'), _table(0.9))
+
+
+def test_concurrent_writer_of_same_key_is_not_an_error(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+
+    def other_writer(path):
+        # Proses lain menyelesaikan entri yang sama tepat sebelum `os.replace`
+        os.makedirs(cache.entry_path('abc'))
+        _table(0.9).to_pickle(os.path.join(cache.entry_path('abc'), COMPARISON_FILE))
+        monkeypatch.setattr('result_cache.os.path.exists', lambda p: False)
+
+    cache.store('abc', _table(0.9), save_model_fn=other_writer)
+    monkeypatch.undo()
+    pd.testing.assert_frame_equal(cache.load('abc'), _table(0.9))
+    assert os.listdir(tmp_path) == ['abc']
+
+
+def test_evict_tolerates_entry_removed_by_other_process(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_bytes=1)
+    cache.store('a', _table(0.5))
+    last_access = ResultCache._last_access
+
+    def removed_meanwhile(self, key):
+        # Proses lain menghapus 'a' di antara `listdir` dan pembacaan waktu akses
+        shutil.rmtree(self.entry_path('a'), ignore_errors=True)
+        return last_access(self, key)
+
+    monkeypatch.setattr(ResultCache, '_last_access', removed_meanwhile)
+    cache.store('b', _table(0.6))
+    assert os.listdir(tmp_path) == ['b']
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.metrics import get_scorer
+from sklearn.tree import DecisionTreeRegressor
+
+from tuning import StudyStorage, _better, _init_worker, _run_study, _should_prune, sample_params
+
+GRID = {'max_depth': [2, 4, 8, None], 'min_samples_leaf': [1, 5, 10]}
+
+
+def test_trial_zero_uses_default_params():
+    assert sample_params(GRID, 'dt', 0, seed=123) == {}
+    assert sample_params({}, 'dt', 5, seed=123) == {}
+
+
+def test_sample_params_is_deterministic():
+    first = sample_params(GRID, 'dt', 3, seed=123)
+    assert first == sample_params(GRID, 'dt', 3, seed=123)
+    assert set(first) == set(GRID)
+    assert all(first[name] in values for name, values in GRID.items())
+    draws = {tuple(sample_params(GRID, 'dt', number, seed=123).items()) for number in range(1, 30)}
+    assert len(draws) > 1
+
+
+def _trials(*curves):
+    return [{'intermediate': list(curve)} for curve in curves]
+
+
+def test_should_prune_waits_for_min_folds_and_startup_trials():
+    completed = _trials([0.9, 0.9, 0.9], [0.8, 0.8, 0.8])
+    assert not _should_prune(0.1, 0, completed, min_folds=2, startup_trials=1)
+    assert not _should_prune(0.1, 1, completed, min_folds=2, startup_trials=3)
+    assert _should_prune(0.1, 1, completed, min_folds=2, startup_trials=1)
+
+
+def test_should_prune_follows_score_direction():
+    completed = _trials([0.5, 0.5], [0.7, 0.7])  # median fold kedua = 0.6
+    assert _should_prune(0.55, 1, completed, 1, 1, greater_is_better=True)
+    assert not _should_prune(0.65, 1, completed, 1, 1, greater_is_better=True)
+    assert _should_prune(0.65, 1, completed, 1, 1, greater_is_better=False)
+    assert not _should_prune(0.55, 1, completed, 1, 1, greater_is_better=False)
+
+
+def test_should_prune_ignores_shorter_trials():
+    assert not _should_prune(0.0, 2, _trials([0.9, 0.9]), 1, 1)
+
+
+def test_better():
+    assert _better(0.9, 0.8, True) and not _better(0.8, 0.9, True)
+    assert _better(0.8, 0.9, False) and not _better(0.9, 0.8, False)
+
+
+@pytest.fixture
+def folds(tmp_path):
+    """Tiga fold regresi sintetis dalam format `precompute_folds`."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = X @ np.array([3.0, -2.0, 1.0, 0.0]) + rng.normal(scale=0.5, size=300)
+    paths = []
+    for i, valid in enumerate(np.array_split(np.arange(300), 3)):
+        train = np.setdiff1d(np.arange(300), valid)
+        arrays = {'X_train': X[train], 'y_train': y[train], 'X_valid': X[valid], 'y_valid': y[valid]}
+        fold = {}
+        for name, value in arrays.items():
+            fold[name] = str(tmp_path / f"fold{i}_{name}.npy")
+            np.save(fold[name], value)
+        paths.append(fold)
+    _init_worker(paths, get_scorer('r2'), threads=1, deadline=None)
+    return paths
+
+
+def _study(storage_path: str, n_trials: int) -> dict:
+    spec = (DecisionTreeRegressor, {'random_state': 0}, GRID)
+    return _run_study(storage_path, 'dt-study', 'dt', spec, n_trials, seed=123,
+                      min_folds=2, startup_trials=100)
+
+
+def test_study_records_default_trial(folds, tmp_path):
+    summary = _study(str(tmp_path / 'studies.sqlite3'), 4)
+    assert summary['complete'] == 4 and summary['reused'] == 0
+    assert summary['default_value'] is not None
+    assert summary['best_value'] >= summary['default_value']
+
+
+def test_study_resumes_from_storage(folds, tmp_path):
+    storage_path = str(tmp_path / 'studies.sqlite3')
+    first = _study(storage_path, 3)
+    # Trial yang terputus (RUNNING) dibuang lalu dijalankan ulang
+    storage = StudyStorage(storage_path)
+    study_id = storage.study('dt-study', 'dt')
+    storage.start(study_id, 3, {'max_depth': 2})
+    storage.close()
+
+    resumed = _study(storage_path, 5)
+    assert resumed['resumed'] == 1 and resumed['reused'] == 3 and resumed['complete'] == 5
+    assert resumed['default_value'] == first['default_value']
+    storage = StudyStorage(storage_path)
+    trials = storage.trials(storage.study('dt-study', 'dt'))
+    storage.close()
+    assert [trial['number'] for trial in trials] == list(range(5))
+    assert trials[3]['params'] == sample_params(GRID, 'dt', 3, seed=123)
+    assert os.path.exists(storage_path)
+
+
+def test_tuning_reuses_folds_from_training(diamonds, tmp_path, monkeypatch):
+    pytest.importorskip('pycaret')
+    import instrumentation
+    from fold_cache import fold_cached_compare
+    from threadpoolctl import threadpool_info, threadpool_limits
+    from tuning import tune_top_models
+
+    data, fold_dir = diamonds.head(300), str(tmp_path / 'folds')
+    _, table = fold_cached_compare('regression', data, 'Price', include=['dt', 'lr'], workdir=fold_dir)
+    monkeypatch.setattr(instrumentation, '_ACTIVE', None)
+    tracer = instrumentation.start_tracing()
+    with threadpool_limits(limits=3):
+        before = {info['filepath']: info['num_threads'] for info in threadpool_info()}
+        table = tune_top_models('regression', data, 'Price', table, top_k=1, n_trials=2, workers=1,
+                                storage_path=str(tmp_path / 'studies.sqlite3'), fold_dir=fold_dir)
+        assert {info['filepath']: info['num_threads'] for info in threadpool_info()} == before
+    assert not {'setup', 'precompute_folds'} & {event['name'] for event in tracer.events}
+    assert table.attrs['tuning']['results'][0]['Trial'] == 2
+    # Fold milik pemanggil tidak dihapus oleh tuning
+    assert os.path.exists(os.path.join(fold_dir, 'folds.json'))
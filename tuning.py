@@ -0,0 +1,404 @@
+# ==============================================================================
+# HYPERPARAMETER TUNING PARALEL UNTUK MODEL TERATAS (DENGAN PEMANGKASAN TRIAL)
+# ==============================================================================
+#
+# TUJUAN:
+# Laporan menyarankan "Hyperparameter Tuning" pada model pemenang, tetapi
+# pipeline berhenti di `compare_models()`. Modul ini men-tuning `top_k` model
+# teratas dari tabel perbandingan:
+# - Setiap model punya satu STUDI yang berjalan di proses worker sendiri
+#   (studi-studi berjalan bersamaan di process pool).
+# - Ruang pencarian = `Tune Grid` PyCaret (`models(internal=True)`); parameter
+#   trial ke-n diambil acak dengan seed (seed, model, n), sehingga trial yang
+#   sama selalu menghasilkan parameter yang sama. Trial 0 = parameter bawaan.
+# - Trial dinilai fold demi fold pada matriks fold yang dihitung sekali
+#   (fold_cache.py, memory-mapped); jika tahap pelatihan sudah menghitungnya
+#   (`--fold_cache` atau `--search pruning`), fold tersebut dipakai ulang
+#   tanpa `setup()` kedua. Pemangkasan gaya median (seperti
+#   `MedianPruner` Optuna): setelah `min_folds` fold, trial dihentikan jika
+#   rata-rata berjalannya di bawah median trial selesai pada fold yang sama.
+# - Semua trial dicatat di file SQLite lokal (`--tune_storage`). Run yang
+#   terputus melanjutkan studi yang sama: trial yang sudah selesai tidak
+#   diulang, trial yang sedang berjalan saat terputus diulang dari awal.
+# - Dibatasi `budget_seconds` dan `n_trials` per model. Batas waktu diperiksa
+#   sebelum setiap trial dan di antara fold: trial yang kehabisan waktu di
+#   tengah jalan dihentikan dan dicatat sebagai PRUNED. Satu fold yang sedang
+#   di-fit tidak bisa diinterupsi, jadi kelebihan waktu maksimal satu fit.
+# Hasil disimpan di `tabel.attrs['tuning']`. Skor bawaan = trial 0 (parameter
+# bawaan) pada fold yang sama, bukan skor tabel perbandingan (yang bisa berasal
+# dari sampel baris, misal pada successive halving); arah metrik mengikuti
+# `greater_is_better` scorer.
+#
+# ==============================================================================
+
+import os
+import json
+import time
+import zlib
+import shutil
+import sqlite3
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from model_search import SORT_METRIC, pycaret_module, limit_native_threads
+from fold_cache import precompute_folds, saved_folds, load_fold, metric_scorers, quiet_args
+from result_cache import dataset_fingerprint
+from instrumentation import stage, record_event
+
+# State per proses worker: path fold & scorer metrik utama
+_WORKER = {}
+
+
+# ------------------------------------------------------------------------------
+# PENYIMPANAN STUDI (SQLITE)
+# ------------------------------------------------------------------------------
+class StudyStorage:
+    """
+    Studi & trial di satu file SQLite. Setiap proses membuka koneksinya sendiri;
+    mode WAL mengizinkan beberapa worker menulis ke file yang sama.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS studies (
+        study_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        model_id TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS trials (
+        study_id INTEGER NOT NULL,
+        number INTEGER NOT NULL,
+        state TEXT NOT NULL,
+        params TEXT NOT NULL,
+        value REAL,
+        intermediate TEXT NOT NULL DEFAULT '[]',
+        seconds REAL,
+        PRIMARY KEY (study_id, number)
+    );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def study(self, name: str, model_id: str) -> int:
+        """ID studi `name`; dibuat jika belum ada (`load_if_exists`)."""
+        self.conn.execute('INSERT OR IGNORE INTO studies (name, model_id, created_at) VALUES (?, ?, ?)',
+                          (name, model_id, time.strftime('%Y-%m-%d %H:%M:%S')))
+        return self.conn.execute('SELECT study_id FROM studies WHERE name = ?', (name,)).fetchone()[0]
+
+    def discard_running(self, study_id: int) -> int:
+        """Menghapus trial yang terputus di tengah jalan agar dijalankan ulang."""
+        return self.conn.execute("DELETE FROM trials WHERE study_id = ? AND state = 'RUNNING'",
+                                 (study_id,)).rowcount
+
+    def trials(self, study_id: int) -> list:
+        rows = self.conn.execute('SELECT number, state, params, value, intermediate, seconds FROM trials '
+                                 'WHERE study_id = ? ORDER BY number', (study_id,)).fetchall()
+        return [{'number': number, 'state': state, 'params': json.loads(params), 'value': value,
+                 'intermediate': json.loads(intermediate), 'seconds': seconds}
+                for number, state, params, value, intermediate, seconds in rows]
+
+    def start(self, study_id: int, number: int, params: dict):
+        self.conn.execute("INSERT INTO trials (study_id, number, state, params) VALUES (?, ?, 'RUNNING', ?)",
+                          (study_id, number, json.dumps(params, default=str)))
+
+    def finish(self, study_id: int, number: int, state: str, value: float, intermediate: list, seconds: float):
+        self.conn.execute('UPDATE trials SET state = ?, value = ?, intermediate = ?, seconds = ? '
+                          'WHERE study_id = ? AND number = ?',
+                          (state, value, json.dumps(intermediate), seconds, study_id, number))
+
+
+# ------------------------------------------------------------------------------
+# TRIAL: SAMPLING PARAMETER & PENILAIAN PER FOLD
+# ------------------------------------------------------------------------------
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def sample_params(grid: dict, model_id: str, number: int, seed: int) -> dict:
+    """Parameter trial ke-`number` (deterministik). Trial 0 memakai parameter bawaan."""
+    if number == 0 or not grid:
+        return {}
+    rng = np.random.default_rng([seed, zlib.crc32(model_id.encode('utf-8')), number])
+    return {name: _plain(values[rng.integers(len(values))]) for name, values in grid.items()}
+
+
+def _should_prune(running_mean: float, fold_index: int, completed: list, min_folds: int,
+                  startup_trials: int, greater_is_better: bool = True) -> bool:
+    """Aturan median: rata-rata berjalan lebih buruk dari median trial selesai pada fold yang sama."""
+    if fold_index + 1 < min_folds or len(completed) < startup_trials:
+        return False
+    reference = [trial['intermediate'][fold_index] for trial in completed
+                 if len(trial['intermediate']) > fold_index]
+    if not reference:
+        return False
+    median = float(np.median(reference))
+    return running_mean < median if greater_is_better else running_mean > median
+
+
+def _better(a: float, b: float, greater_is_better: bool) -> bool:
+    return a > b if greater_is_better else a < b
+
+
+def _setup_matches(api, data: pd.DataFrame, session_id: int) -> bool:
+    """True jika setup PyCaret yang aktif dibuat untuk `data` & `session_id` ini."""
+    try:
+        dataset = api.get_config('dataset')
+        return api.get_config('seed') == session_id and dataset.shape == data.shape
+    except Exception:
+        return False  # belum ada setup aktif
+
+
+def _init_worker(folds: list, scorer, threads: int, deadline: float):
+    """Dijalankan sekali per worker. `scorer` boleh berupa bytes `cloudpickle`."""
+    from threadpoolctl import threadpool_limits
+
+    if isinstance(scorer, bytes):
+        import cloudpickle
+        scorer = cloudpickle.loads(scorer)
+    _WORKER.update({'limits': threadpool_limits(limits=threads), 'folds': folds,
+                    'scorer': scorer, 'deadline': deadline})
+
+
+def _run_study(storage_path: str, study_name: str, model_id: str, spec: tuple, n_trials: int,
+               seed: int, min_folds: int, startup_trials: int, greater_is_better: bool = True) -> dict:
+    """
+    Menjalankan (atau melanjutkan) satu studi sampai `n_trials` trial atau batas waktu.
+
+    Returns:
+        dict: Ringkasan studi (jumlah trial per status, trial terbaik, waktu).
+    """
+    estimator_class, args, grid = spec
+    scorer, folds, deadline = _WORKER['scorer'], _WORKER['folds'], _WORKER['deadline']
+    start, wall0 = time.time(), time.perf_counter()
+    storage = StudyStorage(storage_path)
+    try:
+        study_id = storage.study(study_name, model_id)
+        resumed = storage.discard_running(study_id)
+        trials = storage.trials(study_id)
+        reused = len(trials)
+        while len(trials) < n_trials:
+            if deadline is not None and time.time() > deadline:
+                break
+            number = len(trials)
+            params = sample_params(grid, model_id, number, seed)
+            storage.start(study_id, number, params)
+            completed = [trial for trial in trials if trial['state'] == 'COMPLETE']
+            trial_start, scores, state = time.perf_counter(), [], 'COMPLETE'
+            try:
+                for k, paths in enumerate(folds):
+                    if k > 0 and deadline is not None and time.time() > deadline:
+                        state = 'PRUNED'
+                        break
+                    fold = load_fold(paths)
+                    estimator = estimator_class(**{**args, **params}).fit(fold['X_train'], fold['y_train'])
+                    scores.append(float(scorer(estimator, fold['X_valid'], fold['y_valid'])))
+                    if k + 1 < len(folds) and _should_prune(float(np.mean(scores)), k, completed,
+                                                            min_folds, startup_trials, greater_is_better):
+                        state = 'PRUNED'
+                        break
+            except Exception:
+                state = 'FAIL'
+            intermediate = list(np.cumsum(scores) / np.arange(1, len(scores) + 1))
+            value = intermediate[-1] if state == 'COMPLETE' else None
+            seconds = time.perf_counter() - trial_start
+            storage.finish(study_id, number, state, value, intermediate, seconds)
+            trials.append({'number': number, 'state': state, 'params': params, 'value': value,
+                           'intermediate': intermediate, 'seconds': seconds})
+    finally:
+        storage.close()
+
+    completed = [trial for trial in trials if trial['state'] == 'COMPLETE']
+    sign = 1 if greater_is_better else -1
+    best = max(completed, key=lambda trial: sign * trial['value']) if completed else None
+    # Trial 0 = parameter bawaan pada fold yang sama: pembanding yang adil
+    default = next((trial for trial in completed if trial['number'] == 0), None)
+    return {
+        'model_id': model_id, 'study': study_name, 'resumed': resumed, 'reused': reused,
+        'complete': len(completed), 'pruned': sum(trial['state'] == 'PRUNED' for trial in trials),
+        'failed': sum(trial['state'] == 'FAIL' for trial in trials),
+        'best_number': best['number'] if best else None, 'best_value': best['value'] if best else None,
+        'default_value': default['value'] if default else None,
+        'timing': {'start': start, 'wall': time.perf_counter() - wall0, 'tid': os.getpid()},
+    }
+
+
+def _worker_study(*args):
+    try:
+        return _run_study(*args)
+    except Exception as e:
+        return {'model_id': args[2], 'error': str(e)}
+
+
+# ------------------------------------------------------------------------------
+# TAHAP TUNING
+# ------------------------------------------------------------------------------
+def tune_top_models(problem_type: str, data: pd.DataFrame, target_column: str,
+                    comparison_table: pd.DataFrame, top_k: int = 3, n_trials: int = 20,
+                    budget_seconds: float = None, workers: int = None, session_id: int = 123,
+                    storage_path: str = '.automl_tuning.sqlite3', min_folds: int = 3,
+                    startup_trials: int = 3, model_output: str = None, fold_dir: str = None):
+    """
+    Men-tuning `top_k` model teratas secara bersamaan (satu studi per model).
+
+    Args:
+        problem_type (str): 'classification' atau 'regression'.
+        data (pd.DataFrame): Data lengkap (sama dengan data pelatihan).
+        target_column (str): Nama kolom target.
+        comparison_table (pd.DataFrame): Tabel perbandingan dari `train_model`.
+        top_k (int): Jumlah model teratas yang di-tuning.
+        n_trials (int): Jumlah trial per model (termasuk trial yang sudah ada di storage).
+        budget_seconds (float): Batas waktu; diperiksa sebelum setiap trial dan setiap fold.
+        workers (int): Jumlah proses worker. None berarti min(top_k, jumlah CPU).
+        session_id (int): Seed PyCaret & sampling parameter.
+        storage_path (str): File SQLite studi; run berikutnya melanjutkan studi yang sama.
+        min_folds (int): Jumlah fold minimum sebelum trial boleh dipangkas.
+        startup_trials (int): Jumlah trial selesai sebelum pemangkasan aktif.
+        model_output (str): Jika model hasil tuning mengungguli pemenang, pipeline-nya
+            disimpan ke `<model_output>.pkl` (menggantikan pipeline pemenang).
+        fold_dir (str): Folder fold dari tahap pelatihan (`workdir` fold_cache/pruning)
+            pada data & `session_id` yang sama. Jika berisi fold dan setup PyCaret aktif
+            cocok, keduanya dipakai ulang; selain itu fold dihitung ulang.
+
+    Returns:
+        pd.DataFrame: `comparison_table` dengan ringkasan di `attrs['tuning']`.
+    """
+    api = pycaret_module(problem_type)
+    sort_metric = SORT_METRIC[problem_type]
+    deadline = time.time() + budget_seconds if budget_seconds else None
+    model_ids = [model_id for model_id in comparison_table.index[:top_k]
+                 if 'Pruned' not in comparison_table or not comparison_table.loc[model_id, 'Pruned']]
+
+    folds = saved_folds(fold_dir) if fold_dir else None
+    if folds is not None and not _setup_matches(api, data, session_id):
+        folds = None
+    if folds is None:
+        with stage('setup', rows=len(data)):
+            api.setup(data=data, target=target_column, verbose=False, session_id=session_id)
+    else:
+        print(f"🧊 Memakai ulang {len(folds)} fold dari tahap pelatihan (tanpa setup ulang).")
+    internal = api.models(internal=True)
+    scorer, greater_is_better = next((scorer, greater) for display, scorer, greater in metric_scorers(api)
+                                     if display == sort_metric)
+    specs = {}
+    for model_id in model_ids:
+        tunable = internal.loc[model_id, 'Tunable Class']
+        estimator_class = tunable if isinstance(tunable, type) else internal.loc[model_id, 'Class']
+        grid = internal.loc[model_id, 'Tune Grid']
+        # Estimator dibuat langsung (tanpa `create_model`), jadi log booster dimatikan sendiri
+        specs[model_id] = (estimator_class, quiet_args(estimator_class, internal.loc[model_id, 'Args']),
+                           grid if isinstance(grid, dict) else {})
+
+    workdir = tempfile.mkdtemp(prefix='tuning_') if folds is None else None
+    summaries = {}
+    try:
+        if folds is None:
+            with stage('precompute_folds', rows=len(data)):
+                folds = precompute_folds(api, workdir)
+        jobs = []
+        for model_id in model_ids:
+            study_name = dataset_fingerprint(data, target_column, problem_type, session_id,
+                                             extra={'tune_model': model_id, 'grid': specs[model_id][2]})
+            jobs.append((storage_path, study_name, model_id, specs[model_id], n_trials,
+                         session_id, min_folds, startup_trials, greater_is_better))
+        print(f"🎛️ Tuning {len(model_ids)} model teratas ({n_trials} trial per model, studi di '{storage_path}')...")
+
+        def collect(summary):
+            model_id = summary['model_id']
+            if 'error' in summary:
+                print(f"   ⚠️ Tuning {comparison_table.loc[model_id, 'Model']} gagal: {summary['error']}")
+                return
+            summaries[model_id] = summary
+            record_event(f'tune {model_id}', category='tuning', rows=len(data),
+                         trials=summary['complete'] + summary['pruned'] + summary['failed'], **summary['timing'])
+            note = f" (dilanjutkan: {summary['reused']} trial dari run sebelumnya)" if summary['reused'] else ""
+            best = f"{summary['best_value']:.4f}" if summary['best_value'] is not None else '-'
+            print(f"   ✔ {comparison_table.loc[model_id, 'Model']}: {sort_metric} terbaik = {best}, "
+                  f"{summary['complete']} selesai, {summary['pruned']} dipangkas{note}")
+
+        workers = workers or min(len(model_ids), os.cpu_count() or 1)
+        if workers > 1 and len(model_ids) > 1:
+            import cloudpickle  # dependensi PyCaret; scorer PyCaret bisa berupa fungsi lokal
+
+            threads = max((os.cpu_count() or 1) // workers, 1)
+            context = multiprocessing.get_context('spawn')
+            with limit_native_threads(threads), ProcessPoolExecutor(
+                    max_workers=workers, mp_context=context, initializer=_init_worker,
+                    initargs=(folds, cloudpickle.dumps(scorer), threads, deadline)) as pool:
+                futures = [pool.submit(_worker_study, *job) for job in jobs]
+                for future in as_completed(futures):
+                    collect(future.result())
+        else:
+            _init_worker(folds, scorer, os.cpu_count() or 1, deadline)
+            # Di proses induk batas thread BLAS/OpenMP harus dilepas lagi setelah selesai
+            with _WORKER.pop('limits'):
+                for job in jobs:
+                    collect(_worker_study(*job))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = []
+    for model_id in model_ids:
+        if model_id not in summaries:
+            continue
+        summary = summaries[model_id]
+        baseline, tuned = summary['default_value'], summary['best_value']
+        results.append({
+            'Model': comparison_table.loc[model_id, 'Model'], 'model_id': model_id,
+            'Bawaan': round(baseline, 4) if baseline is not None else None,
+            'Tuning': round(tuned, 4) if tuned is not None else None,
+            'Selisih': round(tuned - baseline, 4) if tuned is not None and baseline is not None else None,
+            'Trial': summary['complete'], 'Dipangkas': summary['pruned'],
+            # Parameter dibangkitkan ulang dari nomor trial (tipe asli, bukan hasil JSON)
+            'Parameter': sample_params(specs[model_id][2], model_id, summary['best_number'], session_id)
+            if summary['best_number'] is not None else {},
+        })
+
+    # Pembanding: pemenang dengan parameter bawaan (trial 0) pada fold yang sama
+    winner = summaries.get(comparison_table.index[0], {})
+    winner_score = winner.get('default_value')
+    sign = 1 if greater_is_better else -1
+    tuned_rows = [row for row in results if row['Tuning'] is not None]
+    best_row = max(tuned_rows, key=lambda row: sign * row['Tuning'], default=None)
+    saved = None
+    # Pipeline diganti jika kandidat terbaik (model lain, atau parameter hasil tuning)
+    # mengungguli pemenang dengan parameter bawaan
+    if (model_output and best_row is not None and winner_score is not None
+            and (best_row['Parameter'] or best_row['model_id'] != comparison_table.index[0])
+            and _better(best_row['Tuning'], winner_score, greater_is_better)):
+        from predict_service import write_model_metadata
+
+        model_id = best_row['model_id']
+        extra = {'allow_writing_files': False} if specs[model_id][0].__name__.startswith('CatBoost') else {}
+        try:
+            with stage(f'{model_id} (latih ulang hasil tuning)', rows=len(data), category='estimator'):
+                tuned_model = api.create_model(model_id, cross_validation=False, verbose=False,
+                                               **extra, **best_row['Parameter'])
+        except Exception as e:
+            print(f"   ⚠️ Pipeline hasil tuning tidak bisa dilatih ulang: {e}")
+        else:
+            api.save_model(tuned_model, model_output, verbose=False)
+            tuned_table = comparison_table.loc[[model_id]].assign(**{sort_metric: best_row['Tuning']})
+            write_model_metadata(model_output, data, target_column, problem_type, tuned_table)
+            saved = best_row['Model']
+            print(f"💾 Pipeline hasil tuning ({saved}) disimpan ke '{model_output}.pkl'")
+
+    comparison_table.attrs['tuning'] = {
+        'metric': sort_metric, 'n_trials': n_trials, 'budget_seconds': budget_seconds,
+        'storage': storage_path, 'saved': saved, 'results': results,
+    }
+    return comparison_table